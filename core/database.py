@@ -0,0 +1,210 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_DB_PATH = os.path.join("data", "adm.db")
+
+# Pragmas applied to every connection. WAL lets background readers run while
+# the writer holds a transaction, and synchronous=NORMAL only fsyncs at
+# checkpoints instead of on every commit.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 1024 * 1024,  # bytes
+    "cache_size": -16000,  # negative = KiB, i.e. ~16 MB page cache
+}
+BUSY_TIMEOUT_SECONDS = 5.0
+
+
+class TrackedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that keeps simple usage statistics.
+
+    Every executed statement is counted through the trace callback, so the
+    numbers include statements run through cursors as well as implicit
+    BEGINs issued by the sqlite3 module.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.role = "writer"
+        self.stats = {
+            "opened_at": datetime.now(),
+            "statements": 0,
+            "commits": 0,
+            "rollbacks": 0,
+        }
+        self.set_trace_callback(self._count_statement)
+
+    def _count_statement(self, statement):
+        self.stats["statements"] += 1
+
+    def commit(self):
+        if self.in_transaction:
+            self.stats["commits"] += 1
+        super().commit()
+
+    def rollback(self):
+        if self.in_transaction:
+            self.stats["rollbacks"] += 1
+        super().rollback()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.in_transaction:
+            key = "commits" if exc_type is None else "rollbacks"
+            self.stats[key] += 1
+        return super().__exit__(exc_type, exc_value, traceback)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["role"] = self.role
+        stats["total_changes"] = self.total_changes
+        stats["in_transaction"] = self.in_transaction
+        return stats
+
+
+class DatabaseManager:
+    """
+    Owns the single writer connection to an ADM database file.
+
+    TaskManager, ScheduleManager and ScheduleSettings all share the writer
+    returned by ``get_database`` instead of opening their own connections,
+    which avoids "database is locked" stalls between them. Background readers
+    can ask for separate read-only connections with ``open_reader``.
+
+    Because the writer is shared, so is its transaction: every write goes
+    through ``commit``, ``rollback`` or ``transaction``, which defer to an
+    open batch (see TaskManager.batch) instead of ending it early.
+    """
+
+    def __init__(self, db_file=DEFAULT_DB_PATH, pragmas=None):
+        self.db_file = db_file
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+
+        self.conn = self._connect(db_file)
+        self.conn.role = "writer"
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        # Open batches; while > 0 only the outermost batch commits or rolls
+        # back, and batch_failed records that it has to roll back
+        self.batch_depth = 0
+        self.batch_failed = False
+
+    def commit(self):
+        """Commits the writer's transaction, or defers to the open batch."""
+        if not self.batch_depth:
+            self.conn.commit()
+
+    def rollback(self):
+        """Rolls back now; inside a batch the whole batch is rolled back when it ends."""
+        if self.batch_depth:
+            self.batch_failed = True
+        else:
+            self.conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the block's writes as one transaction on the writer: committed if
+        it succeeds, rolled back if it raises. Inside a batch both are left
+        to the batch.
+
+            with database.transaction() as conn:
+                conn.execute("DELETE FROM schedule_settings")
+        """
+        try:
+            yield self.conn
+        except Exception:
+            self.rollback()
+            raise
+        self.commit()
+
+    def _connect(self, target, **kwargs):
+        conn = sqlite3.connect(
+            target,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            factory=TrackedConnection,
+            **kwargs,
+        )
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn, read_only=kwargs.get("uri", False))
+        return conn
+
+    def _apply_pragmas(self, conn, read_only=False):
+        for name, value in self.pragmas.items():
+            if read_only and name in ("journal_mode", "synchronous"):
+                continue  # Owned by the writer connection
+            try:
+                conn.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error as e:
+                print(f"Warning: could not apply PRAGMA {name}={value}: {e}")
+
+    def open_reader(self):
+        """
+        Opens a read-only connection for use by a background thread.
+
+        The connection may be handed to another thread. Close it with
+        ``close_reader`` when done.
+        """
+        uri = f"file:{os.path.abspath(self.db_file)}?mode=ro"
+        reader = self._connect(uri, uri=True, check_same_thread=False)
+        reader.role = "reader"
+        with self._readers_lock:
+            self._readers.append(reader)
+        return reader
+
+    def close_reader(self, reader):
+        with self._readers_lock:
+            if reader in self._readers:
+                self._readers.remove(reader)
+        reader.close()
+
+    def get_stats(self):
+        """Returns per-connection statistics for the writer and open readers."""
+        with self._readers_lock:
+            readers = list(self._readers)
+        return {
+            "db_file": self.db_file,
+            "journal_mode": self.conn.execute("PRAGMA journal_mode").fetchone()[0],
+            "writer": self.conn.get_stats(),
+            "readers": [reader.get_stats() for reader in readers],
+        }
+
+    def close(self):
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for reader in readers:
+            reader.close()
+        self.conn.close()
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_file=DEFAULT_DB_PATH):
+    """Returns the shared DatabaseManager for ``db_file``, creating it once."""
+    key = os.path.abspath(db_file)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = DatabaseManager(db_file)
+            _databases[key] = database
+        return database
+
+
+def close_database(db_file=DEFAULT_DB_PATH):
+    key = os.path.abspath(db_file)
+    with _databases_lock:
+        database = _databases.pop(key, None)
+    if database:
+        database.close()
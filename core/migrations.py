@@ -0,0 +1,458 @@
+"""
+Versioned schema migrations for the ADM database.
+
+The schema version is kept in ``PRAGMA user_version``. Each migration runs in
+its own transaction together with the version bump, so an interrupted upgrade
+leaves the database at the last fully applied version. Migrations must be
+safe to run on databases that already contain some of their objects, since
+files created before versioning existed start at version 0.
+
+To change the schema, append a new ``(version, description, function)`` entry
+to ``MIGRATIONS``; never edit one that has already shipped.
+"""
+
+import logging
+import re
+import sqlite3
+
+from core.task_codec import (
+    RECURRENCE_COLUMNS,
+    TEMPORAL_COLUMNS,
+    encode_chunk_row,
+    normalize_tags,
+    stored_next_due,
+    to_epoch_seconds,
+)
+from core.utils import safe_json_loads
+
+
+def _create_task_chunks(cursor):
+    # One row per chunk. time_block holds the JSON-encoded TimeBlock id
+    # (uuid ints overflow INTEGER) and date is plain 'YYYY-MM-DD' text.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS task_chunks (
+            id TEXT PRIMARY KEY,
+            task_id INTEGER NOT NULL,
+            position INTEGER DEFAULT 0,
+            size REAL DEFAULT 0.0,
+            type TEXT,
+            unit TEXT,
+            status TEXT DEFAULT 'active',
+            time_block TEXT,
+            date TEXT,
+            is_recurring BOOLEAN NOT NULL DEFAULT 0,
+
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_task_chunks_task ON task_chunks(task_id, position)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_chunks_date ON task_chunks(date)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_task_chunks_time_block ON task_chunks(time_block)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_task_chunks_status_date ON task_chunks(status, date)"
+    )
+
+    # Move chunks still stored as JSON in tasks.chunks into the new table;
+    # migration 4 then drops the column. New databases never had it.
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(tasks)")}
+    if "chunks" not in columns:
+        return
+    cursor.execute(
+        "SELECT id, name, chunks FROM tasks WHERE chunks IS NOT NULL AND chunks NOT IN ('', '[]')"
+    )
+    rows = cursor.fetchall()
+    chunk_rows = []
+    for row in rows:
+        chunks = safe_json_loads(
+            row["chunks"], [], "chunks", f"while migrating task '{row['name']}'"
+        )
+        for position, chunk in enumerate(chunks or []):
+            if isinstance(chunk, dict):
+                chunk_rows.append(encode_chunk_row(row["id"], position, chunk))
+    if chunk_rows:
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO task_chunks (
+                id, task_id, position, size, type, unit, status, time_block, date, is_recurring
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            chunk_rows,
+        )
+    if rows:
+        cursor.executemany(
+            "UPDATE tasks SET chunks = '[]' WHERE id = ?", [(row["id"],) for row in rows]
+        )
+        print(f"Migrated {len(chunk_rows)} chunks from {len(rows)} tasks to task_chunks.")
+
+
+def _create_task_tags(cursor):
+    # Normalized copy of tasks.tags so tag lookups can use an index. The
+    # JSON column is still written and remains the source for task.tags.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS task_tags (
+            task_id INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (task_id, tag),
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag, task_id)")
+
+    cursor.execute(
+        "SELECT id, name, tags FROM tasks WHERE tags IS NOT NULL AND tags NOT IN ('', '[]')"
+    )
+    tag_rows = []
+    for row in cursor.fetchall():
+        tags = safe_json_loads(row["tags"], [], "tags", f"while migrating task '{row['name']}'")
+        tag_rows.extend((row["id"], tag) for tag in normalize_tags(tags))
+    if tag_rows:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO task_tags (task_id, tag) VALUES (?, ?)", tag_rows
+        )
+        print(f"Migrated {len(tag_rows)} task tags to task_tags.")
+
+
+def _create_task_indexes(cursor):
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_list_status ON tasks(list_name, status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_datetime ON tasks(due_datetime)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_recurring_status ON tasks(recurring, status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_schedule_status ON tasks(include_in_schedule, status)",
+    ):
+        cursor.execute(statement)
+
+
+def _rebuild_table(cursor, table, column_types, drop_columns=()):
+    """
+    Recreates ``table`` with the declared types in ``column_types`` and
+    without the columns in ``drop_columns``, keeping its rows, indexes,
+    triggers and AUTOINCREMENT counter. SQLite cannot change a column type
+    in place. Foreign key enforcement is off on ADM connections, so dropping
+    the old table leaves child rows alone.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    table_sql = cursor.fetchone()[0]
+    for name, declared_type in column_types.items():
+        table_sql = re.sub(
+            rf"\b{name}\s+\w+", f"{name} {declared_type}", table_sql, count=1
+        )
+    for name in drop_columns:
+        # A definition on its own line, as create_tables writes them, or
+        # inline after another one, as _create_archived_tasks does
+        table_sql = re.sub(
+            rf"(^[ \t]*|(?<=, )){name}\s[^,\n]*,[ \t]*\n?",
+            "",
+            table_sql,
+            count=1,
+            flags=re.MULTILINE,
+        )
+    cursor.execute(f"PRAGMA table_info({table})")
+    kept = ", ".join(row[1] for row in cursor.fetchall() if row[1] not in drop_columns)
+    table_sql = re.sub(
+        rf"^\s*CREATE TABLE\s+(IF NOT EXISTS\s+)?[`\"]?{table}[`\"]?",
+        f"CREATE TABLE {table}_rebuild",
+        table_sql,
+        count=1,
+    )
+    cursor.execute(
+        "SELECT sql FROM sqlite_master "
+        "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table,),
+    )
+    dependents = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    sequence = cursor.fetchone()
+
+    cursor.execute(table_sql)
+    cursor.execute(f"INSERT INTO {table}_rebuild ({kept}) SELECT {kept} FROM {table}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_rebuild RENAME TO {table}")
+    for statement in dependents:
+        cursor.execute(statement)
+    if sequence:
+        cursor.execute(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence[0], table)
+        )
+
+
+def _store_task_dates_as_epoch(cursor):
+    # Dates used to be ISO text in several formats; integers make "due in the
+    # next N days" or "completed between X and Y" plain index range scans.
+    # The rebuild also drops tasks.chunks, emptied by migration 1.
+    cursor.execute("PRAGMA table_info(tasks)")
+    declared = {row[1]: row[2].upper() for row in cursor.fetchall()}
+    stale = {
+        name: "INTEGER"
+        for name in TEMPORAL_COLUMNS
+        if name in declared and declared[name] != "INTEGER"
+    }
+    dropped = [name for name in ("chunks",) if name in declared]
+    if stale or dropped:
+        _rebuild_table(cursor, "tasks", stale, dropped)
+
+    # Rows copied as-is still hold text; convert them in place
+    cursor.execute(
+        f"SELECT id, {', '.join(TEMPORAL_COLUMNS)} FROM tasks WHERE "
+        + " OR ".join(f"typeof({name}) = 'text'" for name in TEMPORAL_COLUMNS)
+    )
+    updates = []
+    for row in cursor.fetchall():
+        values = []
+        for name in TEMPORAL_COLUMNS:
+            try:
+                values.append(to_epoch_seconds(row[name]))
+            except (TypeError, ValueError):
+                logging.warning(
+                    f"Dropping unparseable {name} {row[name]!r} of task ID {row['id']}."
+                )
+                values.append(None)
+        updates.append(tuple(values) + (row["id"],))
+    if updates:
+        cursor.executemany(
+            f"UPDATE tasks SET {', '.join(f'{name} = ?' for name in TEMPORAL_COLUMNS)} "
+            "WHERE id = ?",
+            updates,
+        )
+        print(f"Converted the dates of {len(updates)} tasks to epoch seconds.")
+
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_last_completed ON tasks(last_completed_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_recurring_due ON tasks(recurring, due_datetime)",
+    ):
+        cursor.execute(statement)
+
+
+def _subtask_names_sql(column):
+    # Space separated subtask names; malformed JSON indexes as no subtasks
+    return (
+        "(SELECT group_concat(json_extract(value, '$.name'), ' ') FROM json_each("
+        f"CASE WHEN json_valid({column}) THEN {column} ELSE '[]' END))"
+    )
+
+
+def _create_task_search(cursor):
+    # Full-text index of task text, keyed by task id. Triggers keep it in
+    # step with every write to tasks, including bulk and raw SQL writes.
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5(
+                name, description, notes, subtasks,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+            """
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5; TaskManager.search falls back to LIKE
+        print(f"Full-text search unavailable, skipping task_search: {e}")
+        return
+
+    insert_row = f"""
+        INSERT INTO task_search (rowid, name, description, notes, subtasks)
+        VALUES (new.id, new.name, new.description, new.notes, {_subtask_names_sql("new.subtasks")});
+    """
+    for statement in (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN
+            {insert_row}
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN
+            DELETE FROM task_search WHERE rowid = old.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_search_update
+        AFTER UPDATE OF id, name, description, notes, subtasks ON tasks BEGIN
+            DELETE FROM task_search WHERE rowid = old.id;
+            {insert_row}
+        END
+        """,
+    ):
+        cursor.execute(statement)
+
+    cursor.execute("DELETE FROM task_search")
+    cursor.execute(
+        f"""
+        INSERT INTO task_search (rowid, name, description, notes, subtasks)
+        SELECT id, name, description, notes, {_subtask_names_sql("subtasks")} FROM tasks
+        """
+    )
+
+
+def _create_archived_tasks(cursor):
+    # Cold tier for old completed and failed tasks. Rows keep their task id
+    # and the columns tasks has now; chunks are embedded as JSON since their
+    # task_chunks rows are deleted on archiving.
+    cursor.execute("PRAGMA table_info(tasks)")
+    columns = [
+        f"{row['name']} {row['type']}" for row in cursor.fetchall() if row["name"] != "id"
+    ]
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS archived_tasks (
+            id INTEGER PRIMARY KEY,
+            {", ".join(columns)},
+            chunks TEXT DEFAULT '[]',
+            archived_at INTEGER NOT NULL
+        )
+        """
+    )
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_archived_tasks_completed "
+        "ON archived_tasks(last_completed_date)",
+        "CREATE INDEX IF NOT EXISTS idx_archived_tasks_list ON archived_tasks(list_name)",
+    ):
+        cursor.execute(statement)
+
+
+def _create_history_indexes(cursor):
+    # Keyset pagination of history walks (status, last_completed_date, id)
+    # backwards; id is the rowid, which every index ends with.
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_completed "
+        "ON tasks(status, last_completed_date)",
+        "CREATE INDEX IF NOT EXISTS idx_archived_tasks_status_completed "
+        "ON archived_tasks(status, last_completed_date)",
+    ):
+        cursor.execute(statement)
+
+
+def _add_task_next_due(cursor):
+    # next_due is when a finished recurring task rolls over; rollover only
+    # looks at rows where it has passed. NULL for every other task, which the
+    # partial index leaves out.
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(tasks)")}
+    if "next_due" not in columns:
+        cursor.execute("ALTER TABLE tasks ADD COLUMN next_due INTEGER")
+    cursor.execute(
+        f"SELECT id, {', '.join(RECURRENCE_COLUMNS)} FROM tasks WHERE recurring = 1"
+    )
+    updates = [(stored_next_due(tuple(row)[1:]), row[0]) for row in cursor.fetchall()]
+    cursor.executemany("UPDATE tasks SET next_due = ? WHERE id = ?", updates)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_next_due "
+        "ON tasks(next_due) WHERE next_due IS NOT NULL"
+    )
+    # Migration 6 copied the tasks columns of its day; keep the archive in
+    # step with archived_tasks created on new databases, which have next_due
+    archive_columns = {
+        row[1] for row in cursor.execute("PRAGMA table_info(archived_tasks)")
+    }
+    if archive_columns and "next_due" not in archive_columns:
+        cursor.execute("ALTER TABLE archived_tasks ADD COLUMN next_due INTEGER")
+
+
+def create_schedule_settings(cursor):
+    """
+    Creates schedule_settings, or brings an existing table up to date, with
+    the CP-SAT solver profile columns. Migration 9, and ScheduleSettings
+    for databases opened before TaskManager has migrated them. NULL solver
+    values fall back to the defaults in ScheduleSettings.
+    """
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schedule_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            day_start TIME,
+            ideal_sleep_duration REAL,
+            overtime_flexibility TEXT,
+            hours_of_day_available REAL,
+            peak_productivity_start TIME,
+            peak_productivity_end TIME,
+            off_peak_start TIME,
+            off_peak_end TIME,
+            task_notifications BOOLEAN NOT NULL DEFAULT 1,
+            task_status_popup_frequency INTEGER,
+            alpha REAL,
+            beta REAL,
+            gamma REAL,
+            delta REAL,
+            epsilon REAL,
+            zeta REAL,
+            eta REAL,
+            theta REAL,
+            K INTEGER,
+            T_q INTEGER,
+            C INTEGER
+        )
+        """
+    )
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(schedule_settings)")}
+    for name, column_type in (
+        ("solver_time_limit", "REAL"),
+        ("solver_workers", "INTEGER"),
+        ("solver_relative_gap", "REAL"),
+        ("solver_random_seed", "INTEGER"),
+        ("solver_adaptive", "BOOLEAN"),
+    ):
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE schedule_settings ADD COLUMN {name} {column_type}")
+
+
+def _drop_global_weight(cursor):
+    # Global weights are derived by ScheduleManager when the schedule needs
+    # them (see ScheduleManager.global_weights) and were no longer written.
+    for table in ("tasks", "archived_tasks"):
+        columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        if "global_weight" in columns:
+            _rebuild_table(cursor, table, {}, ["global_weight"])
+
+
+MIGRATIONS = [
+    (1, "Store task chunks in task_chunks", _create_task_chunks),
+    (2, "Store task tags in task_tags", _create_task_tags),
+    (3, "Index hot task filter columns", _create_task_indexes),
+    (4, "Store task dates as epoch seconds", _store_task_dates_as_epoch),
+    (5, "Full-text index of task text", _create_task_search),
+    (6, "Archive table for old finished tasks", _create_archived_tasks),
+    (7, "Index completed task history", _create_history_indexes),
+    (8, "Precompute recurring task rollover", _add_task_next_due),
+    (9, "Schedule settings with the solver profile", create_schedule_settings),
+    (10, "Drop the unused tasks.global_weight column", _drop_global_weight),
+]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn, migrations=MIGRATIONS):
+    """
+    Applies every migration newer than the database's user_version, in order.
+    Returns the resulting schema version. A failing migration is rolled back
+    and later ones are not attempted.
+    """
+    version = get_schema_version(conn)
+    if conn.in_transaction:
+        conn.commit()
+    for target, description, migrate in sorted(migrations, key=lambda m: m[0]):
+        if target <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            # Explicit BEGIN so the DDL is part of the transaction too
+            cursor.execute("BEGIN")
+            migrate(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+            version = target
+            print(f"Applied migration {target}: {description}.")
+        except sqlite3.Error as e:
+            print(f"Error applying migration {target} ({description}): {e}")
+            conn.rollback()
+            break
+        finally:
+            cursor.close()
+    return version
@@ -2,16 +2,54 @@ import os
 import sqlite3
 import json
 import uuid
+from collections import deque
 from datetime import datetime, date, time, timedelta
 import random
 from ortools.sat.python import cp_model
 import math
-
+import numpy as np
+
+from core.database import DEFAULT_DB_PATH, get_database
+from core.migrations import create_schedule_settings
+from core.schedule_model import (
+    ADAPTIVE_PRESOLVE_PAIRS,
+    WARM_START_MIN_SHARE,
+    ScheduleModel,
+    adaptive_time_limit,
+    make_solver,
+)
+from core.schedule_worker import ScheduleJob, ScheduleWorker
+from core.task_codec import from_epoch_seconds
 from core.task_manager import TaskChunk, TaskManager
+from core.task_table import (
+    DEFAULT_EFFORT_CODE,
+    DEFAULT_FLEXIBILITY_CODE,
+    EFFORT_CODES,
+    FLEXIBILITY_CODES,
+    TaskTable,
+    epoch_seconds,
+)
 from core.utils import safe_json_loads, safe_json_dumps, from_bool_int, to_bool_int
 from core.signals import global_signals
 
 
+# Time-dependent weight terms (urgency, age, quick decay) are refreshed at
+# most this often, in seconds, unless tasks change
+WEIGHT_TIME_RESOLUTION = 60
+
+# CP-SAT solver profile defaults (see ScheduleSettings); a time limit of 0
+# means none and 0 workers lets CP-SAT choose
+DEFAULT_SOLVER_PROFILE = {
+    "solver_time_limit": 10.0,
+    "solver_workers": 0,
+    "solver_relative_gap": 0.01,
+    "solver_random_seed": 1,
+    "solver_adaptive": True,
+}
+# Solves kept in ScheduleManager.solve_history
+SOLVE_HISTORY_LIMIT = 100
+
+
 def time_to_string(t: time) -> str:
     return t.strftime("%H:%M")
 
@@ -57,80 +95,57 @@ def parse_time_schedule(schedule_data: dict) -> dict:
 
 
 class ScheduleSettings:
-    def __init__(self, db_path="data/adm.db"):
+    def __init__(self, db_path=DEFAULT_DB_PATH):
         self.db_path = db_path
+        self.db = get_database(db_path)
+        self.conn = self.db.conn
         self.create_table()
         self.load_settings()
 
     def create_table(self):
-        with sqlite3.connect(
-            self.db_path, detect_types=sqlite3.PARSE_DECLTYPES
-        ) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS schedule_settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    day_start TIME,
-                    ideal_sleep_duration REAL,
-                    overtime_flexibility TEXT,
-                    hours_of_day_available REAL,
-                    peak_productivity_start TIME,
-                    peak_productivity_end TIME,
-                    off_peak_start TIME,
-                    off_peak_end TIME,
-                    task_notifications BOOLEAN NOT NULL DEFAULT 1,
-                    task_status_popup_frequency INTEGER,
-                    alpha REAL,
-                    beta REAL,
-                    gamma REAL,
-                    delta REAL,
-                    epsilon REAL,
-                    zeta REAL,
-                    eta REAL,
-                    theta REAL,
-                    K INTEGER,
-                    T_q INTEGER,
-                    C INTEGER
-                )
-            """
-            )
+        # The schema is owned by core.migrations (migration 9)
+        with self.db.transaction() as conn:
+            create_schedule_settings(conn.cursor())
 
     def load_settings(self):
-        with sqlite3.connect(
-            self.db_path, detect_types=sqlite3.PARSE_DECLTYPES
-        ) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM schedule_settings LIMIT 1")
-            row = cursor.fetchone()
-            if row:
-                self.day_start = row["day_start"]
-                self.ideal_sleep_duration = row["ideal_sleep_duration"]
-                self.overtime_flexibility = row["overtime_flexibility"]
-                self.hours_of_day_available = row["hours_of_day_available"]
-                self.peak_productivity_hours = (
-                    row["peak_productivity_start"],
-                    row["peak_productivity_end"],
-                )
-                self.off_peak_hours = (row["off_peak_start"], row["off_peak_end"])
-                self.task_notifications = from_bool_int(row["task_notifications"])
-                self.task_status_popup_frequency = row["task_status_popup_frequency"]
-
-                # Load weighting coefficients
-                self.alpha = row["alpha"]
-                self.beta = row["beta"]
-                self.gamma = row["gamma"]
-                self.delta = row["delta"]
-                self.epsilon = row["epsilon"]
-                self.zeta = row["zeta"]
-                self.eta = row["eta"]
-                self.theta = row["theta"]
-                self.K = row["K"]
-                self.T_q = row["T_q"]
-                self.C = row["C"]
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM schedule_settings LIMIT 1")
+        row = cursor.fetchone()
+        cursor.close()
+        if row:
+            self.day_start = row["day_start"]
+            self.ideal_sleep_duration = row["ideal_sleep_duration"]
+            self.overtime_flexibility = row["overtime_flexibility"]
+            self.hours_of_day_available = row["hours_of_day_available"]
+            self.peak_productivity_hours = (
+                row["peak_productivity_start"],
+                row["peak_productivity_end"],
+            )
+            self.off_peak_hours = (row["off_peak_start"], row["off_peak_end"])
+            self.task_notifications = from_bool_int(row["task_notifications"])
+            self.task_status_popup_frequency = row["task_status_popup_frequency"]
+
+            # Load weighting coefficients
+            self.alpha = row["alpha"]
+            self.beta = row["beta"]
+            self.gamma = row["gamma"]
+            self.delta = row["delta"]
+            self.epsilon = row["epsilon"]
+            self.zeta = row["zeta"]
+            self.eta = row["eta"]
+            self.theta = row["theta"]
+            self.K = row["K"]
+            self.T_q = row["T_q"]
+            self.C = row["C"]
+
+            # Solver profile; rows saved before it existed hold NULLs
+            for name, default in DEFAULT_SOLVER_PROFILE.items():
+                value = row[name]
+                setattr(self, name, default if value is None else value)
+            self.solver_adaptive = from_bool_int(self.solver_adaptive)
 
-            else:
-                self.set_default_settings()
+        else:
+            self.set_default_settings()
 
     def set_default_settings(self):
         self.day_start = time(4, 0)
@@ -155,12 +170,14 @@ class ScheduleSettings:
         self.T_q = 3600
         self.C = 1000
 
+        # Default solver profile
+        for name, default in DEFAULT_SOLVER_PROFILE.items():
+            setattr(self, name, default)
+
         self.save_settings()
 
     def save_settings(self):
-        with sqlite3.connect(
-            self.db_path, detect_types=sqlite3.PARSE_DECLTYPES
-        ) as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM schedule_settings")
             cursor.execute(
@@ -169,8 +186,11 @@ class ScheduleSettings:
                     day_start, ideal_sleep_duration, overtime_flexibility,
                     hours_of_day_available, peak_productivity_start, peak_productivity_end,
                     off_peak_start, off_peak_end, task_notifications, task_status_popup_frequency,
-                    alpha, beta, gamma, delta, epsilon, zeta, eta, theta, K, T_q, C
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    alpha, beta, gamma, delta, epsilon, zeta, eta, theta, K, T_q, C,
+                    solver_time_limit, solver_workers, solver_relative_gap,
+                    solver_random_seed, solver_adaptive
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                          ?, ?, ?, ?, ?)
             """,
                 (
                     self.day_start,
@@ -194,9 +214,14 @@ class ScheduleSettings:
                     self.K,
                     self.T_q,
                     self.C,
+                    self.solver_time_limit,
+                    self.solver_workers,
+                    self.solver_relative_gap,
+                    self.solver_random_seed,
+                    to_bool_int(self.solver_adaptive),
                 ),
             )
-            conn.commit()
+            cursor.close()
 
     @staticmethod
     def parse_time(time_str):
@@ -283,8 +308,39 @@ class ScheduleSettings:
         self.task_status_popup_frequency = frequency
         self.save_settings()
 
+    def set_solver_profile(
+        self, time_limit=None, workers=None, relative_gap=None, random_seed=None, adaptive=None
+    ):
+        """Updates the given parts of the CP-SAT solver profile."""
+        for name, value in (
+            ("solver_time_limit", time_limit),
+            ("solver_workers", workers),
+            ("solver_relative_gap", relative_gap),
+            ("solver_random_seed", random_seed),
+            ("solver_adaptive", adaptive),
+        ):
+            if value is not None:
+                setattr(self, name, value)
+        self.save_settings()
+
 
 class TimeBlock:
+    # Rebuilt for every day of the schedule on each refresh
+    __slots__ = (
+        "id",
+        "name",
+        "date",
+        "list_categories",
+        "task_tags",
+        "block_type",
+        "color",
+        "task_chunks",
+        "start_time",
+        "end_time",
+        "duration",
+        "buffer_ratio",
+    )
+
     def __init__(
         self,
         block_id=None,
@@ -355,14 +411,38 @@ class TimeBlock:
 
 class ScheduleManager:
     def __init__(self, task_manager_instance: TaskManager):
+        self._setup(task_manager_instance)
+        self.load_time_blocks()
+
+        # The first schedule is solved in the background too; until it is
+        # published (global_signals.schedule_updated) the schedule is empty
+        self.request_refresh()
+
+        # Connect signals
+        global_signals.task_list_updated.connect(self._on_tasks_changed)
+        global_signals.refresh_schedule_signal.connect(self.request_refresh)
+
+    @classmethod
+    def without_schedule(cls, task_manager_instance: TaskManager):
+        """
+        Returns a ScheduleManager with its settings, weight coefficients and
+        task table set up, but without loading time blocks, solving a
+        schedule or connecting signals. For scripts and tests that only use
+        the task weights.
+        """
+        manager = cls.__new__(cls)
+        manager._setup(task_manager_instance)
+        return manager
+
+    def _setup(self, task_manager_instance):
         self.task_manager_instance = task_manager_instance
         self.schedule_settings = ScheduleSettings()
 
         self.data_dir = "data"
         os.makedirs(self.data_dir, exist_ok=True)
         self.db_file = os.path.join(self.data_dir, "adm.db")
-        self.conn = sqlite3.connect(self.db_file)
-        self.conn.row_factory = sqlite3.Row
+        self.db = get_database(self.db_file)
+        self.conn = self.db.conn
         self.create_tables()
 
         # Load weighting coefficients from settings
@@ -381,30 +461,34 @@ class ScheduleManager:
         self.C = self.schedule_settings.C
 
         self.time_blocks = []
-        self.load_time_blocks()
-
-        self.active_tasks = self.task_manager_instance.get_active_tasks()
-        self.update_task_global_weights()
-
-        self.day_schedules = self.load_day_schedules()
-
-        self.estimate_daily_buffer_ratios()
-
-        self.chunks = self.chunk_tasks()
-
-        self.generate_schedule()
-
-        # Connect signals
-        global_signals.task_list_updated.connect(self._on_tasks_changed)
-        global_signals.refresh_schedule_signal.connect(self.refresh_schedule)
+        self.day_schedules = []
+        self.chunks = []
+
+        # Columnar copy of the active tasks, kept in step by _sync_active_tasks
+        self.task_table = TaskTable(self.task_manager_instance)
+        self.task_table.add_derived_column("static_weight", self._static_weight)
+        # (task table generation, reference epoch seconds, global weights)
+        self._global_weights = None
+
+        # Outcome of recent solves, and the last solution as a ScheduleModel
+        # plan, see solve_schedule_with_cp
+        self.solve_history = deque(maxlen=SOLVE_HISTORY_LIMIT)
+        self._last_plan = None
+        # schedule_fingerprint() of the current schedule, and how many
+        # refreshes rebuilt it or found it current
+        self._solved_fingerprint = None
+        self.solve_counts = {"executed": 0, "skipped": 0}
+        # Solves requested through request_refresh run here
+        self._worker = ScheduleWorker(self._solve_job)
+        self._worker.finished.connect(self._on_job_finished)
 
     def _on_tasks_changed(self):
-        # this will in turn re‐weight and re‐assign if you like
-        self.update_task_global_weights()
-        self.generate_schedule()
+        # this will in turn re‐weight and re‐assign in the background if
+        # anything changed
+        self.request_refresh()
 
     def create_tables(self):
-        with self.conn:
+        with self.db.transaction():
             self.conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS time_blocks (
@@ -526,7 +610,7 @@ class ScheduleManager:
                     unavailable,
                 ),
             )
-            self.conn.commit()
+            self.db.commit()
 
             new_id = cursor.lastrowid
             time_block["id"] = new_id
@@ -539,11 +623,11 @@ class ScheduleManager:
 
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-            self.conn.rollback()
+            self.db.rollback()
             raise
         except Exception as e:
             print(f"Error adding time block: {e}")
-            self.conn.rollback()
+            self.db.rollback()
             raise
 
     def remove_time_block(self, block_id: int):
@@ -567,7 +651,7 @@ class ScheduleManager:
                 # This might happen if DB and memory are out of sync, log it but proceed with memory removal
                 print(f"Warning: Time block with ID {block_id} not found in database during removal.")
                 # return False # Decide if this should be a hard failure
-            self.conn.commit()
+            self.db.commit()
 
             self.time_blocks.remove(block_to_remove)
             cursor.close()
@@ -576,11 +660,11 @@ class ScheduleManager:
 
         except sqlite3.Error as e:
             print(f"Database error while removing time block: {e}")
-            self.conn.rollback()
+            self.db.rollback()
             raise
         except Exception as e:
             print(f"Unexpected error while removing time block: {e}")
-            self.conn.rollback()
+            self.db.rollback()
             raise
 
     def update_time_block(self, updated_block: dict):
@@ -654,7 +738,7 @@ class ScheduleManager:
                 # Log this, but don't necessarily fail, as memory might be correct
                 print(f"Warning: Time block with ID {block_id} not found in database during update.")
             
-            self.conn.commit()
+            self.db.commit()
 
             # Update the in-memory record carefully
             # Create a copy to modify for the in-memory update
@@ -670,15 +754,13 @@ class ScheduleManager:
 
         except sqlite3.Error as e:
             print(f"Database error while updating time block: {e}")
-            if self.conn: # Check if connection exists before rollback
-                 self.conn.rollback()
+            self.db.rollback()
             # Re-raise or handle as appropriate
             # raise 
             return False # Indicate failure on DB error
         except Exception as e:
             print(f"Error updating time block: {e}")
-            if self.conn:
-                 self.conn.rollback()
+            self.db.rollback()
             # raise
             return False # Indicate failure on other errors
         finally:
@@ -747,30 +829,34 @@ class ScheduleManager:
 
         return result
 
-    def task_weight_formula(self, task, max_added_time, max_time_estimate):
+    def task_weight_formula(self, task, max_added_time, max_time_estimate, now=None):
         # W = αP + β(1/ max(1,D)) + γF + δ(A/M_A) + εE + ζ(T/M_T) + η(L/T) + Q + M
+        # Single-task form of task_weights(); keep the two in step.
+        now = now or datetime.now()
         priority_weight = self.alpha * task.priority
 
         if task.due_datetime:
             days_left = max(
-                1, (task.due_datetime - datetime.now()).total_seconds() / (24 * 3600)
+                1, (task.due_datetime - now).total_seconds() / (24 * 3600)
             )
             urgency_weight = self.beta * (1 / days_left)
         else:
             urgency_weight = self.beta * 0.5
 
-        flexibility_map = {"Strict": 0, "Flexible": 1, "Very Flexible": 2}
-        flexibility_weight = self.gamma * flexibility_map.get(task.flexibility, 1)
+        flexibility_weight = self.gamma * FLEXIBILITY_CODES.get(
+            task.flexibility, DEFAULT_FLEXIBILITY_CODE
+        )
 
         if task.added_date_time:
             added_time_weight = self.delta * (
-                (datetime.now() - task.added_date_time).total_seconds() / max_added_time
+                (now - task.added_date_time).total_seconds() / max_added_time
             )
         else:
             added_time_weight = self.delta * 0.5
 
-        effort_map = {"Low": 1, "Medium": 2, "High": 3}
-        effort_weight = self.epsilon * effort_map.get(task.effort_level, 2)
+        effort_weight = self.epsilon * EFFORT_CODES.get(
+            task.effort_level, DEFAULT_EFFORT_CODE
+        )
 
         if task.time_estimate and max_time_estimate > 0:
             time_estimate_weight = self.zeta * (task.time_estimate / max_time_estimate)
@@ -785,7 +871,7 @@ class ScheduleManager:
         # Quick task weight Q = K * exp(-t / T_q)
         if hasattr(task, "quick") and task.quick:
             t = (
-                (datetime.now() - task.added_date_time).total_seconds()
+                (now - task.added_date_time).total_seconds()
                 if task.added_date_time
                 else 0
             )
@@ -812,43 +898,115 @@ class ScheduleManager:
             + manually_weight
         )
 
-    def update_task_global_weights(self):
-        # always pull the latest tasks
-        self.active_tasks = self.task_manager_instance.get_active_tasks()
-
-        # then compute your max_added_time, etc.
-        max_added_time = (
-            max(
-                (datetime.now() - task.added_date_time).total_seconds()
-                for task in self.active_tasks
-                if task.added_date_time
-            )
-            if any(task.added_date_time for task in self.active_tasks)
-            else 1
-        )
+    def _sync_active_tasks(self):
+        """Applies task changes to the task table and refreshes active_tasks."""
+        self.task_table.sync()
+        self.active_tasks = list(self.task_table.tasks)
 
-        max_time_estimate = max(
-            (task.time_estimate for task in self.active_tasks if task.time_estimate),
-            default=1,
+    def _static_weight(self, table, row):
+        """
+        The task_weight_formula terms that only change with the task itself
+        (priority, flexibility, effort, logged time, manual scheduling).
+        Kept per row as the task table's static_weight column.
+        """
+        time_estimate = table.column("time_estimate")[row]
+        time_logged = table.column("time_logged")[row]
+        weight = (
+            self.alpha * table.column("priority")[row]
+            + self.gamma * table.column("flexibility")[row]
+            + self.epsilon * table.column("effort")[row]
         )
+        if time_logged and time_estimate:
+            weight += self.eta * (time_logged / time_estimate)
+        if table.column("manually_scheduled")[row]:
+            weight += self.C
+        return float(weight)
 
-        total_weight = sum(
-            self.task_weight_formula(task, max_added_time, max_time_estimate)
-            for task in self.active_tasks
+    def _time_weights(self, now_seconds):
+        """
+        Returns the remaining task_weight_formula terms for every task table
+        row: urgency, added time and quick-task decay, which move with
+        ``now_seconds``, and the time estimate share, which moves with the
+        largest estimate.
+        """
+        table = self.task_table
+        due = table.column("due")
+        added = table.column("added")
+        time_estimate = table.column("time_estimate")
+
+        has_due = ~np.isnan(due)
+        has_added = ~np.isnan(added)
+        has_estimate = time_estimate != 0
+        age = np.where(has_added, now_seconds - added, 0.0)
+        max_added_time = age[has_added].max() if has_added.any() else 1
+        max_time_estimate = time_estimate[has_estimate].max() if has_estimate.any() else 1
+
+        # NaN due dates are masked out by np.where
+        with np.errstate(invalid="ignore"):
+            days_left = np.maximum(1, (due - now_seconds) / (24 * 3600))
+        weights = np.where(has_due, self.beta * (1 / days_left), self.beta * 0.5)
+        weights += np.where(
+            has_added, self.delta * (age / max_added_time), self.delta * 0.5
         )
+        if max_time_estimate > 0:
+            weights += np.where(
+                has_estimate, self.zeta * (time_estimate / max_time_estimate), 0.0
+            )
+        weights += np.where(table.column("quick"), self.K * np.exp(-age / self.T_q), 0.0)
+        return weights
+
+    def task_weights(self, now=None):
+        """
+        Returns task_weight_formula for every task table row as one array,
+        against one reference time ``now``. The max added time and max time
+        estimate are taken over the table, as update_task_global_weights
+        always did.
+        """
+        now_seconds = epoch_seconds(now or datetime.now())
+        return self.task_table.column("static_weight") + self._time_weights(now_seconds)
 
+    def global_weights(self, now=None):
+        """
+        Returns every task table row's weight divided by the sum over all
+        rows, as an array in row order (see global_weight_of).
+
+        Static terms are kept per task by the task table and only recomputed
+        for tasks that changed, with their sum as a running total. The
+        time-dependent terms are recomputed lazily: only when weights are
+        asked for, and then only if tasks changed or WEIGHT_TIME_RESOLUTION
+        seconds have passed since the cached result.
+        """
+        table = self.task_table
+        now_seconds = epoch_seconds(now or datetime.now())
+        cached = self._global_weights
+        if (
+            cached is not None
+            and cached[0] == table.generation
+            and 0 <= now_seconds - cached[1] < WEIGHT_TIME_RESOLUTION
+        ):
+            return cached[2]
+        time_weights = self._time_weights(now_seconds)
+        total_weight = table.total("static_weight") + time_weights.sum()
         if total_weight == 0:
-            return
+            weights = np.zeros(len(table))
+        else:
+            weights = (table.column("static_weight") + time_weights) / total_weight
+        self._global_weights = (table.generation, now_seconds, weights)
+        return weights
 
-        for task in self.active_tasks:
-            global_weight = (
-                self.task_weight_formula(task, max_added_time, max_time_estimate)
-                / total_weight
-            )
-            task.global_weight = global_weight
-            self.task_manager_instance.update_task(task)
+    def global_weight_of(self, task, now=None):
+        """Returns ``task``'s global weight, or None if it is not an active task."""
+        row = self.task_table.row_of(task.id)
+        return None if row is None else float(self.global_weights(now)[row])
 
-        self.conn.commit()
+    def update_task_global_weights(self):
+        """
+        Brings the task table up to date, which refreshes the static weight
+        terms of changed tasks. Global weights are derived data: they are
+        computed on demand by global_weights() and not written back to the
+        tasks table.
+        """
+        self._sync_active_tasks()
 
     def get_day_schedule(self, date):
         for schedule in self.day_schedules:
@@ -868,12 +1026,10 @@ class ScheduleManager:
 
         # Determine the latest due date among active tasks (if any)
         latest_due_date = None
-        if self.active_tasks and any(task.due_datetime for task in self.active_tasks):
-            latest_due_date = max(
-                task.due_datetime.date()
-                for task in self.active_tasks
-                if task.due_datetime
-            )
+        due = self.task_table.column("due")
+        due = due[~np.isnan(due)]
+        if len(due):
+            latest_due_date = from_epoch_seconds(int(due.max())).date()
 
         min_end_date = today + timedelta(days=MIN_SCHEDULE_DAYS - 1)
         max_end_date = today + timedelta(days=MAX_SCHEDULE_DAYS - 1)
@@ -888,26 +1044,30 @@ class ScheduleManager:
         num_days = (end_date - today).days + 1
         return [DaySchedule(self, today + timedelta(days=i)) for i in range(num_days)]
 
-    def estimate_daily_buffer_ratios(self, max_buffer_ratio=0.8):
+    def estimate_daily_buffer_ratios(self, max_buffer_ratio=0.8, day_schedules=None):
         """
         Estimate each day's buffer ratio before tasks are assigned to timeblocks.
         The buffer ratio is computed as the fraction of free time (i.e. EAT minus estimated workload)
         relative to the day's effective available time (EAT), but capped by max_buffer_ratio.
+        Works on ``day_schedules`` (default: self.day_schedules).
         """
+        if day_schedules is None:
+            day_schedules = self.day_schedules
+
         # 1. Calculate total workload from all active tasks (in hours)
-        total_workload = sum(task.time_estimate for task in self.active_tasks)
+        total_workload = float(self.task_table.column("time_estimate").sum())
 
         # 2. Sum the EAT (Effective Available Time) across all days (in hours)
-        total_eat = sum(day_schedule.get_eat() for day_schedule in self.day_schedules)
+        total_eat = sum(day_schedule.get_eat() for day_schedule in day_schedules)
 
         # 3. Handle edge case: if no time is available
         if total_eat <= 0:
-            for day_schedule in self.day_schedules:
+            for day_schedule in day_schedules:
                 day_schedule.assign_buffer_ratio(0.0)
             return
 
         # 4. For each day, estimate the workload share and compute free time and buffer ratio.
-        for day_schedule in self.day_schedules:
+        for day_schedule in day_schedules:
             day_eat = day_schedule.get_eat()
             # Estimate workload for this day, proportionally to its available time.
             day_workload_est = (day_eat / total_eat) * total_workload
@@ -924,53 +1084,86 @@ class ScheduleManager:
             # day_schedule.assign_buffer_ratio(buffer_ratio)
             day_schedule.assign_buffer_ratio(buffer_ratio)
 
-    def chunk_tasks(self):
+    def chunk_tasks(self, day_schedules=None):
+        """
+        Returns TaskChunks for the active tasks' chunks, with recurring
+        chunks repeated over ``day_schedules`` (default: self.day_schedules).
+        """
+        if day_schedules is None:
+            day_schedules = self.day_schedules
         chunks = []
         recurrence_end_date = datetime.now() + timedelta(
-            days=int(len(self.day_schedules)) - 1
+            days=int(len(day_schedules)) - 1
         )
 
-        for task in self.active_tasks:
-            for chunk_data in task.chunks:
-                base_chunk_id = chunk_data.get("id")
+        # Every chunk of the active tasks, whatever its status, read through
+        # the task index of task_chunks and kept in active task order
+        active_tasks_by_id = {task.id: task for task in self.active_tasks}
+        task_order = {task_id: i for i, task_id in enumerate(active_tasks_by_id)}
+        chunk_rows = self.task_manager_instance.get_chunks(task_ids=active_tasks_by_id)
+        chunk_rows.sort(key=lambda chunk_data: task_order[chunk_data["task_id"]])
+        for chunk_data in chunk_rows:
+            task = active_tasks_by_id[chunk_data["task_id"]]
+            base_chunk_id = chunk_data.get("id")
+
+            # Ensure date is a datetime.date object
+            date_value = chunk_data.get("date")
+            if isinstance(date_value, str):
+                try:
+                    date_value = datetime.strptime(date_value, "%Y-%m-%d").date()
+                except ValueError:
+                    date_value = None
+
+            chunk_obj = TaskChunk(
+                id=base_chunk_id,
+                task=task,
+                chunk_type=chunk_data.get("type"),
+                unit=chunk_data.get("unit"),
+                size=chunk_data.get("size"),
+                timeblock_ratings=chunk_data.get("timeblock_ratings", []),
+                timeblock=chunk_data.get("time_block"),
+                date=date_value,
+                is_recurring=task.recurring,
+                status=chunk_data.get("status", "active"),
+            )
+            chunks.append(chunk_obj)
 
-                # Ensure date is a datetime.date object
-                date_value = chunk_data.get("date")
-                if isinstance(date_value, str):
+            if task.recurring:
+                recurrence_count = 1
+                if isinstance(task.recur_every, int):
                     try:
-                        date_value = datetime.strptime(date_value, "%Y-%m-%d").date()
+                        base_date = (
+                            chunk_obj.date
+                            if chunk_obj.date
+                            else datetime.now().date()
+                        )
                     except ValueError:
-                        date_value = None
-
-                chunk_obj = TaskChunk(
-                    id=base_chunk_id,
-                    task=task,
-                    chunk_type=chunk_data.get("type"),
-                    unit=chunk_data.get("unit"),
-                    size=chunk_data.get("size"),
-                    timeblock_ratings=chunk_data.get("timeblock_ratings", []),
-                    timeblock=chunk_data.get("time_block"),
-                    date=date_value,
-                    is_recurring=task.recurring,
-                    status=chunk_data.get("status", "active"),
-                )
-                chunks.append(chunk_obj)
-
-                if task.recurring:
-                    recurrence_count = 1
-                    if isinstance(task.recur_every, int):
-                        try:
-                            base_date = (
-                                chunk_obj.date
-                                if chunk_obj.date
-                                else datetime.now().date()
-                            )
-                        except ValueError:
-                            base_date = datetime.now().date()
+                        base_date = datetime.now().date()
+
+                    next_date = base_date
+                    while next_date < recurrence_end_date.date():
+                        next_date += timedelta(days=task.recur_every)
+                        recurring_chunk = TaskChunk(
+                            id=f"{base_chunk_id}_{recurrence_count}",
+                            task=task,
+                            chunk_type=chunk_data.get("type"),
+                            unit=chunk_data.get("unit"),
+                            size=chunk_data.get("size"),
+                            timeblock_ratings=chunk_data.get(
+                                "timeblock_ratings", []
+                            ),
+                            timeblock=chunk_data.get("time_block"),
+                            date=next_date,
+                            is_recurring=True,
+                            status="locked",
+                        )
+                        chunks.append(recurring_chunk)
+                        recurrence_count += 1
 
-                        next_date = base_date
-                        while next_date < recurrence_end_date.date():
-                            next_date += timedelta(days=task.recur_every)
+                elif isinstance(task.recur_every, list):
+                    current_date = datetime.now().date()
+                    while current_date <= recurrence_end_date.date():
+                        if current_date.strftime("%A") in task.recur_every:
                             recurring_chunk = TaskChunk(
                                 id=f"{base_chunk_id}_{recurrence_count}",
                                 task=task,
@@ -981,232 +1174,133 @@ class ScheduleManager:
                                     "timeblock_ratings", []
                                 ),
                                 timeblock=chunk_data.get("time_block"),
-                                date=next_date,
+                                date=current_date,
                                 is_recurring=True,
                                 status="locked",
                             )
                             chunks.append(recurring_chunk)
                             recurrence_count += 1
-
-                    elif isinstance(task.recur_every, list):
-                        current_date = datetime.now().date()
-                        while current_date <= recurrence_end_date.date():
-                            if current_date.strftime("%A") in task.recur_every:
-                                recurring_chunk = TaskChunk(
-                                    id=f"{base_chunk_id}_{recurrence_count}",
-                                    task=task,
-                                    chunk_type=chunk_data.get("type"),
-                                    unit=chunk_data.get("unit"),
-                                    size=chunk_data.get("size"),
-                                    timeblock_ratings=chunk_data.get(
-                                        "timeblock_ratings", []
-                                    ),
-                                    timeblock=chunk_data.get("time_block"),
-                                    date=current_date,
-                                    is_recurring=True,
-                                    status="locked",
-                                )
-                                chunks.append(recurring_chunk)
-                                recurrence_count += 1
-                            current_date += timedelta(days=1)
+                        current_date += timedelta(days=1)
 
         return chunks
 
     def solve_schedule_with_cp(self):
         """
         This method uses OR-Tools CP-SAT to assign task chunks to available time blocks.
-        It creates decision variables for each (chunk, block) pair, enforces full allocation,
-        capacity, and minimum/maximum allocation constraints, and maximizes an objective based
-        on task ratings. After solving, it updates each time block's assigned chunks; if any
-        chunk has an unscheduled remainder, that chunk is flagged.
+        The model (see core.schedule_model.ScheduleModel) has decision variables for each
+        allowed (chunk, block) pair, enforces full allocation, capacity, and minimum/maximum
+        allocation constraints, and maximizes an objective based on task ratings. After
+        solving, it updates each time block's assigned chunks; if any chunk has an
+        unscheduled remainder, that chunk is flagged. The solver runs with the profile in
+        ScheduleSettings (see _make_solver) and starts from the previous solve's plan
+        where it still fits; each solve's status, gap and timings are appended to
+        ``self.solve_history``.
+
+        Solves self.chunks into self.day_schedules on the calling thread; see
+        request_refresh for solving in the background.
         """
-        scale = 10  # Scale factor: converts fractional hours to integers
+        job = self._make_job(None, self.day_schedules, self.chunks)
+        self._solve_job(job)
+        self._finish_job(job)
 
+    def _make_job(self, fingerprint, day_schedules, chunks):
+        """
+        Returns a ScheduleJob for rated ``chunks`` and ``day_schedules``.
+        Reads the task weights and settings, so it runs on the GUI thread.
+        """
         # --- Step 1. Prepare Data: Flatten available time blocks from all day schedules ---
-        all_blocks = []
-        block_capacity = {}  # key: block.id, value: capacity in scaled units
-        for day in self.day_schedules:
-            for block in day.time_blocks:
-                if block.block_type == "unavailable":
-                    continue
-                all_blocks.append(block)
-                # Compute available capacity in hours and then scale it.
-                cap = block.get_available_time()
-                block_capacity[block.id] = int(cap * scale + 0.5)
+        all_blocks = [
+            block
+            for day in day_schedules
+            for block in day.time_blocks
+            if block.block_type != "unavailable"
+        ]
 
         # --- Step 2. Prepare Chunks ---
-        all_chunks = self.chunks
-        all_chunks.sort(
-            key=lambda chunk: getattr(chunk.task, "global_weight", float("-inf")),
-            reverse=True,
+        global_weights = self.global_weights()
+        row_of = self.task_table.row_of
+
+        def chunk_weight_key(chunk):
+            row = row_of(chunk.task.id)
+            return float("-inf") if row is None else global_weights[row]
+
+        chunks.sort(key=chunk_weight_key, reverse=True)
+
+        # The solve must not read the live Task objects, which the GUI thread
+        # may edit meanwhile; copy the fields it uses
+        chunk_limits = [
+            (chunk.task.min_chunk_size, chunk.task.max_chunk_size) for chunk in chunks
+        ]
+        task_names = [chunk.task.name for chunk in chunks]
+
+        settings = self.schedule_settings
+        profile = {name: getattr(settings, name) for name in DEFAULT_SOLVER_PROFILE}
+        return ScheduleJob(
+            fingerprint,
+            day_schedules,
+            chunks,
+            all_blocks,
+            chunk_limits,
+            task_names,
+            profile,
+            self._last_plan,
         )
 
-        # --- Step 4. Build Allowed Assignments ---
-        # For every (chunk, block) pair, record the rating and the full chunk weight (scaled).
-        allowed_assignments = {}  # Key: (chunk.id, block.id)
-
-        for chunk in all_chunks:
-            # Convert chunk's total size to scaled units.
-            full_weight = int(chunk.size * scale + 0.5)
-
-            for block_obj, rating in chunk.timeblock_ratings:
-                # If the block is flagged "unavailable," you can skip it here, or
-                # handle it earlier so that chunk.timeblock_ratings never includes it.
-
-                allowed_assignments[(chunk.id, block_obj.id)] = {
-                    "rating": rating,
-                    "full_weight": full_weight,
-                }
-
-        # --- Step 5. Create the CP-SAT Model ---
-        model = cp_model.CpModel()
-
-        # Decision variables: assign[(c,b)] is binary; alloc[(c,b)] is the scaled allocated units.
-        assign = {}
-        alloc = {}
-        for (c_id, b_id), data in allowed_assignments.items():
-            assign[(c_id, b_id)] = model.NewBoolVar(f"assign_{c_id}_{b_id}")
-            full_weight = data["full_weight"]
-            alloc[(c_id, b_id)] = model.NewIntVar(
-                0, full_weight, f"alloc_{c_id}_{b_id}"
-            )
-
-        # Unscheduled variables and chunk parameters.
-        unsched_manual = {}
-        unsched_auto = {}
-        chunk_weight = {}  # Full chunk weight in scaled units.
-        chunk_min = {}  # Minimum allocation per block (scaled)
-        chunk_max = {}  # Maximum allocation per block (scaled)
-
-        for chunk in all_chunks:
-            # Scale the total chunk size.
-            w = int(chunk.size * scale + 0.5)
-            chunk_weight[chunk.id] = w
-            if chunk.chunk_type == "auto":
-                # Scale the minimum size. Use default 0.5 if not provided.
-                m = int(chunk.task.min_chunk_size * scale + 0.5)
-                chunk_min[chunk.id] = m
-                # Scale the maximum size. If not provided, default to full size.
-                M = int(chunk.task.max_chunk_size * scale + 0.5)
-                chunk_max[chunk.id] = M
-
-        # Create unscheduled variables based on chunk type.
-        for chunk in all_chunks:
-            if chunk.chunk_type == "manual":
-                # For manual chunks, unscheduled is a binary flag (1 means not scheduled anywhere).
-                unsched_manual[chunk.id] = model.NewBoolVar(f"unsched_{chunk.id}")
-            else:
-                # For auto chunks, unscheduled is an integer variable (units left unscheduled).
-                unsched_auto[chunk.id] = model.NewIntVar(
-                    0, chunk_weight[chunk.id], f"unsched_{chunk.id}"
-                )
+    def _solve_job(self, job):
+        """
+        Builds and solves ``job``'s model and assigns its chunks to its
+        blocks. Only touches the job, so it may run on a worker thread.
+        """
+        all_chunks = job.chunks
+        all_blocks = job.blocks
 
-        # --- Constraints ---
-
-        # (1) Full Allocation Constraints:
-        # For each chunk, the sum of allocations over all blocks plus any unscheduled amount must equal the full chunk weight.
-        # For manual chunks, the chunk must be fully assigned in one block or marked unscheduled.
-        for chunk in [c for c in all_chunks if c.chunk_type == "manual"]:
-            possible_assignments = []
-            for cid, b_id in assign:
-                if cid == chunk.id:
-                    possible_assignments.append(assign[(cid, b_id)])
-                    # If assigned to a block, then allocation must equal the full chunk weight.
-                    model.Add(
-                        alloc[(cid, b_id)] == chunk_weight[chunk.id]
-                    ).OnlyEnforceIf(assign[(cid, b_id)])
-                    # Otherwise, no allocation is made.
-                    model.Add(alloc[(cid, b_id)] == 0).OnlyEnforceIf(
-                        assign[(cid, b_id)].Not()
-                    )
-            # Ensure that the chunk is assigned exactly once or left unscheduled.
-            model.Add(sum(possible_assignments) + unsched_manual[chunk.id] == 1)
-
-        # For auto (splittable) chunks, the sum of allocations across all blocks plus unscheduled units equals the full weight.
-        # Also, for each assignment, if it is made, the allocation must be between the min and max allowed.
-        for chunk in [c for c in all_chunks if c.chunk_type == "auto"]:
-            possible_allocs = []
-            for cid, b_id in alloc:
-                if cid == chunk.id:
-                    # Enforce a minimum allocation if this assignment is made.
-                    m = chunk_min[chunk.id]
-                    model.Add(alloc[(cid, b_id)] >= m).OnlyEnforceIf(
-                        assign[(cid, b_id)]
-                    )
-                    # Enforce a maximum allocation if this assignment is made.
-                    M = chunk_max[chunk.id]
-                    model.Add(alloc[(cid, b_id)] <= M).OnlyEnforceIf(
-                        assign[(cid, b_id)]
-                    )
-                    # If not assigned, then allocation must be zero.
-                    model.Add(alloc[(cid, b_id)] == 0).OnlyEnforceIf(
-                        assign[(cid, b_id)].Not()
-                    )
-                    possible_allocs.append(alloc[(cid, b_id)])
-            model.Add(
-                sum(possible_allocs) + unsched_auto[chunk.id] == chunk_weight[chunk.id]
-            )
-            # Note: The flexibility of splitting is inherent in allowing multiple assignments
-            # that each must satisfy the min and max limits.
-
-        # (2) Capacity Constraints:
-        # The total allocated units in each time block must not exceed its available capacity.
-        for block in all_blocks:
-            block_allocs = []
-            for c_id, b_id in alloc:
-                if b_id == block.id:
-                    block_allocs.append(alloc[(c_id, b_id)])
-            model.Add(sum(block_allocs) <= block_capacity[block.id])
-
-        # --- Objective Function ---
-        # Our goal is to maximize the total rating (which factors in global importance) from all allocations
-        # while penalizing any unscheduled portions.
-        penalty_manual = 100  # Penalty for each unscheduled manual chunk (a high value discourages unscheduling)
-        penalty_auto = 100  # Penalty per unit (scaled) unscheduled for auto chunks
-
-        objective_terms = []
-
-        # For each allowed (chunk, block) pair, add its contribution (rating * allocation).
-        for (c_id, b_id), var in alloc.items():
-            rating = allowed_assignments[(c_id, b_id)]["rating"]
-            objective_terms.append(rating * var)
-
-        # Subtract penalty terms for unscheduled work.
-        for chunk in [c for c in all_chunks if c.chunk_type == "manual"]:
-            objective_terms.append(-penalty_manual * unsched_manual[chunk.id])
-        for chunk in [c for c in all_chunks if c.chunk_type == "auto"]:
-            objective_terms.append(-penalty_auto * unsched_auto[chunk.id])
-
-        # Set the objective to maximize the total benefit.
-        model.Maximize(sum(objective_terms))
-
-        # --- Step 9. Solve the Model ---
-        solver = cp_model.CpSolver()
-        status = solver.Solve(model)
+        # --- Step 3. Build and solve the CP-SAT model ---
+        schedule_model = ScheduleModel(all_chunks, all_blocks, chunk_limits=job.chunk_limits)
+        if job.cancelled:
+            return
+        # Hint the last plan, matched by chunk id and block_key, so a re-solve
+        # of a mostly unchanged backlog starts next to its optimum
+        if job.previous_plan or job.profile["solver_adaptive"]:
+            schedule_model.add_hint(schedule_model.starting_plan(job.previous_plan))
+        warm_start = (schedule_model.reused_share or 0) >= WARM_START_MIN_SHARE
+        solver = self._make_solver(schedule_model, job.profile, warm_start)
+        if not job.attach_solver(solver):
+            return
+        solver, status = schedule_model.solve(solver)
+        if job.cancelled:
+            return
+        stats = {
+            "chunks": len(all_chunks),
+            "blocks": len(all_blocks),
+            "pairs": len(schedule_model.pair_chunk),
+            "status": schedule_model.status_name,
+            "objective": schedule_model.objective,
+            "gap": schedule_model.gap,
+            "warm_start": warm_start,
+            "reused_share": schedule_model.reused_share,
+            "time_limit": solver.parameters.max_time_in_seconds,
+            "build": schedule_model.build_seconds,
+            "solve": schedule_model.solve_seconds,
+        }
+        job.stats = stats
+        gap = "n/a" if stats["gap"] is None else f"{stats['gap']:.2%}"
+        print(
+            f"Schedule model: {stats['chunks']} chunks, {stats['blocks']} blocks, "
+            f"{stats['pairs']} pairs; built in {stats['build'] * 1000:.1f} ms, "
+            f"solved in {stats['solve'] * 1000:.1f} ms ({stats['status']}, gap {gap}"
+            f"{', warm start' if warm_start else ''})."
+        )
 
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             print("Solution found:")
+            job.plan = schedule_model.plan(solver)
             # Iterate over each chunk to record its allocation.
-            for chunk in all_chunks:
-                # Gather allocations: for each (chunk, block) pair that was chosen,
-                # we record the block object and the allocated hours.
-                block_allocations = []
-                total_assigned_scaled = 0
-                for c_id, b_id in assign:
-                    if c_id == chunk.id:
-                        if solver.Value(assign[(c_id, b_id)]) == 1:
-                            alloc_units = solver.Value(alloc[(c_id, b_id)])
-                            if alloc_units > 0:
-                                allocated_hours = alloc_units / scale
-                                total_assigned_scaled += alloc_units
-                                block_obj = next(
-                                    (b for b in all_blocks if b.id == b_id), None
-                                )
-                                block_allocations.append((block_obj, allocated_hours))
-
-                # Retrieve the unscheduled value using the appropriate unsched list.
+            for i, chunk in enumerate(all_chunks):
+                # (block, allocated hours, rating) for each block the chunk was given time in
+                block_allocations = schedule_model.allocations(solver, i)
+                unsched_amt = solver.Value(schedule_model.unscheduled[i])
+
                 if chunk.chunk_type == "manual":
-                    unsched_amt = solver.Value(unsched_manual[chunk.id])
                     # For manual chunks, a value of 1 means the chunk was not scheduled.
                     if unsched_amt == 1:
                         print(f"Manual Chunk {chunk.id} is UNSCHEDULED.")
@@ -1214,10 +1308,7 @@ class ScheduleManager:
                     else:
                         # Manual chunks should be assigned fully to one block.
                         if len(block_allocations) == 1:
-                            block_obj, alloc_hours = block_allocations[0]
-                            rating = allowed_assignments.get(
-                                (chunk.id, block_obj.id), {}
-                            ).get("rating", 100)
+                            block_obj, alloc_hours, rating = block_allocations[0]
                             block_obj.add_chunk(chunk, rating)
                             print(
                                 f"Manual Chunk {chunk.id} assigned fully to Block {block_obj.id} "
@@ -1225,8 +1316,7 @@ class ScheduleManager:
                                 f"(allocated {alloc_hours:.2f} hours)"
                             )
                 else:  # Auto chunks
-                    unsched_amt = solver.Value(unsched_auto[chunk.id])
-                    unsched_hours = unsched_amt / scale
+                    unsched_hours = unsched_amt / schedule_model.scale
                     if unsched_amt > 0:
                         chunk.flagged = True
                         print(
@@ -1236,27 +1326,22 @@ class ScheduleManager:
                     # If allocated to multiple blocks, split the chunk.
                     if len(block_allocations) > 1:
                         hours_list = [
-                            alloc_hours for (_, alloc_hours) in block_allocations
+                            alloc_hours for (_, alloc_hours, _) in block_allocations
                         ]
-                        subchunks = chunk.split(hours_list)
-                        for i, (block_obj, alloc_hours) in enumerate(block_allocations):
-                            subchunk = subchunks[i]
-                            rating = allowed_assignments.get(
-                                (chunk.id, block_obj.id), {}
-                            ).get("rating", 100)
+                        subchunks = chunk.split(hours_list, *job.chunk_limits[i])
+                        for subchunk, (block_obj, alloc_hours, rating) in zip(
+                            subchunks, block_allocations
+                        ):
                             block_obj.add_chunk(subchunk, rating)
                             print(
-                                f"Auto Chunk {chunk.task.name} split → {subchunk.task.name}, assigned {alloc_hours:.2f} hours "
+                                f"Auto Chunk {job.task_names[i]} split → {job.task_names[i]}, assigned {alloc_hours:.2f} hours "
                                 f"to Block Name='{block_obj.name}', Date={block_obj.date})"
                             )
                     elif len(block_allocations) == 1:
-                        block_obj, alloc_hours = block_allocations[0]
-                        rating = allowed_assignments.get(
-                            (chunk.id, block_obj.id), {}
-                        ).get("rating", 100)
+                        block_obj, alloc_hours, rating = block_allocations[0]
                         block_obj.add_chunk(chunk, rating)
                         print(
-                            f"Auto Chunk {chunk.task.name} assigned {alloc_hours:.2f} hours "
+                            f"Auto Chunk {job.task_names[i]} assigned {alloc_hours:.2f} hours "
                             f"to Block Name='{block_obj.name}', Date={block_obj.date})"
                         )
             print("Objective value:", solver.ObjectiveValue())
@@ -1265,9 +1350,55 @@ class ScheduleManager:
             for chunk in all_chunks:
                 chunk.flagged = True
 
+    def _finish_job(self, job):
+        """Makes a solved ``job`` the current schedule (GUI thread)."""
+        if job.stats is not None:
+            self.solve_history.append(job.stats)
+        if job.plan is not None:
+            self._last_plan = job.plan
+        self.day_schedules = job.day_schedules
+        self.chunks = job.chunks
+        if job.fingerprint is not None:
+            self._solved_fingerprint = job.fingerprint
+            self.solve_counts["executed"] += 1
+
+    def _make_solver(self, schedule_model, profile, warm_start=False):
+        """
+        Returns a CpSolver set up from ``profile``, a copy of the
+        ScheduleSettings solver profile, with light presolve for a
+        ``warm_start`` (see make_solver).
+
+        In adaptive mode the time limit scales with the model (capped by the
+        profile's limit) and presolve is skipped on models too large for it
+        to finish within the budget; the search then starts from the hinted
+        ScheduleModel.starting_plan, so a stopped solve still has a plan to
+        return.
+        """
+        time_limit = profile["solver_time_limit"]
+        presolve = True
+        if profile["solver_adaptive"]:
+            pair_count = len(schedule_model.pair_chunk)
+            time_limit = adaptive_time_limit(pair_count, time_limit)
+            presolve = pair_count <= ADAPTIVE_PRESOLVE_PAIRS
+        return make_solver(
+            time_limit=time_limit,
+            workers=profile["solver_workers"],
+            relative_gap=profile["solver_relative_gap"],
+            random_seed=profile["solver_random_seed"],
+            presolve=presolve,
+            warm_start=warm_start,
+        )
+
     def generate_schedule(self):
         # 1) For every chunk, rebuild its timeblock_ratings from the DaySchedules
-        for chunk in self.chunks:
+        self.rate_chunks(self.chunks, self.day_schedules)
+
+        # 2) Hand off to the OR‑Tools solver
+        self.solve_schedule_with_cp()
+
+    def rate_chunks(self, chunks, day_schedules):
+        """Rebuilds each chunk's timeblock_ratings from ``day_schedules``, best first."""
+        for chunk in chunks:
             if chunk.chunk_type == "placed":
                 # already bound to a specific block, leave it alone
                 continue
@@ -1276,7 +1407,7 @@ class ScheduleManager:
             chunk.timeblock_ratings = []
 
             # collect ratings from each DaySchedule
-            for day in self.day_schedules:
+            for day in day_schedules:
                 # if there's a due‐date, skip days after it
                 if chunk.task.due_datetime and day.date > chunk.task.due_datetime.date():
                     break
@@ -1289,32 +1420,98 @@ class ScheduleManager:
             # sort highest‐first
             chunk.timeblock_ratings.sort(key=lambda x: x[1], reverse=True)
 
-        # 2) Hand off to the OR‑Tools solver
-        self.solve_schedule_with_cp()
+    def schedule_fingerprint(self, now=None):
+        """
+        Returns a cheap summary of everything the schedule is built from:
+        the TaskManager change version, the time block definitions, the
+        schedule settings and the current day and hour. The schedule only
+        needs rebuilding when it differs from the last one solved.
+        """
+        now = now or datetime.now()
+        settings = sorted(
+            (name, repr(value))
+            for name, value in vars(self.schedule_settings).items()
+            if name not in ("db", "conn")
+        )
+        return (
+            self.task_manager_instance.change_version,
+            repr(self.time_blocks),
+            tuple(settings),
+            now.date(),
+            now.hour,
+        )
 
     def refresh_schedule(self):
         """
         Refreshes the schedule by reloading tasks, recalculating
         weights, re-building day schedules, re-chunking, and
-        assigning chunks again.
+        assigning chunks again, on the calling thread. Cancels any
+        background refresh in flight.
+
+        Skipped, keeping the current assignment, when schedule_fingerprint()
+        matches the last solved schedule; ``solve_counts`` tallies both
+        outcomes. Returns True if the schedule was rebuilt.
+        """
+        fingerprint = self.schedule_fingerprint()
+        if fingerprint == self._solved_fingerprint:
+            self.solve_counts["skipped"] += 1
+            return False
+        self._worker.cancel()
+        job = self._prepare_job(fingerprint)
+        self._solve_job(job)
+        self._finish_job(job)
+        return True
+
+    def request_refresh(self):
         """
-        # 1. Reload active tasks from TaskManager
-        self.active_tasks = self.task_manager_instance.get_active_tasks()
+        Like refresh_schedule, but the model is built and solved on a worker
+        thread (see core.schedule_worker) and the result is published on the
+        GUI thread, followed by global_signals.schedule_updated. A request
+        supersedes and cancels the one in flight, unless nothing changed
+        since that one was prepared. Returns True if a refresh was started.
+        """
+        fingerprint = self.schedule_fingerprint()
+        in_flight = self._worker.current
+        latest = in_flight.fingerprint if in_flight else self._solved_fingerprint
+        if fingerprint == latest:
+            self.solve_counts["skipped"] += 1
+            return False
+        self._worker.start(self._prepare_job(fingerprint))
+        return True
 
-        # 2. Update each task's global weight
+    def _prepare_job(self, fingerprint):
+        """
+        Builds fresh day schedules and rated chunks into a ScheduleJob,
+        leaving the current schedule untouched. Reads the database, so it
+        runs on the GUI thread.
+        """
+        # 1-2. Bring the active tasks up to date and update each task's
+        # global weight
         self.update_task_global_weights()
 
         # 3. Re-build the day schedules
-        self.day_schedules = self.load_day_schedules()
+        day_schedules = self.load_day_schedules()
 
         # 4. Estimate daily buffer ratios
-        self.estimate_daily_buffer_ratios()
-
-        # 5. Re-chunk tasks
-        self.chunks = self.chunk_tasks()
-
-        # 6. Re-assign all chunks
-        self.generate_schedule()
+        self.estimate_daily_buffer_ratios(day_schedules=day_schedules)
+
+        # 5. Re-chunk tasks and rate them against the new blocks
+        chunks = self.chunk_tasks(day_schedules)
+        self.rate_chunks(chunks, day_schedules)
+
+        # 6. The assignment itself is left to _solve_job
+        return self._make_job(fingerprint, day_schedules, chunks)
+
+    def _on_job_finished(self, job):
+        # Queued to the GUI thread by ScheduleWorker.finished
+        if not self._worker.is_current(job):
+            return  # superseded or cancelled
+        self._worker.release(job)
+        if job.error is not None:
+            print(f"Error while solving the schedule: {job.error}")
+            return
+        self._finish_job(job)
+        global_signals.schedule_updated.emit()
 
 
 class DaySchedule:
@@ -1324,6 +1521,8 @@ class DaySchedule:
         self.task_manager_instance = schedule_manager_instance.task_manager_instance
         self.schedule_settings = schedule_manager_instance.schedule_settings
         self.sleep_time = self.schedule_settings.ideal_sleep_duration
+        # block id -> (task table generation, rows the block accepts)
+        self._block_rows = {}
         self.time_blocks = self.generate_schedule()
         self.buffer_ratio = 0.0
         self.reserved_time = 0.0
@@ -1465,7 +1664,23 @@ class DaySchedule:
 
         return final_blocks
 
+    def _qualifying_rows(self, block):
+        """Returns which task table rows ``block``'s filters accept."""
+        table = self.schedule_manager_instance.task_table
+        cached = self._block_rows.get(block.id)
+        if cached is None or cached[0] != table.generation:
+            cached = (
+                table.generation,
+                table.rows_matching_filters(block.list_categories, block.task_tags),
+            )
+            self._block_rows[block.id] = cached
+        return cached[1]
+
     def qualifies(self, task, block):
+        row = self.schedule_manager_instance.task_table.row_of(task.id)
+        if row is not None:
+            return bool(self._qualifying_rows(block)[row])
+        # Not an active task, so not in the table: check the task itself
         inc = block.list_categories.get("include", [])
         exc = block.list_categories.get("exclude", [])
         cat = self.task_manager_instance.get_task_list_category_name(task.list_name)
@@ -1475,9 +1690,10 @@ class DaySchedule:
             return False
         inc_tags = block.task_tags.get("include", [])
         exc_tags = block.task_tags.get("exclude", [])
-        if inc_tags and not any(tag in inc_tags for tag in task.tags):
+        # Tag filters resolve to cached id sets from the task_tags index
+        if inc_tags and task.id not in self.task_manager_instance.get_task_ids_with_any_tag(inc_tags):
             return False
-        if exc_tags and any(tag in exc_tags for tag in task.tags):
+        if exc_tags and task.id in self.task_manager_instance.get_task_ids_with_any_tag(exc_tags):
             return False
         return True
 
@@ -0,0 +1,344 @@
+"""
+CP-SAT model for assigning task chunks to time blocks.
+
+ScheduleModel interns the chunks and blocks it is given as compact integer
+indices and keeps, for every allowed (chunk, block) pair, its position in
+per-chunk and per-block index lists. Constraints, the objective and the
+result read-back then visit only the pairs that involve a given chunk or
+block, so building the model is linear in the number of pairs rather than
+chunks x pairs + blocks x pairs.
+
+ScheduleManager.solve_schedule_with_cp builds one of these per solve and
+applies the result to the day schedules. make_solver turns the solver
+profile in ScheduleSettings into CpSolver parameters.
+"""
+
+from time import perf_counter
+
+from ortools.sat.python import cp_model
+
+# Scale factor: converts fractional hours to integer solver units
+SCALE = 10
+# Objective penalty per unscheduled manual chunk, and per unscheduled
+# (scaled) unit of an auto chunk
+UNSCHEDULED_PENALTY = 100
+
+# Adaptive solver budget: a base allowance plus time per (chunk, block)
+# pair, capped by the profile's time limit
+ADAPTIVE_BASE_SECONDS = 1.0
+ADAPTIVE_SECONDS_PER_PAIR = 2e-5
+# A hinted plan that carries over at least this share of the previous
+# solution counts as a warm start (see make_solver)
+WARM_START_MIN_SHARE = 0.5
+# Above this many pairs CP-SAT's presolve alone can outlast the budget, so
+# the adaptive mode skips it and searches from the hinted plan directly
+ADAPTIVE_PRESOLVE_PAIRS = 50_000
+
+
+def to_units(hours, scale=SCALE):
+    """Returns ``hours`` rounded to whole solver units."""
+    return int(hours * scale + 0.5)
+
+
+def adaptive_time_limit(pair_count, time_limit=None):
+    """Returns the time budget for a model of ``pair_count`` pairs."""
+    budget = ADAPTIVE_BASE_SECONDS + ADAPTIVE_SECONDS_PER_PAIR * pair_count
+    return min(budget, time_limit) if time_limit else budget
+
+
+def make_solver(
+    time_limit=None, workers=0, relative_gap=0.0, random_seed=1, presolve=True, warm_start=False
+):
+    """
+    Returns a CpSolver with the given profile. ``time_limit`` (seconds) of
+    None or 0 means no limit and ``workers`` of 0 lets CP-SAT pick the
+    number of search workers. A solve stopped by the limit or by the
+    relative gap returns the best solution found so far as FEASIBLE.
+
+    ``warm_start`` says the model is hinted with a near-optimal plan (see
+    ScheduleModel.starting_plan); presolve, which otherwise dominates the
+    solve time, is then cut to a single pass without probing or symmetry
+    detection, since the search no longer has to find good solutions.
+    """
+    solver = cp_model.CpSolver()
+    parameters = solver.parameters
+    if time_limit:
+        parameters.max_time_in_seconds = time_limit
+    parameters.num_workers = workers
+    parameters.relative_gap_limit = relative_gap
+    parameters.random_seed = random_seed
+    parameters.cp_model_presolve = presolve
+    if warm_start:
+        parameters.max_presolve_iterations = 1
+        parameters.cp_model_probing_level = 0
+        parameters.symmetry_level = 0
+    return solver
+
+
+def block_key(block):
+    """
+    Identifies ``block`` across schedule refreshes, which rebuild every
+    TimeBlock with a new id.
+    """
+    return (block.date, block.start_time, block.name)
+
+
+class ScheduleModel:
+    """
+    Chunk-to-block assignment model over ``chunks`` and ``blocks``.
+
+    Chunk ``i`` is ``chunks[i]`` and block ``j`` is ``blocks[j]``. Pair ``p``
+    allows chunk ``pair_chunk[p]`` in block ``pair_block[p]`` with rating
+    ``pair_rating[p]``; ``chunk_pairs[i]`` and ``block_pairs[j]`` list the
+    pairs of a chunk and of a block. Ratings naming a block that is not in
+    ``blocks`` are ignored. ``chunk_limits[i]`` is chunk ``i``'s task's
+    (min_chunk_size, max_chunk_size) in hours, read from ``chunk.task`` when
+    not given. ``build_seconds`` and ``solve_seconds`` time the
+    two phases; solve() also records the outcome (``status_name``,
+    ``objective``, ``gap``).
+    """
+
+    def __init__(self, chunks, blocks, scale=SCALE, chunk_limits=None):
+        self.chunks = list(chunks)
+        self.blocks = list(blocks)
+        self.scale = scale
+        if chunk_limits is None:
+            chunk_limits = [
+                (chunk.task.min_chunk_size, chunk.task.max_chunk_size) for chunk in self.chunks
+            ]
+        self.chunk_limits = list(chunk_limits)
+        self.block_index = {block.id: j for j, block in enumerate(self.blocks)}
+
+        self.pair_chunk = []
+        self.pair_block = []
+        self.pair_rating = []
+        self.chunk_pairs = [[] for _ in self.chunks]
+        self.block_pairs = [[] for _ in self.blocks]
+
+        self.model = None
+        self.assign = []
+        self.alloc = []
+        self.unscheduled = []
+        self.build_seconds = 0.0
+        self.solve_seconds = 0.0
+        self.status_name = None
+        self.objective = None
+        self.gap = None
+        self.reused_share = None
+
+        start = perf_counter()
+        self._index_pairs()
+        self._build()
+        self.build_seconds = perf_counter() - start
+
+    def _index_pairs(self):
+        block_index = self.block_index
+        for i, chunk in enumerate(self.chunks):
+            # block index -> pair, so a repeated rating for the same block
+            # replaces the earlier one rather than adding a second pair
+            seen = {}
+            for block, rating in chunk.timeblock_ratings:
+                j = block_index.get(block.id)
+                if j is None:
+                    continue
+                p = seen.get(j)
+                if p is not None:
+                    self.pair_rating[p] = rating
+                    continue
+                p = len(self.pair_chunk)
+                seen[j] = p
+                self.pair_chunk.append(i)
+                self.pair_block.append(j)
+                self.pair_rating.append(rating)
+                self.chunk_pairs[i].append(p)
+                self.block_pairs[j].append(p)
+
+    def _build(self):
+        model = self.model = cp_model.CpModel()
+        scale = self.scale
+        sizes = [to_units(chunk.size, scale) for chunk in self.chunks]
+
+        # assign[p] says pair p is used; alloc[p] is the units it receives
+        assign = self.assign = []
+        alloc = self.alloc = []
+        for p, (i, j) in enumerate(zip(self.pair_chunk, self.pair_block)):
+            assign.append(model.NewBoolVar(f"assign_{i}_{j}"))
+            alloc.append(model.NewIntVar(0, sizes[i], f"alloc_{i}_{j}"))
+
+        # Manual chunks go whole into one block or are unscheduled (a flag);
+        # auto chunks may be split, each piece within the task's min/max
+        # chunk size, and count their unscheduled units. Tying alloc to
+        # assign linearly (alloc == size * assign, low * assign <= alloc <=
+        # high * assign) also zeroes alloc when the pair is unused. Chunks of
+        # any other type are only bound by block capacity and carry no
+        # penalty.
+        unscheduled = self.unscheduled = []
+        penalized = []
+        for i, chunk in enumerate(self.chunks):
+            pairs = self.chunk_pairs[i]
+            size = sizes[i]
+            if chunk.chunk_type == "manual":
+                flag = model.NewBoolVar(f"unsched_{i}")
+                for p in pairs:
+                    model.Add(alloc[p] == size * assign[p])
+                model.Add(cp_model.LinearExpr.Sum([assign[p] for p in pairs]) + flag == 1)
+                unscheduled.append(flag)
+                penalized.append(flag)
+            elif chunk.chunk_type == "auto":
+                remainder = model.NewIntVar(0, size, f"unsched_{i}")
+                min_size, max_size = self.chunk_limits[i]
+                low = to_units(min_size, scale)
+                high = to_units(max_size, scale)
+                for p in pairs:
+                    model.Add(alloc[p] >= low * assign[p])
+                    model.Add(alloc[p] <= high * assign[p])
+                model.Add(
+                    cp_model.LinearExpr.Sum([alloc[p] for p in pairs]) + remainder == size
+                )
+                unscheduled.append(remainder)
+                penalized.append(remainder)
+            else:
+                unscheduled.append(model.NewIntVar(0, size, f"unsched_{i}"))
+
+        # Block capacity
+        for j, block in enumerate(self.blocks):
+            capacity = to_units(block.get_available_time(), scale)
+            model.Add(
+                cp_model.LinearExpr.Sum([alloc[p] for p in self.block_pairs[j]]) <= capacity
+            )
+
+        # Maximize rating x allocation, less the unscheduled penalties
+        model.Maximize(
+            cp_model.LinearExpr.WeightedSum(alloc, self.pair_rating)
+            - UNSCHEDULED_PENALTY * cp_model.LinearExpr.Sum(penalized)
+        )
+
+    def starting_plan(self, previous=None):
+        """
+        Returns solver units per pair for a feasible plan to start the
+        search from. Allocations in ``previous`` (see plan) are kept where
+        the chunk and block still exist and the allocation still fits; the
+        rest of each chunk is then placed greedily, chunks in order, into
+        its pairs in chunk.timeblock_ratings order (best first, as
+        generate_schedule sorts them) while block capacity lasts.
+
+        Sets ``reused_share`` to the share of the units in ``previous`` that
+        were carried over (None without a previous plan).
+        """
+        scale = self.scale
+        remaining = [to_units(block.get_available_time(), scale) for block in self.blocks]
+        units = [0] * len(self.pair_chunk)
+        left = []
+        limits = []
+        for chunk, (min_size, max_size) in zip(self.chunks, self.chunk_limits):
+            size = to_units(chunk.size, scale)
+            left.append(size)
+            if chunk.chunk_type == "manual":
+                limits.append((size, size))
+            else:
+                limits.append((max(1, to_units(min_size, scale)), to_units(max_size, scale)))
+
+        def place(p, wanted):
+            i = self.pair_chunk[p]
+            j = self.pair_block[p]
+            low, high = limits[i]
+            amount = min(wanted, left[i], high, remaining[j])
+            if amount >= low:
+                units[p] = amount
+                remaining[j] -= amount
+                left[i] -= amount
+
+        self.reused_share = None
+        if previous:
+            block_keys = [block_key(block) for block in self.blocks]
+            for p, (i, j) in enumerate(zip(self.pair_chunk, self.pair_block)):
+                wanted = previous.get((self.chunks[i].id, block_keys[j]))
+                if wanted:
+                    place(p, wanted)
+            self.reused_share = sum(units) / sum(previous.values())
+
+        for i, pairs in enumerate(self.chunk_pairs):
+            for p in pairs:
+                if not left[i]:
+                    break
+                if not units[p]:
+                    place(p, left[i])
+        return units
+
+    def plan(self, solver):
+        """
+        Returns the solution as ``{(chunk id, block_key(block)): units}``,
+        which starting_plan can carry over to a rebuilt model.
+        """
+        keys = [block_key(block) for block in self.blocks]
+        result = {}
+        for p, (i, j) in enumerate(zip(self.pair_chunk, self.pair_block)):
+            if solver.Value(self.assign[p]) == 1:
+                units = solver.Value(self.alloc[p])
+                if units > 0:
+                    result[(self.chunks[i].id, keys[j])] = units
+        return result
+
+    def add_hint(self, units):
+        """
+        Hints a complete solution to the solver from solver units per pair
+        (see starting_plan); the rest of each chunk is hinted as unscheduled.
+        The plan must be feasible for the hint to be used as is.
+        """
+        assign_values = [int(amount > 0) for amount in units]
+        left = [to_units(chunk.size, self.scale) for chunk in self.chunks]
+        placed = [0] * len(self.chunks)
+        for p, amount in enumerate(units):
+            left[self.pair_chunk[p]] -= amount
+            placed[self.pair_chunk[p]] += assign_values[p]
+        unscheduled_values = [
+            int(not count) if chunk.chunk_type == "manual" else remainder
+            for chunk, remainder, count in zip(self.chunks, left, placed)
+        ]
+
+        # Straight into the proto: AddHint per variable is far slower on
+        # models with a few hundred thousand variables
+        self.model.ClearHints()
+        hint = self.model.Proto().solution_hint
+        for variables, values in (
+            (self.assign, assign_values),
+            (self.alloc, units),
+            (self.unscheduled, unscheduled_values),
+        ):
+            hint.vars.extend([variable.Index() for variable in variables])
+            hint.values.extend(values)
+
+    def solve(self, solver=None):
+        """
+        Solves the model with ``solver`` (a new CpSolver by default) and
+        returns ``(solver, status)``. ``gap`` is the relative distance
+        between the objective and the best bound, when a solution exists.
+        """
+        solver = solver or cp_model.CpSolver()
+        start = perf_counter()
+        status = solver.Solve(self.model)
+        self.solve_seconds = perf_counter() - start
+        self.status_name = solver.StatusName(status)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            self.objective = solver.ObjectiveValue()
+            bound = solver.BestObjectiveBound()
+            self.gap = abs(bound - self.objective) / max(1.0, abs(self.objective))
+        else:
+            self.objective = self.gap = None
+        return solver, status
+
+    def allocations(self, solver, i):
+        """
+        Returns ``[(block, hours, rating), ...]`` for the blocks chunk ``i``
+        received time in, in chunk.timeblock_ratings order.
+        """
+        result = []
+        for p in self.chunk_pairs[i]:
+            if solver.Value(self.assign[p]) != 1:
+                continue
+            units = solver.Value(self.alloc[p])
+            if units > 0:
+                result.append(
+                    (self.blocks[self.pair_block[p]], units / self.scale, self.pair_rating[p])
+                )
+        return result
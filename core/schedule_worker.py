@@ -0,0 +1,136 @@
+"""
+Background schedule solving.
+
+ScheduleManager.request_refresh prepares a ScheduleJob on the GUI thread:
+fresh day schedules and chunks rated against them, copies of the solver
+profile and the previous plan, and the few task fields the solve needs
+(chunk size limits and names). Nothing else holds those objects and the
+solve does not read the shared Task objects, so the job is a private
+snapshot. ScheduleWorker then builds and solves the
+CP-SAT model on a worker thread and hands the finished job back to the GUI
+thread through a queued Qt signal. Starting a job cancels the one in
+flight, stopping its CP-SAT search, and a cancelled job is never
+published.
+"""
+
+import itertools
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+_job_ids = itertools.count(1)
+
+
+class ScheduleJob:
+    """
+    Inputs and outcome of one schedule solve.
+
+    ``fingerprint`` is ScheduleManager.schedule_fingerprint() when the job
+    was prepared (None for a solve of the current schedule).
+    ``chunk_limits[i]`` and ``task_names[i]`` are copies of ``chunks[i]``'s
+    task's (min_chunk_size, max_chunk_size) and name. The solve
+    fills ``stats`` and ``plan`` (see ScheduleModel.plan; None without a
+    solution), or ``error`` if it raised.
+    """
+
+    def __init__(
+        self,
+        fingerprint,
+        day_schedules,
+        chunks,
+        blocks,
+        chunk_limits,
+        task_names,
+        profile,
+        previous_plan,
+    ):
+        self.id = next(_job_ids)
+        self.fingerprint = fingerprint
+        self.day_schedules = day_schedules
+        self.chunks = chunks
+        self.blocks = blocks
+        self.chunk_limits = chunk_limits
+        self.task_names = task_names
+        self.profile = profile
+        self.previous_plan = previous_plan
+        self.stats = None
+        self.plan = None
+        self.error = None
+        self._cancelled = threading.Event()
+        self._solver = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Marks the job cancelled and stops its CP-SAT search, if running."""
+        self._cancelled.set()
+        with self._lock:
+            if self._solver is not None:
+                self._solver.StopSearch()
+
+    def attach_solver(self, solver):
+        """
+        Registers the CpSolver about to run, so cancel() can stop it.
+        Returns False if the job was already cancelled.
+        """
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._solver = solver
+            return True
+
+
+class ScheduleWorker(QObject):
+    """
+    Runs ScheduleJobs with ``solve(job)`` on daemon threads, one current job
+    at a time. ``finished`` is emitted with every job that ran, from its
+    thread; Qt queues it to receivers on the GUI thread, which should check
+    is_current() before using the result.
+    """
+
+    finished = pyqtSignal(object)
+
+    def __init__(self, solve):
+        super().__init__()
+        self._solve = solve
+        self._current = None
+
+    @property
+    def current(self):
+        """The job in flight, or None."""
+        return self._current
+
+    def start(self, job):
+        """Cancels the job in flight, if any, and starts ``job``."""
+        self.cancel()
+        self._current = job
+        thread = threading.Thread(
+            target=self._run, args=(job,), name=f"schedule-job-{job.id}", daemon=True
+        )
+        thread.start()
+
+    def cancel(self):
+        """Cancels the job in flight, if any."""
+        if self._current is not None:
+            self._current.cancel()
+            self._current = None
+
+    def is_current(self, job):
+        """True if ``job`` is the latest job started and was not cancelled."""
+        return job is self._current and not job.cancelled
+
+    def release(self, job):
+        """Forgets ``job`` once its result has been handled."""
+        if job is self._current:
+            self._current = None
+
+    def _run(self, job):
+        try:
+            if not job.cancelled:
+                self._solve(job)
+        except Exception as e:
+            job.error = e
+        self.finished.emit(job)
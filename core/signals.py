@@ -4,6 +4,8 @@ from PyQt6.QtCore import QObject, pyqtSignal
 class GlobalSignals(QObject):
     task_list_updated = pyqtSignal()
     refresh_schedule_signal = pyqtSignal()
+    # Emitted on the GUI thread once a background schedule solve is published
+    schedule_updated = pyqtSignal()
 
 
 global_signals = GlobalSignals()
@@ -0,0 +1,425 @@
+import json
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+
+from core.utils import safe_json_dumps, safe_json_loads
+
+# Columns of the tasks table that mirror Task attributes, in table order.
+TASK_COLUMNS = (
+    "name",
+    "description",
+    "notes",
+    "tags",
+    "resources",
+    "start_date",
+    "due_datetime",
+    "added_date_time",
+    "last_completed_date",
+    "list_order",
+    "list_name",
+    "recurring",
+    "recur_every",
+    "recurrences",
+    "time_estimate",
+    "time_logged",
+    "count_required",
+    "count_completed",
+    "chunk_preference",
+    "min_chunk_size",
+    "max_chunk_size",
+    "subtasks",
+    "dependencies",
+    "status",
+    "flexibility",
+    "effort_level",
+    "priority",
+    "previous_priority",
+    "preferred_work_days",
+    "time_of_day_preference",
+    "include_in_schedule",
+)
+# Task attributes TaskManager writes: the tasks columns, plus chunks, which
+# are stored as task_chunks rows (and as JSON in archived_tasks).
+TASK_FIELDS = TASK_COLUMNS + ("chunks",)
+
+# Attributes held as lists/dicts that can change in place, so they are
+# compared by their encoded form rather than by assignment.
+JSON_COLUMNS = (
+    "tags",
+    "resources",
+    "recur_every",
+    "subtasks",
+    "dependencies",
+    "preferred_work_days",
+    "time_of_day_preference",
+)
+
+# Columns computed from other Task attributes whenever those are written
+DERIVED_COLUMNS = ("next_due",)
+# Attributes next_due is computed from, in compute_next_due argument order
+RECURRENCE_COLUMNS = (
+    "recurring",
+    "recur_every",
+    "status",
+    "due_datetime",
+    "last_completed_date",
+)
+
+TASK_COLUMN_POSITIONS = {
+    name: i for i, name in enumerate(TASK_COLUMNS + DERIVED_COLUMNS)
+}
+
+# Finished states a recurring task rolls over from
+ROLLOVER_STATUSES = ("Completed", "Failed", "Skipped")
+WEEKDAYS = {
+    "mon": 0,
+    "monday": 0,
+    "tue": 1,
+    "tuesday": 1,
+    "wed": 2,
+    "wednesday": 2,
+    "thu": 3,
+    "thursday": 3,
+    "fri": 4,
+    "friday": 4,
+    "sat": 5,
+    "saturday": 5,
+    "sun": 6,
+    "sunday": 6,
+}
+
+
+def compute_next_due(recurring, recur_every, status, due_datetime, last_completed_date):
+    """
+    Returns when a finished recurring task rolls over, or None if it won't.
+
+    The next occurrence is counted from the current due date, else the last
+    completion: ``recur_every`` days later for an int, or the next listed
+    weekday (same time of day) for a list of day names. A task with neither
+    never rolls over; its next occurrence would always lie ahead of now.
+    """
+    if not recurring or status not in ROLLOVER_STATUSES:
+        return None
+    anchor = due_datetime or last_completed_date
+    if anchor is None:
+        return None
+    if isinstance(recur_every, int) and not isinstance(recur_every, bool):
+        return anchor + timedelta(days=recur_every)
+    if isinstance(recur_every, list):
+        weekdays = {
+            WEEKDAYS[day.lower()]
+            for day in recur_every
+            if isinstance(day, str) and day.lower() in WEEKDAYS
+        }
+        if weekdays:
+            return anchor + timedelta(
+                days=min((weekday - anchor.weekday()) % 7 or 7 for weekday in weekdays)
+            )
+    return None
+
+
+def _json_or_none(field_name, default):
+    def encode(value):
+        return safe_json_dumps(value, default, field_name) if value else None
+
+    return encode
+
+
+def _json_or_empty_list(field_name):
+    def encode(value):
+        return safe_json_dumps(value, "[]", field_name) if value else "[]"
+
+    return encode
+
+
+def _json(field_name):
+    def encode(value):
+        return safe_json_dumps(value, "[]", field_name)
+
+    return encode
+
+
+# Temporal task columns hold whole seconds since EPOCH, taken on the naive
+# local wall clock the app works in, so range filters compare integers.
+TEMPORAL_COLUMNS = ("start_date", "due_datetime", "added_date_time", "last_completed_date")
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_seconds(value):
+    """Returns the stored integer for a datetime, date or ISO string, or None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        # Aware values are converted to the local wall clock, not relabelled
+        value = value.astimezone().replace(tzinfo=None)
+    delta = value - EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def from_epoch_seconds(value):
+    return EPOCH + timedelta(seconds=value)
+
+
+_ENCODERS = {
+    "tags": _json_or_none("tags", "[]"),
+    "resources": _json_or_none("resources", "[]"),
+    "start_date": to_epoch_seconds,
+    "due_datetime": to_epoch_seconds,
+    "added_date_time": to_epoch_seconds,
+    "last_completed_date": to_epoch_seconds,
+    "recurring": int,
+    "recur_every": _json_or_none("recur_every", "null"),
+    "subtasks": _json_or_empty_list("subtasks"),
+    "dependencies": _json_or_none("dependencies", "[]"),
+    "preferred_work_days": _json("preferred_work_days"),
+    "time_of_day_preference": _json("time_of_day_preference"),
+    "include_in_schedule": int,
+    "next_due": to_epoch_seconds,
+}
+
+
+def encode_task_column(name, value):
+    """Returns the database value for the tasks column ``name``."""
+    encoder = _ENCODERS.get(name)
+    return encoder(value) if encoder else value
+
+
+def encode_task_columns(task, columns=TASK_COLUMNS):
+    """Returns a tuple of encoded values of ``task`` for ``columns``."""
+    return tuple(encode_task_column(name, getattr(task, name)) for name in columns)
+
+
+def order_columns(columns):
+    """Sorts column names into table order, so equal sets give equal SQL."""
+    return tuple(sorted(columns, key=TASK_COLUMN_POSITIONS.__getitem__))
+
+
+_INSERT_COLUMNS = TASK_COLUMNS + DERIVED_COLUMNS
+
+TASK_INSERT_SQL = (
+    f"INSERT INTO tasks ({', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _INSERT_COLUMNS)})"
+)
+TASK_INSERT_WITH_ID_SQL = (
+    f"INSERT INTO tasks (id, {', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES (?, {', '.join('?' for _ in _INSERT_COLUMNS)})"
+)
+
+
+def encode_task_insert(task):
+    """Returns the encoded values of ``task`` for TASK_INSERT_SQL."""
+    return encode_task_columns(task, _INSERT_COLUMNS)
+
+
+def _decode_datetime(value):
+    if isinstance(value, int):
+        return from_epoch_seconds(value)
+    if isinstance(value, str):
+        # Covers every format the tasks table has used: 'YYYY-MM-DD',
+        # 'YYYY-MM-DD HH:MM' and isoformat() with or without microseconds
+        return datetime.fromisoformat(value) if value else None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if value is None:
+        return None
+    raise ValueError(f"unexpected date value {value!r}")
+
+
+def _json_decoder(default):
+    def decode(value):
+        return json.loads(value) if value else default
+
+    return decode
+
+
+# (decoder, value used when the stored value is empty or malformed). The
+# list defaults are never shared: empty values go through the decoder.
+_DECODERS = {
+    "tags": (_json_decoder(None), list),
+    "resources": (_json_decoder(None), list),
+    "start_date": (_decode_datetime, None),
+    "due_datetime": (_decode_datetime, None),
+    "added_date_time": (_decode_datetime, None),
+    "last_completed_date": (_decode_datetime, None),
+    "recurring": (bool, None),
+    "recur_every": (_json_decoder(None), None),
+    "subtasks": (_json_decoder(None), list),
+    "dependencies": (_json_decoder(None), list),
+    "preferred_work_days": (_json_decoder(None), list),
+    "time_of_day_preference": (_json_decoder(None), list),
+    "include_in_schedule": (bool, None),
+    # Only tables that embed chunks as JSON, such as archived_tasks
+    "chunks": (_json_decoder(None), list),
+    "archived_at": (_decode_datetime, None),
+}
+
+
+# Declared types that sqlite3 converters (see core.utils) would parse
+_CONVERTED_DECLTYPES = {"DATE", "TIMESTAMP", "TIME"}
+
+
+def stored_next_due(row):
+    """
+    Returns next_due as epoch seconds for a row of stored RECURRENCE_COLUMNS
+    values, treating a malformed recur_every as no recurrence.
+    """
+    recurring, recur_every, status, *dates = row
+    try:
+        recur_every = json.loads(recur_every) if recur_every else None
+    except (TypeError, ValueError):
+        recur_every = None
+    try:
+        dates = [_decode_datetime(value) for value in dates]
+    except (TypeError, ValueError):
+        return None
+    return to_epoch_seconds(
+        compute_next_due(recurring, recur_every, status, *dates)
+    )
+
+
+class TaskRowCodec:
+    """
+    Turns tasks rows into Task keyword arguments.
+
+    The column list is fixed when the codec is built, so rows selected with
+    ``select_sql`` are decoded by position with converters looked up once,
+    instead of per row and per key. Temporal columns hold epoch seconds and
+    are decoded with integer arithmetic; ``text_columns`` names columns still
+    declared DATE/TIMESTAMP (a database that has not been migrated), which
+    are selected as plain text to bypass the sqlite3 converters and parsed
+    with ``datetime.fromisoformat``.
+    """
+
+    def __init__(self, columns, text_columns=(), table="tasks"):
+        self.columns = tuple(columns)
+        self.text_columns = frozenset(text_columns)
+        self.table = table
+        self.select_sql = "SELECT {} FROM {}".format(
+            ", ".join(self._select_expression(name) for name in self.columns), table
+        )
+        plain = []
+        converted = []
+        for position, name in enumerate(self.columns):
+            decoder = _DECODERS.get(name)
+            if decoder:
+                converted.append((position, name) + decoder)
+            else:
+                plain.append((position, name))
+        self._plain = tuple(plain)
+        self._converted = tuple(converted)
+        self._id_position = self.columns.index("id") if "id" in self.columns else None
+
+    @classmethod
+    def for_table(cls, conn, table="tasks", extra_columns=()):
+        """
+        Builds a codec for the Task columns ``table`` currently has, plus
+        ``extra_columns`` (such as the chunks JSON of archived_tasks).
+        """
+        declared = {
+            row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({table})")
+        }
+        columns = ["id"] + [
+            name
+            for name in TASK_COLUMNS + tuple(extra_columns)
+            if name in declared
+        ]
+        text_columns = [
+            name for name in columns if declared[name] in _CONVERTED_DECLTYPES
+        ]
+        return cls(columns, text_columns, table)
+
+    def _select_expression(self, name):
+        if name in self.text_columns:
+            # No declared type on the expression, so no sqlite3 converter
+            return f"CAST({name} AS TEXT) AS {name}"
+        return name
+
+    def get_id(self, row):
+        """Returns the task id of a ``select_sql`` row without decoding it."""
+        return row[self._id_position]
+
+    def decode(self, row):
+        """Returns the Task keyword arguments for one row of ``select_sql``."""
+        data = {name: row[position] for position, name in self._plain}
+        for position, name, decode, default in self._converted:
+            value = row[position]
+            try:
+                value = decode(value)
+            except (ValueError, TypeError) as e:
+                task_id = row[self._id_position] if self._id_position is not None else None
+                logging.warning(
+                    f"Malformed value for field '{name}' of task ID {task_id}: "
+                    f"{value!r} ({e}). Using default."
+                )
+                value = None
+            if value is None and default is not None:
+                value = default()
+            data[name] = value
+        if "chunks" not in data:
+            # Chunks live in task_chunks and are attached by the caller
+            data["chunks"] = []
+        return data
+
+
+def decode_chunk_row(row):
+    """Returns the in-memory chunk dict for a task_chunks row."""
+    return {
+        "id": row["id"],
+        "size": row["size"],
+        "type": row["type"],
+        "unit": row["unit"],
+        "status": row["status"],
+        "time_block": (
+            safe_json_loads(row["time_block"], None, "time_block")
+            if row["time_block"]
+            else None
+        ),
+        "date": row["date"],
+        "is_recurring": bool(row["is_recurring"]),
+    }
+
+
+def encode_chunk_row(task_id, position, chunk):
+    """
+    Encodes a chunk dict as a task_chunks row tuple. Chunks without an id
+    are given one in place so the in-memory dict and the row stay in step.
+    """
+    if not chunk.get("id"):
+        chunk["id"] = str(uuid.uuid4())
+    chunk_date = chunk.get("date")
+    if isinstance(chunk_date, (date, datetime)):
+        chunk_date = chunk_date.strftime("%Y-%m-%d")
+    return (
+        chunk["id"],
+        task_id,
+        position,
+        chunk.get("size") or 0.0,
+        chunk.get("type"),
+        chunk.get("unit"),
+        chunk.get("status") or "active",
+        (
+            safe_json_dumps(chunk.get("time_block"), None, "time_block")
+            if chunk.get("time_block") is not None
+            else None
+        ),
+        chunk_date,
+        int(bool(chunk.get("is_recurring"))),
+    )
+
+
+def normalize_tags(tags):
+    """Returns the distinct string tags of ``tags`` in first-seen order."""
+    seen = set()
+    normalized = []
+    for tag in tags or []:
+        if isinstance(tag, str) and tag not in seen:
+            seen.add(tag)
+            normalized.append(tag)
+    return normalized
@@ -1,14 +1,60 @@
 import sqlite3
 import os
 from datetime import datetime, timedelta, date
+from time import perf_counter
 import re
 import json
 import uuid
+import weakref
+from bisect import bisect_right
+from contextlib import contextmanager
+from core.database import get_database
+from core.migrations import run_migrations
+from core.task_codec import (
+    DERIVED_COLUMNS,
+    JSON_COLUMNS,
+    RECURRENCE_COLUMNS,
+    TASK_FIELDS,
+    TASK_INSERT_SQL,
+    TASK_INSERT_WITH_ID_SQL,
+    TaskRowCodec,
+    compute_next_due,
+    decode_chunk_row,
+    encode_chunk_row,
+    encode_task_column,
+    encode_task_columns,
+    encode_task_insert,
+    normalize_tags,
+    order_columns,
+    stored_next_due,
+    to_epoch_seconds,
+)
 from core.signals import global_signals
 from core.utils import *
 
+# Completed and failed tasks older than this move to archived_tasks at startup
+ARCHIVE_AFTER_DAYS = 30
+# Entries kept by the task change log before the oldest are dropped, see
+# TaskManager.get_task_changes
+TASK_CHANGE_LOG_LIMIT = 10000
+
 
 class TaskChunk:
+    # The scheduler builds thousands of these per refresh
+    __slots__ = (
+        "id",
+        "task",
+        "chunk_type",
+        "size",
+        "unit",
+        "timeblock_ratings",
+        "timeblock",
+        "date",
+        "is_recurring",
+        "status",
+        "flagged",
+    )
+
     def __init__(
         self,
         id,
@@ -57,8 +103,9 @@ class TaskChunk:
     def mark_failed(self):
         self.status = "failed"
 
-    def split(self, ratios):
-        # Only for splitting auto chunks
+    def split(self, ratios, min_chunk=None, max_chunk=None):
+        # Only for splitting auto chunks; min_chunk/max_chunk default to the
+        # task's chunk size limits
         if self.chunk_type == "auto":
             total_ratio = sum(ratios)
             # Guard against division by zero if ratios is empty or sums to zero
@@ -82,8 +129,10 @@ class TaskChunk:
                     )
                     for r in ratios
                 ]
-                min_chunk = getattr(self.task, "min_chunk_size", 0.25)
-                max_chunk = getattr(self.task, "max_chunk_size", self.size)
+                if min_chunk is None:
+                    min_chunk = getattr(self.task, "min_chunk_size", 0.25)
+                if max_chunk is None:
+                    max_chunk = getattr(self.task, "max_chunk_size", self.size)
                 for sc in subchunks:
                     if sc.size < min_chunk:
                         sc.size = min_chunk
@@ -112,8 +161,10 @@ class TaskChunk:
                     )
                     for r in ratios
                 ]
-                min_chunk = getattr(self.task, "min_chunk_size", 1)
-                max_chunk = getattr(self.task, "max_chunk_size", self.size)
+                if min_chunk is None:
+                    min_chunk = getattr(self.task, "min_chunk_size", 1)
+                if max_chunk is None:
+                    max_chunk = getattr(self.task, "max_chunk_size", self.size)
                 for sc in subchunks:
                     if sc.size < min_chunk:
                         sc.size = min_chunk
@@ -130,8 +181,100 @@ class TaskChunk:
 
 class Task:
     default_progress_order = ["subtasks", "count", "time"]
+    # Attributes backed by tasks columns or task_chunks rows; assignments to
+    # them are recorded so TaskManager.update_task can write only what changed.
+    tracked_fields = frozenset(TASK_FIELDS)
+    # Keyword arguments __init__ assigns explicitly, or ignores because the
+    # attribute is derived
+    init_fields = tracked_fields | {"id"} | set(DERIVED_COLUMNS)
+    # Optional attributes that are not tasks columns: archived_at on
+    # archived tasks, and flags read by the scheduler and task widgets.
+    # Unset until assigned; read them with getattr(task, name, default).
+    optional_fields = ("archived_at", "quick", "manually_scheduled", "completed")
+    # Tasks are kept in slots rather than a per-instance dict, so these are
+    # the only attributes a Task can have; other keyword arguments are an
+    # AttributeError.
+    __slots__ = TASK_FIELDS + optional_fields + (
+        "id",
+        "progress",
+        "_changes",
+        "_json_snapshot",
+        "_chunk_positions",
+        "__weakref__",  # TaskManager keeps a weak identity map of tasks
+    )
+
+    def __setattr__(self, name, value):
+        changes = self._changes
+        if changes is not None and name in self.tracked_fields and name not in changes:
+            original = getattr(self, name, None)
+            if original is not value and original != value:
+                changes[name] = original
+        object.__setattr__(self, name, value)
+
+    def mark_clean(self, *fields):
+        """
+        Marks the task as saved. Without arguments this starts (or restarts)
+        change tracking from the current values; with ``fields`` only those
+        are marked as saved.
+        """
+        if not fields:
+            self._changes = {}
+            self._json_snapshot = {
+                name: encode_task_column(name, getattr(self, name, None))
+                for name in JSON_COLUMNS
+            }
+            return
+        if self._changes is None:
+            return  # Not tracked yet
+        for name in fields:
+            self._changes.pop(name, None)
+            if name in self._json_snapshot:
+                self._json_snapshot[name] = encode_task_column(name, getattr(self, name))
+
+    def get_changed_fields(self):
+        """
+        Returns the set of tasks columns changed since the last mark_clean(),
+        or None if the task is not tracked (never loaded from or saved to the
+        database). JSON-backed attributes are compared by encoded value so
+        in-place edits such as ``task.subtasks.append(...)`` are caught.
+        """
+        changes = self._changes
+        if changes is None:
+            return None
+        changed = set(changes)
+        snapshot = self._json_snapshot
+        for name in JSON_COLUMNS:
+            if name in changed:
+                continue
+            value = getattr(self, name, None)
+            if not value and snapshot[name] in (None, "[]"):
+                continue  # Still empty
+            if encode_task_column(name, value) != snapshot[name]:
+                changed.add(name)
+        return changed
+
+    def get_original_value(self, name, default=None):
+        """Returns the value ``name`` had when the task was last marked clean."""
+        changes = self._changes
+        if changes is not None and name in changes:
+            return changes[name]
+        return getattr(self, name, default)
+
+    @property
+    def next_due(self):
+        """When this finished recurring task rolls over, or None."""
+        return compute_next_due(*(getattr(self, name) for name in RECURRENCE_COLUMNS))
+
+    def _record_change(self, name):
+        changes = self._changes
+        if changes is not None and name not in changes:
+            changes[name] = None
 
     def __init__(self, **kwargs):
+        # Untracked until mark_clean(); set first since __setattr__ reads it
+        object.__setattr__(self, "_changes", None)
+        self._json_snapshot = None
+        self._chunk_positions = None
 
         required_attributes = ["name", "list_name"]
         for attr in required_attributes:
@@ -140,9 +283,10 @@ class Task:
                     f"'{attr}' is a required attribute and cannot be None."
                 )
 
-        # Dynamically set attributes from kwargs
+        # Dynamically set attributes from kwargs that are not handled below
         for key, value in kwargs.items():
-            setattr(self, key, value)
+            if key not in self.init_fields:
+                setattr(self, key, value)
 
         self.id = kwargs.get("id", None)
         self.name = kwargs.get("name")
@@ -229,8 +373,6 @@ class Task:
 
         self.include_in_schedule = kwargs.get("include_in_schedule", False)
 
-        self.global_weight = kwargs.get("global_weight", None)
-
     def add_chunk(
         self,
         size,
@@ -253,67 +395,96 @@ class Task:
             "is_recurring": is_recurring,
         }
         self.chunks.append(chunk)
+        self._record_change("chunks")
 
-    def update_chunk(self, updated_chunk_data: dict):
-        """Updates a chunk in the task's chunk list using a dictionary."""
-        chunk_id = updated_chunk_data.get("id")
+    def _chunk_index(self, chunk_id):
+        """
+        Returns the position of ``chunk_id`` in ``self.chunks`` or None.
+
+        Positions are cached by chunk id. The cache is rebuilt whenever the
+        chunk list is replaced, grows or shrinks, or a cached position no
+        longer holds the expected chunk.
+        """
         if not chunk_id:
-            return False  # No ID provided, can't update
+            return None
+        cache = self._chunk_positions
+        if cache is None or cache[0] is not self.chunks or cache[1] != len(self.chunks):
+            cache = None
+        else:
+            index = cache[2].get(chunk_id)
+            if index is not None and self.chunks[index].get("id") == chunk_id:
+                return index
+        positions = {chunk.get("id"): i for i, chunk in enumerate(self.chunks)}
+        self._chunk_positions = (self.chunks, len(self.chunks), positions)
+        return positions.get(chunk_id)
 
-        for chunk in self.chunks:
-            if chunk["id"] == chunk_id:
-                for key, value in updated_chunk_data.items():
-                    if key in chunk:  # Only update existing keys
-                        chunk[key] = value
-                return True  # Update successful
+    def update_chunk(self, updated_chunk_data: dict):
+        """Updates a chunk in the task's chunk list using a dictionary."""
+        index = self._chunk_index(updated_chunk_data.get("id"))
+        if index is None:
+            return False  # No ID provided or chunk not found
 
-        return False  # Chunk not found
+        chunk = self.chunks[index]
+        for key, value in updated_chunk_data.items():
+            if key in chunk:  # Only update existing keys
+                chunk[key] = value
+        self._record_change("chunks")
+        return True  # Update successful
 
     def remove_chunk(self, chunk_id):
         """Removes a chunk from the task's chunk list based on chunk ID."""
-        self.chunks = [chunk for chunk in self.chunks if chunk["id"] != chunk_id]
+        index = self._chunk_index(chunk_id)
+        if index is not None:
+            del self.chunks[index]
+            self._record_change("chunks")
 
     def update_chunk_obj(self, task_chunk: TaskChunk) -> bool:
         """
         Update a chunk in the task's chunk list using a TaskChunk object.
         If the chunk's status changes to 'completed', update time_logged or count_completed.
         """
-        for chunk in self.chunks:
-            if chunk["id"] == task_chunk.id:
-                previous_status = chunk.get("status", "active")
-                # Update chunk details from the TaskChunk object.
-                chunk["size"] = task_chunk.size
-                chunk["type"] = task_chunk.chunk_type
-                chunk["unit"] = task_chunk.unit
-                chunk["status"] = task_chunk.status
-                chunk["time_block"] = task_chunk.timeblock
-                chunk["date"] = task_chunk.date
-                chunk["is_recurring"] = task_chunk.is_recurring
-                # If the chunk has just been marked as complete, update totals.
-                if task_chunk.status == "completed" and previous_status != "completed":
-                    if task_chunk.unit == "time":
-                        self.time_logged += task_chunk.size
-                    elif task_chunk.unit == "count":
-                        self.count_completed += task_chunk.size
-                return True
-        return False
+        index = self._chunk_index(task_chunk.id)
+        if index is None:
+            return False
+
+        chunk = self.chunks[index]
+        previous_status = chunk.get("status", "active")
+        # Update chunk details from the TaskChunk object.
+        chunk["size"] = task_chunk.size
+        chunk["type"] = task_chunk.chunk_type
+        chunk["unit"] = task_chunk.unit
+        chunk["status"] = task_chunk.status
+        chunk["time_block"] = task_chunk.timeblock
+        chunk["date"] = task_chunk.date
+        chunk["is_recurring"] = task_chunk.is_recurring
+        self._record_change("chunks")
+        # If the chunk has just been marked as complete, update totals.
+        if task_chunk.status == "completed" and previous_status != "completed":
+            if task_chunk.unit == "time":
+                self.time_logged += task_chunk.size
+            elif task_chunk.unit == "count":
+                self.count_completed += task_chunk.size
+        return True
 
     def delete_chunk(self, task_chunk: TaskChunk) -> bool:
         """
         Delete a chunk from the task's chunk list using a TaskChunk object.
         If the chunk is marked as complete, subtract its size from time_logged or count_completed.
         """
-        for i, chunk in enumerate(self.chunks):
-            if chunk["id"] == task_chunk.id:
-                # If the chunk is complete, adjust totals.
-                if chunk.get("status") == "completed":
-                    if chunk.get("unit") == "time":
-                        self.time_logged -= chunk["size"]
-                    elif chunk.get("unit") == "count":
-                        self.count_completed -= chunk["size"]
-                del self.chunks[i]
-                return True
-        return False
+        index = self._chunk_index(task_chunk.id)
+        if index is None:
+            return False
+
+        chunk = self.chunks[index]
+        # If the chunk is complete, adjust totals.
+        if chunk.get("status") == "completed":
+            if chunk.get("unit") == "time":
+                self.time_logged -= chunk["size"]
+            elif chunk.get("unit") == "count":
+                self.count_completed -= chunk["size"]
+        del self.chunks[index]
+        self._record_change("chunks")
+        return True
 
     def get_chunks(self):
         return self.chunks
@@ -334,6 +505,14 @@ class Task:
         # If already a datetime object, return it
         if isinstance(date_str, datetime):
             return date_str
+        if isinstance(date_str, date):
+            return datetime(date_str.year, date_str.month, date_str.day)
+
+        # Fast path: every format the database writes is ISO 8601
+        try:
+            return datetime.fromisoformat(date_str)
+        except (TypeError, ValueError):
+            pass
 
         # Create a copy to avoid mutating the original list
         fmts = list(formats)
@@ -510,6 +689,10 @@ class Task:
 
 
 class TaskList:
+    _tasks = None
+    _task_loader = None
+    _task_counter = None
+
     def __init__(self, **kwargs):
 
         required_attributes = ["category", "name"]
@@ -520,7 +703,8 @@ class TaskList:
                 )
 
         for key, value in kwargs.items():
-            setattr(self, key, value)
+            if key not in ("task_loader", "task_counter"):
+                setattr(self, key, value)
 
         self.id = kwargs.get("id")
         self.order = kwargs.get("order", 0)
@@ -557,8 +741,53 @@ class TaskList:
         self.sort_by_tags = kwargs.get("sort_by_tags", False)
         self.sort_by_time_estimate = kwargs.get("sort_by_time_estimate", False)
 
-        self.tasks = kwargs.get("tasks", [])
-        self.progress = self.calculate_progress()
+        # Tasks are loaded on first access when a loader is given and no
+        # tasks are passed in; see the ``tasks`` property.
+        self._task_loader = kwargs.get("task_loader")
+        self._task_counter = kwargs.get("task_counter")
+        tasks = kwargs.get("tasks")
+        if tasks is None and self._task_loader is None:
+            tasks = []
+        self.tasks = tasks
+
+    @property
+    def tasks(self):
+        if self._tasks is None:
+            self._tasks = self._task_loader(self.name)
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks = tasks
+
+    @property
+    def progress(self):
+        return self.calculate_progress()
+
+    def is_loaded(self):
+        """Returns True if the list's Task objects are in memory."""
+        return self._tasks is not None
+
+    def unload(self):
+        """Drops the in-memory tasks; they are reloaded on next access."""
+        if self._task_loader is not None:
+            self._tasks = None
+
+    def _get_counts(self):
+        if self._tasks is not None or self._task_counter is None:
+            completed = sum(1 for task in self.tasks if task.status == "Completed")
+            return len(self.tasks), completed
+        return self._task_counter(self.name)
+
+    @property
+    def task_count(self):
+        """Number of tasks in the list, without loading them if not loaded."""
+        return self._get_counts()[0]
+
+    @property
+    def completed_count(self):
+        """Number of completed tasks, without loading them if not loaded."""
+        return self._get_counts()[1]
 
     @staticmethod
     def _parse_date(date_str, fmt):
@@ -618,21 +847,15 @@ class TaskList:
         return total_progress / tasks_with_progress
 
     def get_task_tags(self):
+        """Returns the distinct tags of the list's tasks in first-seen order."""
+        seen = set()
         task_tags = []
-        # Collect all tags from the current tasks
-        current_tags = set()
         for task in self.tasks:
             if isinstance(task.tags, list):
-                current_tags.update(task.tags)
-
-        # Remove leftover tags not present in any task
-        task_tags = [tag for tag in task_tags if tag in current_tags]
-
-        # Add new tags from current tasks
-        for tag in current_tags:
-            if tag not in task_tags:
-                task_tags.append(tag)
-
+                for tag in task.tags:
+                    if tag not in seen:
+                        seen.add(tag)
+                        task_tags.append(tag)
         return task_tags
 
     def add_task_to_model_list(self, task):
@@ -660,8 +883,27 @@ class TaskList:
         # Sort tasks by list_order to maintain order
         self.tasks.sort(key=lambda t: t.list_order)
 
+    def add_tasks_to_model_list(self, tasks):
+        """
+        Adds several tasks at once. Tasks without a list_order are appended
+        in the given order after the current last task; tasks with one are
+        inserted as in add_task_to_model_list.
+        """
+        appended = []
+        for task in tasks:
+            if task.list_order == 0:
+                appended.append(task)
+            else:
+                self.add_task_to_model_list(task)
+        if not appended:
+            return
+        next_order = max((t.list_order for t in self.tasks), default=-1) + 1
+        for task in appended:
+            task.list_order = next_order
+            next_order += 1
+        self.tasks.extend(appended)
+
     def get_tasks(self):
-        print(f"DEBUG TaskList.get_tasks: name={self.name} due={self.sort_by_due_datetime} estimate={self.sort_by_time_estimate} queue={self.sort_by_queue} stack={self.sort_by_stack} priority={self.sort_by_priority}")
         # Sort by due date if toggled
         if self.sort_by_due_datetime:
             tasks_sorted = [t for t in self.tasks if t.status not in ["Completed","Failed"]]
@@ -755,18 +997,43 @@ class TaskList:
 
 
 class TaskManager:
-    def __init__(self):
+    def __init__(self, archive_after_days=ARCHIVE_AFTER_DAYS):
         self.data_dir = "data"
         os.makedirs(self.data_dir, exist_ok=True)
         self.db_file = os.path.join(self.data_dir, "adm.db")
-        # Connect with type detection enabled
-        self.conn = sqlite3.connect(self.db_file, detect_types=sqlite3.PARSE_DECLTYPES)
-        self.conn.row_factory = sqlite3.Row
+        # Shared writer connection (WAL, type detection and sqlite3.Row rows)
+        self.db = get_database(self.db_file)
+        self.conn = self.db.conn
+        # frozenset(tags) -> frozenset(task ids), cleared whenever tags change
+        self._tag_query_cache = {}
+        # Unit-of-work state, see batch(); the depth and failure flag live on
+        # self.db so ScheduleManager writes defer to the same batch
+        self._batch_notify = False
+        self._batch_dirty = False
+        self._pending_updates = {}
+        # Ids of tasks changed in memory during the batch (None: everything),
+        # reloaded from the database if the batch is rolled back
+        self._batch_changed_ids = set()
+        # list_name -> (tasks, completed), see get_task_counts()
+        self._task_counts = None
+        # Identity map: task id -> the one in-memory Task for that row. Weak,
+        # so tasks of unloaded lists go away once nothing else holds them.
+        self._tasks_by_id = weakref.WeakValueDictionary()
+        # list name -> TaskList, kept in step with self.task_lists
+        self._lists_by_name = {}
+        # None disables archiving at startup
+        self.archive_after_days = archive_after_days
+        # Task change log, see get_task_changes()
+        self.change_version = 0
+        self._task_change_log = []
+        self._task_change_floor = 0
         self.create_tables()
         self.initialize_system_category()
         self.task_lists = self.load_task_lists()
+        self._index_task_lists()
         self.categories = self.load_categories()
         self.manage_recurring_tasks()
+        self.archive_completed_tasks(notify=False)
 
     def create_tables(self):
         create_categories_table = """
@@ -813,10 +1080,11 @@ class TaskManager:
                 notes TEXT,
                 tags TEXT DEFAULT '[]',
                 resources TEXT DEFAULT '[]',
-                start_date DATE,
-                due_datetime TIMESTAMP,
-                added_date_time TIMESTAMP,
-                last_completed_date DATE,
+                -- Seconds since 1970-01-01, see task_codec.to_epoch_seconds
+                start_date INTEGER,
+                due_datetime INTEGER,
+                added_date_time INTEGER,
+                last_completed_date INTEGER,
                 list_order INTEGER DEFAULT 0,
                 list_name TEXT NOT NULL,
 
@@ -829,7 +1097,6 @@ class TaskManager:
                 count_required INTEGER DEFAULT 0,
                 count_completed INTEGER DEFAULT 0,
 
-                chunks TEXT DEFAULT '[]',
                 chunk_preference TEXT,
                 min_chunk_size REAL DEFAULT 0.0,
                 max_chunk_size REAL DEFAULT 0.0,
@@ -847,7 +1114,8 @@ class TaskManager:
 
                 include_in_schedule BOOLEAN NOT NULL DEFAULT 0,
 
-                global_weight REAL,
+                -- When a finished recurring task rolls over (Task.next_due)
+                next_due INTEGER,
 
                 FOREIGN KEY(list_name) REFERENCES task_lists(name) ON DELETE CASCADE
             );
@@ -861,52 +1129,308 @@ class TaskManager:
             print("Task lists table created successfully.")
             cursor.execute(create_tasks_table)
             print("Tasks table created successfully.")
-            self.conn.commit()
+            self.db.commit()
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
+            self.db.rollback()
+
+        # Everything added to the schema since the base tables
+        self.schema_version = run_migrations(self.conn)
+        # Built once for the migrated schema and shared by every task loader
+        self.row_codec = TaskRowCodec.for_table(self.conn)
+        self.has_search_index = (
+            self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_search'"
+            ).fetchone()
+            is not None
+        )
+        self.archive_codec = None
+        if self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archived_tasks'"
+        ).fetchone():
+            self.archive_codec = TaskRowCodec.for_table(
+                self.conn, "archived_tasks", extra_columns=("chunks", "archived_at")
+            )
+
+    @contextmanager
+    def batch(self, notify=True):
+        """
+        Groups TaskManager mutations into one unit of work.
+
+        Inside the block writes share a single transaction. update_task calls
+        are queued and deduplicated per task, and written once when the
+        outermost batch exits. If the block raises, or any write in it fails,
+        the whole transaction is rolled back, and the in-memory tasks and
+        lists it changed are reloaded from the database (see
+        _reload_after_rollback). Otherwise it is committed once. Either way,
+        if ``notify`` is set and something changed, task_list_updated is
+        emitted a single time. Batches may be nested; only the outermost one
+        commits. Writes made through the shared DatabaseManager (time blocks,
+        schedule settings) join the batch as well.
+
+            with task_manager.batch():
+                for task in tasks:
+                    task.list_order = ...
+                    task_manager.update_task(task)
+        """
+        self.db.batch_depth += 1
+        if notify:
+            self._batch_notify = True
+        failed = False
+        try:
+            yield self
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.db.batch_depth -= 1
+            if self.db.batch_depth == 0:
+                self._finish_batch(failed)
+
+    def _finish_batch(self, failed):
+        pending = list(self._pending_updates.values())
+        changed = self._batch_dirty or bool(pending)
+        failed = failed or self.db.batch_failed
+        notify = self._batch_notify
+        changed_ids = self._batch_changed_ids
+        self._pending_updates = {}
+        self._batch_notify = self._batch_dirty = self.db.batch_failed = False
+        self._batch_changed_ids = set()
+
+        if failed:
+            print("Batch failed, rolling back all of its changes.")
+            self.db.rollback()
+            if changed_ids is not None:
+                # Queued tasks carry edits that were never written
+                changed_ids |= {task.id for task in pending}
+            if self._reload_after_rollback(changed_ids) and notify:
+                global_signals.task_list_updated.emit()
+            return
+        # Queued rows are written in the same transaction as the earlier
+        # batch writes; a failure there rolls all of them back.
+        if pending and not self._write_tasks(pending):
+            return
+        self.db.commit()
+        if notify and changed:
+            global_signals.task_list_updated.emit()
+
+    def _reload_after_rollback(self, task_ids):
+        """
+        Brings the in-memory model back in line with the database after a
+        batch was rolled back. Tasks in ``task_ids`` leave the identity map
+        and every loaded list that held them, in memory or in the database,
+        is unloaded (or re-read), so they are read again from the database. With ``task_ids``
+        None (list or category edits) all lists and categories are reloaded.
+        Returns True if anything was reloaded.
+        """
+        self._tag_query_cache.clear()
+        self._task_counts = None
+        if task_ids is None:
+            self._tasks_by_id = weakref.WeakValueDictionary()
+            self.task_lists = self.load_task_lists()
+            self._index_task_lists()
+            self.categories = self.load_categories()
+        elif task_ids:
+            task_ids = {task_id for task_id in task_ids if task_id is not None}
+            list_names = set()
+            cursor = self.conn.cursor()
+            try:
+                list_names.update(self._get_stored_list_names(cursor, task_ids).values())
+            except sqlite3.Error as e:
+                print(f"Database error while reloading tasks after a rollback: {e}")
+            finally:
+                cursor.close()
+            for task_list in self.task_lists:
+                if task_list.is_loaded() and any(
+                    task.id in task_ids for task in task_list.tasks
+                ):
+                    list_names.add(task_list.name)
+            for task_id in task_ids:
+                self._tasks_by_id.pop(task_id, None)
+            for list_name in list_names:
+                task_list = self._lists_by_name.get(list_name)
+                if task_list is None or not task_list.is_loaded():
+                    continue
+                if task_list._task_loader is not None:
+                    task_list.unload()
+                else:
+                    # Lists added in this session have no loader
+                    task_list.tasks = self.get_tasks_by_list_name(list_name)
+        else:
+            return False
+        # Anything built from the rolled back changes rebuilds from scratch
+        self._log_task_changes()
+        return True
+
+    def _commit(self):
+        """Commits now, or defers to the enclosing batch."""
+        self._task_counts = None
+        if self.db.batch_depth:
+            self._batch_dirty = True
+        self.db.commit()
+
+    def _rollback(self):
+        """Rolls back now; inside a batch the whole batch is rolled back on exit."""
+        self._task_counts = None
+        self.db.rollback()
+
+    def _log_task_changes(self, task_ids=None):
+        """
+        Records that the tasks with ``task_ids`` were added, written or
+        removed. Without ids, everything is treated as changed; that is used
+        for list and category edits, which can change many tasks at once.
+        """
+        if self.db.batch_depth and self._batch_changed_ids is not None:
+            if task_ids is None:
+                self._batch_changed_ids = None
+            else:
+                self._batch_changed_ids.update(task_ids)
+        self.change_version += 1
+        if task_ids is None:
+            self._task_change_log.clear()
+            self._task_change_floor = self.change_version
+            return
+        version = self.change_version
+        self._task_change_log.extend((version, task_id) for task_id in task_ids)
+        if len(self._task_change_log) > TASK_CHANGE_LOG_LIMIT:
+            dropped = self._task_change_log[: len(self._task_change_log) // 2]
+            del self._task_change_log[: len(dropped)]
+            self._task_change_floor = dropped[-1][0]
+
+    def _log_list_changes(self):
+        """
+        Records an in-memory list or category edit that changes no task, so
+        a rolled back batch reloads lists and categories (see batch()).
+        """
+        if self.db.batch_depth:
+            self._batch_changed_ids = None
+
+    def get_task_changes(self, since):
+        """
+        Returns ``(change_version, task_ids)``: the ids of tasks added,
+        written or removed after change version ``since``. task_ids is None
+        if the log no longer reaches back that far (or everything changed
+        since), in which case callers should rebuild from scratch.
+
+            version, changed = task_manager.get_task_changes(seen_version)
+        """
+        if since < self._task_change_floor:
+            return self.change_version, None
+        log = self._task_change_log
+        start = bisect_right(log, since, key=lambda entry: entry[0])
+        return self.change_version, {task_id for _, task_id in log[start:]}
 
     def load_task_lists(self):
+        """
+        Loads every task list without its tasks.
+
+        A list's Task objects are read by get_tasks_by_list_name the first
+        time its ``tasks`` are accessed, and task counts come from one
+        aggregate query (see get_task_counts), so startup cost grows with the
+        number of lists rather than the number of tasks. Timings are kept in
+        ``self.load_timings`` (seconds).
+        """
+        timings = {}
         task_lists = []
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM task_lists")
-        rows = cursor.fetchall()
-        for row in rows:
-            task_list_data = dict(row)
-            # Use the new conversion utilities
-            task_list_data["notifications_enabled"] = from_bool_int(
-                task_list_data["notifications_enabled"]
-            )
-            task_list_data["archived"] = from_bool_int(task_list_data["archived"])
-            task_list_data["in_trash"] = from_bool_int(task_list_data["in_trash"])
-            task_list_data["consider_in_schedule"] = from_bool_int(
-                task_list_data["consider_in_schedule"]
-            )
-            task_list_data["sort_by_queue"] = from_bool_int(
-                task_list_data["sort_by_queue"]
-            )
-            task_list_data["sort_by_stack"] = from_bool_int(
-                task_list_data["sort_by_stack"]
-            )
-            task_list_data["sort_by_priority"] = from_bool_int(
-                task_list_data["sort_by_priority"]
-            )
-            task_list_data["sort_by_due_datetime"] = from_bool_int(
-                task_list_data["sort_by_due_datetime"]
-            )
-            task_list_data["sort_by_tags"] = from_bool_int(
-                task_list_data["sort_by_tags"]
-            )
-            task_list_data["sort_by_time_estimate"] = from_bool_int(
-                task_list_data["sort_by_time_estimate"]
-            )
-            print(f"DEBUG load_task_lists: list={task_list_data.get('name')} due={task_list_data.get('sort_by_due_datetime')} estimate={task_list_data.get('sort_by_time_estimate')}")
-            # Create the TaskList object first
-            task_list = TaskList(**task_list_data)
-            # Now load its tasks from the DB and assign them
-            task_list.tasks = self.get_tasks_by_list_name(task_list.name)
-            task_lists.append(task_list)
+        try:
+            phase_start = perf_counter()
+            cursor.execute("SELECT * FROM task_lists")
+            for row in cursor:
+                task_lists.append(self._task_list_from_row(row))
+            timings["task_lists"] = perf_counter() - phase_start
+        finally:
+            cursor.close()
+
+        timings["total"] = timings["task_lists"]
+        self.load_timings = timings
+        print(
+            f"Loaded {len(task_lists)} task lists in {timings['task_lists'] * 1000:.1f} ms."
+        )
         return task_lists
 
+    def get_task_counts(self):
+        """
+        Returns {list_name: (task count, completed count)} from one GROUP BY
+        over the list_name/status index. The result is cached until the next
+        commit or rollback.
+        """
+        if self._task_counts is None:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    SELECT list_name, COUNT(*) AS task_count,
+                           SUM(status = 'Completed') AS completed_count
+                    FROM tasks
+                    GROUP BY list_name
+                    """
+                )
+                self._task_counts = {
+                    row["list_name"]: (row["task_count"], row["completed_count"] or 0)
+                    for row in cursor
+                }
+            except sqlite3.Error as e:
+                print(f"Database error while counting tasks: {e}")
+                return {}
+            finally:
+                cursor.close()
+        return self._task_counts
+
+    def _count_list_tasks(self, list_name):
+        return self.get_task_counts().get(list_name, (0, 0))
+
+    def hydrate_task_lists(self, task_lists):
+        """
+        Loads the tasks of every not yet loaded list in ``task_lists`` with
+        one task query and one chunk query, instead of one pair per list.
+        """
+        pending = {tl.name: tl for tl in task_lists if not tl.is_loaded()}
+        if not pending:
+            return
+        tasks_by_list = {name: [] for name in pending}
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        try:
+            for names in iter_batches(list(pending)):
+                placeholders = ", ".join("?" for _ in names)
+                cursor.execute(
+                    f"{self.row_codec.select_sql} WHERE list_name IN ({placeholders})",
+                    names,
+                )
+                for task in self._tasks_from_rows(cursor):
+                    # Stored list, even if an unsaved edit moved the task
+                    tasks_by_list[task.get_original_value("list_name")].append(task)
+        except sqlite3.Error as e:
+            print(f"Database error while loading tasks: {e}")
+            return
+        finally:
+            cursor.close()
+        for name, task_list in pending.items():
+            task_list.tasks = tasks_by_list[name]
+
+    def _task_list_from_row(self, row):
+        task_list_data = dict(row)
+        # Use the new conversion utilities
+        for key in (
+            "notifications_enabled",
+            "archived",
+            "in_trash",
+            "consider_in_schedule",
+            "sort_by_queue",
+            "sort_by_stack",
+            "sort_by_priority",
+            "sort_by_due_datetime",
+            "sort_by_tags",
+            "sort_by_time_estimate",
+        ):
+            task_list_data[key] = from_bool_int(task_list_data[key])
+        return TaskList(
+            **task_list_data,
+            task_loader=self.get_tasks_by_list_name,
+            task_counter=self._count_list_tasks,
+        )
+
     def initialize_system_category(self):
         """
         Create a protected category 'system' and within it a default task list called 'quick tasks'.
@@ -920,7 +1444,7 @@ class TaskManager:
                 "INSERT INTO categories (`order`, name) VALUES (?, ?)",
                 (10000, "System"),
             )
-            self.conn.commit()
+            self._commit()
             print("Protected system category created.")
 
         # Check if the system task list "quick tasks" exists.
@@ -962,92 +1486,111 @@ class TaskManager:
             print("Protected 'quick tasks' task list created in system category.")
 
     def get_tasks_by_list_name(self, list_name):
-        tasks = []
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM tasks WHERE list_name=?", (list_name,))
-        rows = cursor.fetchall()
-        for row in rows:
-            task_data = dict(row)
-            task_data["tags"] = (
-                safe_json_loads(
-                    task_data["tags"], [], "tags", f"for task in list '{list_name}'"
-                )
-                if task_data.get("tags")
-                else []
-            )
-            task_data["resources"] = (
-                safe_json_loads(
-                    task_data["resources"],
-                    [],
-                    "resources",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("resources")
-                else []
-            )
-            task_data["recur_every"] = (
-                safe_json_loads(
-                    task_data["recur_every"],
-                    None,
-                    "recur_every",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("recur_every")
-                else None
-            )
-            task_data["subtasks"] = (
-                safe_json_loads(
-                    task_data["subtasks"],
-                    [],
-                    "subtasks",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("subtasks")
-                else []
-            )
-            task_data["dependencies"] = (
-                safe_json_loads(
-                    task_data["dependencies"],
-                    [],
-                    "dependencies",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("dependencies")
-                else []
-            )
-            task_data["chunks"] = (
-                safe_json_loads(
-                    task_data["chunks"], [], "chunks", f"for task in list '{list_name}'"
+        cursor.row_factory = None  # Plain tuples; the codec decodes by position
+        cursor.execute(f"{self.row_codec.select_sql} WHERE list_name=?", (list_name,))
+        tasks = self._tasks_from_rows(cursor)
+        cursor.close()
+        return tasks
+
+    def _attach_chunks(self, tasks):
+        """Fills ``task.chunks`` for the given tasks from task_chunks in one query."""
+        tasks_by_id = {task.id: task for task in tasks if task.id is not None}
+        if not tasks_by_id:
+            return
+        cursor = self.conn.cursor()
+        try:
+            for task_ids in iter_batches(list(tasks_by_id)):
+                placeholders = ", ".join("?" for _ in task_ids)
+                cursor.execute(
+                    f"SELECT * FROM task_chunks WHERE task_id IN ({placeholders}) "
+                    "ORDER BY task_id, position",
+                    task_ids,
                 )
-                if task_data.get("chunks")
-                else []
+                for row in cursor:
+                    tasks_by_id[row["task_id"]].chunks.append(decode_chunk_row(row))
+        finally:
+            cursor.close()
+
+    def _sync_tags(self, cursor, tasks):
+        """
+        Brings the task_tags rows of ``tasks`` in line with their ``tags``.
+        Stored tags are read in one query and only the differences are
+        written. Runs inside the caller's transaction.
+        """
+        tasks = [task for task in tasks if task.id is not None]
+        if not tasks:
+            return
+        stored = {task.id: set() for task in tasks}
+        for task_ids in iter_batches(list(stored)):
+            placeholders = ", ".join("?" for _ in task_ids)
+            cursor.execute(
+                f"SELECT task_id, tag FROM task_tags WHERE task_id IN ({placeholders})",
+                task_ids,
             )
-            task_data["preferred_work_days"] = (
-                safe_json_loads(
-                    task_data["preferred_work_days"],
-                    [],
-                    "preferred_work_days",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("preferred_work_days")
-                else []
+            for row in cursor.fetchall():
+                stored[row["task_id"]].add(row["tag"])
+
+        removed = []
+        added = []
+        for task in tasks:
+            tags = set(normalize_tags(task.tags))
+            removed.extend((task.id, tag) for tag in stored[task.id] - tags)
+            added.extend((task.id, tag) for tag in tags - stored[task.id])
+        if removed:
+            cursor.executemany(
+                "DELETE FROM task_tags WHERE task_id = ? AND tag = ?", removed
             )
-            task_data["time_of_day_preference"] = (
-                safe_json_loads(
-                    task_data["time_of_day_preference"],
-                    [],
-                    "time_of_day_preference",
-                    f"for task in list '{list_name}'",
-                )
-                if task_data.get("time_of_day_preference")
-                else []
+        if added:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO task_tags (task_id, tag) VALUES (?, ?)", added
             )
+        if removed or added:
+            self._tag_query_cache.clear()
+
+    def _replace_chunks(self, cursor, tasks):
+        """Rewrites all chunk rows of ``tasks``. Runs inside the caller's transaction."""
+        cursor.executemany(
+            "DELETE FROM task_chunks WHERE task_id = ?", [(task.id,) for task in tasks]
+        )
+        self._insert_chunk_rows(
+            cursor,
+            [
+                encode_chunk_row(task.id, position, chunk)
+                for task in tasks
+                for position, chunk in enumerate(task.chunks)
+            ],
+        )
 
-            task_data["recurring"] = bool(task_data["recurring"])
-            task_data["include_in_schedule"] = bool(task_data["include_in_schedule"])
+    def _insert_chunk_rows(self, cursor, chunk_rows):
+        if chunk_rows:
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO task_chunks (
+                    id, task_id, position, size, type, unit, status, time_block, date, is_recurring
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                chunk_rows,
+            )
 
-            task = Task(**task_data)
+    def _tasks_from_rows(self, rows):
+        """
+        Returns the Task for each row selected with ``self.row_codec.select_sql``.
+        A row whose task is already in memory gives that instance, unchanged;
+        the others are built clean, get their chunks and join the identity map.
+        """
+        tasks = []
+        new_tasks = []
+        for row in rows:
+            task = self._tasks_by_id.get(self.row_codec.get_id(row))
+            if task is None:
+                task = Task(**self.row_codec.decode(row))
+                task.mark_clean()
+                new_tasks.append(task)
             tasks.append(task)
+        self._attach_chunks(new_tasks)
+        for task in new_tasks:
+            self._tasks_by_id[task.id] = task
         return tasks
 
     def load_categories(self):
@@ -1140,7 +1683,8 @@ class TaskManager:
                 "INSERT INTO categories (name, `order`) VALUES (?, ?)",
                 (category_name, new_order),
             )
-            self.conn.commit()
+            self._commit()
+            self._log_list_changes()
             # Update in-memory structure
             self.categories[category_name] = {"order": new_order, "task_lists": []}
         except sqlite3.IntegrityError as e:
@@ -1148,11 +1692,11 @@ class TaskManager:
                 f"Error adding category '{category_name}': {e}"
             )  # Likely duplicate name
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while adding category '{category_name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1165,17 +1709,18 @@ class TaskManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute("DELETE FROM categories WHERE name=?", (category_name,))
-            self.conn.commit()
+            self._commit()
             # Reload categories from DB to reflect change
             self.categories = self.load_categories()
+            self._log_task_changes()
         except sqlite3.Error as e:  # Changed from IntegrityError to general Error
             print(f"Error removing category '{category_name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while removing category '{category_name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1194,19 +1739,20 @@ class TaskManager:
             if cursor.rowcount == 0:
                 print(f"Warning: Category '{old_name}' not found for renaming.")
             else:
-                self.conn.commit()
+                self._commit()
             # Reload categories to reflect changes
             self.categories = self.load_categories()
+            self._log_task_changes()
         except sqlite3.IntegrityError as e:  # Could be duplicate new_name
             print(f"Error renaming category from '{old_name}' to '{new_name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(
                 f"Unexpected error while renaming category from '{old_name}' to '{new_name}': {e}"
             )
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1224,7 +1770,8 @@ class TaskManager:
                     f"Warning: Category '{category_name}' not found for order update."
                 )
             else:
-                self.conn.commit()
+                self._commit()
+                self._log_list_changes()
                 # Update in-memory order
                 if category_name in self.categories:
                     self.categories[category_name]["order"] = new_order
@@ -1235,13 +1782,13 @@ class TaskManager:
         except sqlite3.Error as e:
             print(f"Failed to update order for category '{category_name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(
                 f"Unexpected error while updating category order for '{category_name}': {e}"
             )
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1293,7 +1840,8 @@ class TaskManager:
                     to_bool_int(task_list.sort_by_time_estimate)
                 )
             )
-            self.conn.commit()
+            self._commit()
+            self._log_list_changes()
             # Get the newly assigned ID if it's autoincrement (assuming it is)
             task_list.id = cursor.lastrowid
 
@@ -1301,6 +1849,7 @@ class TaskManager:
             if not hasattr(self, "task_lists"):
                 self.task_lists = []
             self.task_lists.append(task_list)
+            self._lists_by_name[task_list.name] = task_list
             if task_list.category not in self.categories:
                 # Handle case where category might not exist in memory yet
                 # Option 1: Add it dynamically (might mess up order)
@@ -1315,11 +1864,11 @@ class TaskManager:
         except sqlite3.Error as e:
             print(f"Database error while adding task_list '{task_list.name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while adding task list '{task_list.name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1342,9 +1891,25 @@ class TaskManager:
             if cursor.rowcount == 0:
                 print(f"Warning: Task list '{name}' not found in database for removal.")
             else:
-                self.conn.commit()
+                # Remove the list's tasks with it instead of leaving orphans
+                for table in ("task_chunks", "task_tags"):
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE task_id IN "
+                        "(SELECT id FROM tasks WHERE list_name = ?)",
+                        (name,),
+                    )
+                cursor.execute("DELETE FROM tasks WHERE list_name = ?", (name,))
+                if self.archive_codec is not None:
+                    cursor.execute("DELETE FROM archived_tasks WHERE list_name = ?", (name,))
+                self._tag_query_cache.clear()
+                self._commit()
                 # Remove from in-memory lists AFTER successful commit
                 self.task_lists[:] = [tl for tl in self.task_lists if tl.name != name]
+                self._lists_by_name.pop(name, None)
+                self._log_task_changes()
+                for task_id, task in list(self._tasks_by_id.items()):
+                    if task.get_original_value("list_name") == name:
+                        del self._tasks_by_id[task_id]
                 for category in self.categories.values():
                     category["task_lists"][:] = [
                         tl for tl in category["task_lists"] if tl.name != name
@@ -1353,11 +1918,11 @@ class TaskManager:
         except sqlite3.Error as e:
             print(f"Database error while removing task list '{name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while removing task list '{name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1373,7 +1938,6 @@ class TaskManager:
         cursor = None
         try:
             cursor = self.conn.cursor()
-            print(f"DEBUG update_task_list: saving list={task_list.name} due={task_list.sort_by_due_datetime} estimate={task_list.sort_by_time_estimate}")
             cursor.execute(
                 "UPDATE task_lists SET `order` = ?, name = ?, description = ?, category = ?, notifications_enabled = ?, archived = ?, in_trash = ?, creation_date = ?, default_start_date = ?, default_due_datetime = ?, default_time_of_day_preference = ?, default_flexibility = ?, default_effort_level = ?, default_priority = ?, default_preferred_work_days = ?, consider_in_schedule = ?, sort_by_queue = ?, sort_by_stack = ?, sort_by_priority = ?, sort_by_due_datetime = ?, sort_by_tags = ?, sort_by_time_estimate = ? WHERE id = ?",
                 (
@@ -1402,13 +1966,12 @@ class TaskManager:
                     task_list.id
                 )
             )
-            print(f"DEBUG update_task_list: executed update, rowcount={cursor.rowcount}")
             if cursor.rowcount == 0:
                 print(
                     f"Warning: Task list '{task_list.name}' not found in database for update."
                 )
             else:
-                self.conn.commit()
+                self._commit()
                 # Update in-memory representation (find and update/replace)
                 found_in_memory = False
                 for i, tl in enumerate(self.task_lists):
@@ -1417,6 +1980,8 @@ class TaskManager:
                         self.task_lists[i] = task_list
                         found_in_memory = True
                         break
+                self._index_task_lists()  # The name may have changed
+                self._log_task_changes()  # Archived, trashed or recategorised
                 if found_in_memory:
                     # Also update within categories dictionary
                     self.categories = (
@@ -1430,11 +1995,11 @@ class TaskManager:
         except sqlite3.Error as e:
             print(f"Database error while updating task list '{task_list.name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while updating task list '{task_list.name}': {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
@@ -1450,7 +2015,7 @@ class TaskManager:
             )
             if cursor.rowcount == 0:
                 raise ValueError(f"Task list '{task_list_name}' does not exist.")
-            self.conn.commit()
+            self._commit()
 
             # Update the in-memory representation
             updated = False
@@ -1477,141 +2042,30 @@ class TaskManager:
         cursor = None
         try:
             cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO tasks (
-                    name,
-                    description,
-                    notes,
-                    tags,
-                    resources,
-                    start_date,
-                    due_datetime,
-                    added_date_time,
-                    last_completed_date,
-                    list_order,
-                    list_name,
-
-                    recurring,
-                    recur_every,
-                    recurrences,
-
-                    time_estimate,
-                    time_logged,
-                    count_required,
-                    count_completed,
-
-                    chunks,
-                    chunk_preference,
-                    min_chunk_size,
-                    max_chunk_size,
-
-                    subtasks,
-                    dependencies,
-
-                    status,
-                    flexibility,
-                    effort_level,
-                    priority,
-                    previous_priority,
-                    preferred_work_days,
-                    time_of_day_preference,
-
-                    include_in_schedule,
-                    global_weight
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    task.name,
-                    task.description,
-                    task.notes,
-                    safe_json_dumps(task.tags, "[]", "tags") if task.tags else None,
-                    (
-                        safe_json_dumps(task.resources, "[]", "resources")
-                        if task.resources
-                        else None
-                    ),
-                    task.start_date.strftime("%Y-%m-%d") if task.start_date else None,
-                    (
-                        task.due_datetime.strftime("%Y-%m-%d %H:%M")
-                        if task.due_datetime
-                        else None
-                    ),
-                    (
-                        task.added_date_time.strftime("%Y-%m-%d %H:%M")
-                        if task.added_date_time
-                        else None
-                    ),
-                    (
-                        task.last_completed_date.strftime("%Y-%m-%d %H:%M")
-                        if task.last_completed_date
-                        else None
-                    ),
-                    task.list_order,
-                    task.list_name,
-                    int(task.recurring),
-                    (
-                        safe_json_dumps(task.recur_every, "null", "recur_every")
-                        if task.recur_every
-                        else None
-                    ),
-                    task.recurrences,
-                    task.time_estimate,
-                    task.time_logged,
-                    task.count_required,
-                    task.count_completed,
-                    (
-                        safe_json_dumps(task.chunks, "[]", "chunks")
-                        if task.chunks
-                        else "[]"
-                    ),
-                    task.chunk_preference,
-                    task.min_chunk_size,
-                    task.max_chunk_size,
-                    (
-                        safe_json_dumps(task.subtasks, "[]", "subtasks")
-                        if task.subtasks
-                        else "[]"
-                    ),
-                    (
-                        safe_json_dumps(task.dependencies, "[]", "dependencies")
-                        if task.dependencies
-                        else None
-                    ),
-                    task.status,
-                    task.flexibility,
-                    task.effort_level,
-                    task.priority,
-                    task.previous_priority,
-                    safe_json_dumps(
-                        task.preferred_work_days, "[]", "preferred_work_days"
-                    ),
-                    safe_json_dumps(
-                        task.time_of_day_preference, "[]", "time_of_day_preference"
-                    ),
-                    int(task.include_in_schedule),
-                    task.global_weight,
-                ),
-            )
-            self.conn.commit()
+            cursor.execute(TASK_INSERT_SQL, encode_task_insert(task))
             task.id = cursor.lastrowid
-
-            # Add to the in-memory model
-            for task_list in self.task_lists:
-                if task_list.name == task.list_name:
-                    task_list.add_task_to_model_list(task)
-                    break
+            self._replace_chunks(cursor, [task])
+            self._sync_tags(cursor, [task])
+            self._commit()
+            task.mark_clean()
+            self._log_task_changes([task.id])
+
+            self._tasks_by_id[task.id] = task
+            # Add to the in-memory model; unloaded lists read it from the database
+            task_list = self._lists_by_name.get(task.list_name)
+            if task_list is not None and task_list.is_loaded():
+                task_list.add_task_to_model_list(task)
 
             print(f"Task '{task.name}' successfully added with ID: {task.id}")
         except sqlite3.Error as e:
             print(f"Database error while adding task '{task.name}': {e}")
             if self.conn:
-                self.conn.rollback()  # Rollback on error
+                self._rollback()  # Rollback on error
             # Optionally re-raise or handle
         except Exception as e:
             print(f"Unexpected error while adding task '{task.name}': {e}")
             if self.conn:
-                self.conn.rollback()  # Rollback on error
+                self._rollback()  # Rollback on error
             # Optionally re-raise or handle
         finally:
             if cursor:
@@ -1635,12 +2089,19 @@ class TaskManager:
             if cursor.rowcount == 0:
                 raise ValueError(f"Task with ID {task_id} does not exist.")
 
-            self.conn.commit()
-            list_name = task.list_name
-            for task_list in self.task_lists:
-                if task_list.name == list_name:
+            cursor.execute("DELETE FROM task_chunks WHERE task_id = ?", (task_id,))
+            cursor.execute("DELETE FROM task_tags WHERE task_id = ?", (task_id,))
+            self._pending_updates.pop(task_id, None)
+            self._commit()
+            self._tag_query_cache.clear()
+            self._log_task_changes([task_id])
+            removed = self._tasks_by_id.pop(task_id, None)
+            if removed is None and isinstance(task, Task):
+                removed = task
+            if removed is not None:
+                task_list = self._lists_by_name.get(removed.get_original_value("list_name"))
+                if task_list is not None and task_list.is_loaded():
                     task_list.tasks[:] = [t for t in task_list.tasks if t.id != task_id]
-                    break
             print(
                 f"Task '{task.name if isinstance(task, Task) else task_id}' successfully removed."
             )
@@ -1650,409 +2111,492 @@ class TaskManager:
         except Exception as e:
             print(f"Unexpected error while removing task: {e}")
 
-    def update_task(self, task: Task):
+    def add_tasks(self, tasks, notify=True):
+        """
+        Inserts ``tasks`` with a single executemany in one transaction and
+        returns their new ids, in order.
+
+        Ids are taken up front from the tasks AUTOINCREMENT counter so chunks
+        and tags can be written in bulk as well. Each in-memory task list is
+        extended once, and task_list_updated is emitted once if ``notify``.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
         cursor = None
-        try:
-            # Find old list name *before* starting transaction potentially
-            old_task = self.get_task(task.id)
-            old_list_name = old_task.list_name if old_task else None
+        with self.batch(notify=notify):
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT MAX(
+                        COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tasks'), 0),
+                        COALESCE((SELECT MAX(id) FROM tasks), 0)
+                    )
+                    """
+                )
+                next_id = cursor.fetchone()[0] + 1
+                for offset, task in enumerate(tasks):
+                    task.id = next_id + offset
 
-            cursor = self.conn.cursor()
+                cursor.executemany(
+                    TASK_INSERT_WITH_ID_SQL,
+                    [(task.id,) + encode_task_insert(task) for task in tasks],
+                )
+                self._replace_chunks(cursor, tasks)
+                self._sync_tags(cursor, tasks)
+                self._commit()
+            except sqlite3.Error as e:
+                print(f"Database error while adding {len(tasks)} tasks: {e}")
+                self._rollback()
+                for task in tasks:
+                    task.id = None
+                return []
+            finally:
+                if cursor:
+                    cursor.close()
+
+            tasks_by_list = {}
+            for task in tasks:
+                task.mark_clean()
+                self._tasks_by_id[task.id] = task
+                tasks_by_list.setdefault(task.list_name, []).append(task)
+            self._log_task_changes([task.id for task in tasks])
+            for list_name, list_tasks in tasks_by_list.items():
+                task_list = self._lists_by_name.get(list_name)
+                if task_list is not None and task_list.is_loaded():
+                    task_list.add_tasks_to_model_list(list_tasks)
+            print(f"{len(tasks)} tasks successfully added.")
+        return [task.id for task in tasks]
+
+    def update_tasks(self, tasks, notify=True):
+        """
+        Saves ``tasks`` in one transaction. Tasks with the same changed
+        columns share one executemany, and task_list_updated is emitted once
+        if ``notify``.
+        """
+        with self.batch(notify=notify):
+            for task in tasks:
+                self.update_task(task)
+
+    def remove_tasks(self, tasks, notify=True):
+        """
+        Removes several tasks (Task objects or ids) in one transaction and
+        returns how many rows were deleted. The in-memory task lists are
+        filtered once, and task_list_updated is emitted once if ``notify``.
+        """
+        task_ids = {task.id if isinstance(task, Task) else task for task in tasks}
+        task_ids.discard(None)
+        if not task_ids:
+            return 0
+        params = [(task_id,) for task_id in task_ids]
+        cursor = None
+        with self.batch(notify=notify):
+            try:
+                cursor = self.conn.cursor()
+                cursor.executemany("DELETE FROM tasks WHERE id = ?", params)
+                removed = cursor.rowcount
+                cursor.executemany("DELETE FROM task_chunks WHERE task_id = ?", params)
+                cursor.executemany("DELETE FROM task_tags WHERE task_id = ?", params)
+                self._commit()
+            except sqlite3.Error as e:
+                print(f"Database error while removing {len(task_ids)} tasks: {e}")
+                self._rollback()
+                return 0
+            finally:
+                if cursor:
+                    cursor.close()
+
+            self._forget_tasks(task_ids)
+            print(f"{removed} tasks successfully removed.")
+        return removed
+
+    def _forget_tasks(self, task_ids):
+        """Drops tasks whose rows were deleted from the identity map and loaded lists."""
+        list_names = set()
+        for task_id in task_ids:
+            self._pending_updates.pop(task_id, None)
+            task = self._tasks_by_id.pop(task_id, None)
+            if task is not None:
+                list_names.add(task.get_original_value("list_name"))
+        self._tag_query_cache.clear()
+        self._log_task_changes(task_ids)
+        # Loaded lists only hold tasks from the identity map
+        for list_name in list_names:
+            task_list = self._lists_by_name.get(list_name)
+            if task_list is not None and task_list.is_loaded():
+                task_list.tasks[:] = [t for t in task_list.tasks if t.id not in task_ids]
+
+    def update_task(self, task: Task):
+        if self.db.batch_depth:
+            # Written once, with the rest of the batch, when the batch exits
+            self._pending_updates[task.id] = task
+            return
+        self._write_tasks([task])
+
+    def _get_stored_list_names(self, cursor, task_ids):
+        """Returns {task id: list_name} as currently stored in the database."""
+        list_names = {}
+        for batch in iter_batches(list(task_ids)):
+            placeholders = ", ".join("?" for _ in batch)
             cursor.execute(
-                """
-                UPDATE tasks
-                SET
-                    name = ?,
-                    description = ?,
-                    notes = ?,
-                    tags = ?,
-                    resources = ?,
-                    start_date = ?,
-                    due_datetime = ?,
-                    added_date_time = ?,
-                    last_completed_date = ?,
-                    list_order = ?,
-                    list_name = ?,
-
-                    recurring = ?,
-                    recur_every = ?,
-                    recurrences = ?,
-
-                    time_estimate = ?,
-                    time_logged = ?,
-                    count_required = ?,
-                    count_completed = ?,
-
-                    chunks = ?,
-                    chunk_preference = ?,
-                    min_chunk_size = ?,
-                    max_chunk_size = ?,
-
-                    subtasks = ?,
-                    dependencies = ?,
-
-                    status = ?,
-                    flexibility = ?,
-                    effort_level = ?,
-                    priority = ?,
-                    previous_priority = ?,
-                    preferred_work_days = ?,
-                    time_of_day_preference = ?,
-
-                    include_in_schedule = ?,
-                    global_weight = ?
-
-                WHERE id = ?
-            """,
-                (
-                    task.name,
-                    task.description,
-                    task.notes,
-                    safe_json_dumps(task.tags, "[]", "tags") if task.tags else None,
-                    (
-                        safe_json_dumps(task.resources, "[]", "resources")
-                        if task.resources
-                        else None
-                    ),
-                    task.start_date.isoformat() if task.start_date else None,
-                    task.due_datetime.isoformat() if task.due_datetime else None,
-                    task.added_date_time.isoformat() if task.added_date_time else None,
-                    (
-                        task.last_completed_date.isoformat()
-                        if task.last_completed_date
-                        else None
-                    ),
-                    task.list_order,
-                    task.list_name,
-                    int(task.recurring),
-                    (
-                        safe_json_dumps(task.recur_every, "null", "recur_every")
-                        if task.recur_every
-                        else None
-                    ),
-                    task.recurrences,
-                    task.time_estimate,
-                    task.time_logged,
-                    task.count_required,
-                    task.count_completed,
-                    (
-                        safe_json_dumps(task.chunks, "[]", "chunks")
-                        if task.chunks
-                        else "[]"
-                    ),
-                    task.chunk_preference,
-                    task.min_chunk_size,
-                    task.max_chunk_size,
-                    (
-                        safe_json_dumps(task.subtasks, "[]", "subtasks")
-                        if task.subtasks
-                        else "[]"
-                    ),
-                    (
-                        safe_json_dumps(task.dependencies, "[]", "dependencies")
-                        if task.dependencies
-                        else None
-                    ),
-                    task.status,
-                    task.flexibility,
-                    task.effort_level,
-                    task.priority,
-                    task.previous_priority,
-                    safe_json_dumps(
-                        task.preferred_work_days, "[]", "preferred_work_days"
-                    ),
-                    safe_json_dumps(
-                        task.time_of_day_preference, "[]", "time_of_day_preference"
-                    ),
-                    int(task.include_in_schedule),
-                    task.global_weight,
-                    task.id,
-                ),
+                f"SELECT id, list_name FROM tasks WHERE id IN ({placeholders})", batch
             )
+            list_names.update((row["id"], row["list_name"]) for row in cursor.fetchall())
+        return list_names
 
-            if cursor.rowcount == 0:
-                # Handle case where task ID doesn't exist - maybe log warning
-                print(
-                    f"Warning: Task with ID {task.id} not found in database during update."
-                )
-                # Decide if this should be a fatal error or just a warning
-                # raise ValueError(f"Task with ID {task.id} does not exist.")
-            else:
-                self.conn.commit()  # Commit only if update was successful
+    def _write_tasks(self, tasks):
+        """
+        Writes ``tasks`` in one transaction and relinks them in memory.
 
-            # Update in-memory list references only after successful DB commit
-            if cursor.rowcount > 0:
-                if old_list_name and old_list_name != task.list_name:
-                    # Remove from old list
-                    old_task_list = next(
-                        (tl for tl in self.task_lists if tl.name == old_list_name), None
-                    )
-                    if old_task_list:
-                        old_task_list.tasks[:] = [
-                            t for t in old_task_list.tasks if t.id != task.id
-                        ]
-
-                    # Add to new list
-                    new_task_list = next(
-                        (tl for tl in self.task_lists if tl.name == task.list_name),
-                        None,
-                    )
-                    if new_task_list:
-                        # Ensure the task object itself is updated if necessary
-                        # (though it should be the same object passed in)
-                        new_task_list.add_task_to_model_list(
-                            task
-                        )  # Use the method to handle order etc.
+        Tracked tasks (see Task.get_changed_fields) only get their changed
+        columns written, and nothing at all if unchanged; their old list name
+        comes from the recorded original value. Untracked tasks get a full row
+        rewrite, with the old list name read from the database. Returns False
+        if the write failed and was rolled back.
+        """
+        cursor = None
+        task = tasks[0]
+        try:
+            cursor = self.conn.cursor()
+            changes = {id(t): t.get_changed_fields() for t in tasks}
+            untracked_ids = [
+                t.id for t in tasks if changes[id(t)] is None and t.id is not None
+            ]
+            # Old list names of untracked tasks, read *before* rows are rewritten
+            old_list_names = self._get_stored_list_names(cursor, untracked_ids)
+
+            # Tasks with the same set of changed columns share one executemany
+            groups = {}
+            for task in tasks:
+                changed = changes[id(task)]
+                if changed is None:
+                    old_list_name = old_list_names.get(task.id)
+                    changed = set(TASK_FIELDS + DERIVED_COLUMNS)
+                elif not changed:
+                    continue  # Nothing to write
                 else:
-                    # Update within the same list
-                    current_list = next(
-                        (tl for tl in self.task_lists if tl.name == task.list_name),
-                        None,
+                    old_list_name = task.get_original_value("list_name")
+                    if not changed.isdisjoint(RECURRENCE_COLUMNS):
+                        changed = changed | set(DERIVED_COLUMNS)
+                columns = order_columns(changed - {"chunks"})
+                groups.setdefault(columns, []).append((task, old_list_name, changed))
+
+            updated = []
+            for columns, group in groups.items():
+                if columns:
+                    assignments = ", ".join(f"{name} = ?" for name in columns)
+                    cursor.executemany(
+                        f"UPDATE tasks SET {assignments} WHERE id = ?",
+                        [
+                            encode_task_columns(task, columns) + (task.id,)
+                            for task, _, _ in group
+                        ],
                     )
-                    if current_list:
-                        for i, t in enumerate(current_list.tasks):
-                            if t.id == task.id:
-                                current_list.tasks[i] = (
-                                    task  # Replace the old task object
+                    if cursor.rowcount < len(group):
+                        existing = self._get_stored_list_names(
+                            cursor, [task.id for task, _, _ in group]
+                        )
+                        for task, _, _ in group:
+                            if task.id not in existing:
+                                # Handle case where task ID doesn't exist - maybe log warning
+                                print(
+                                    f"Warning: Task with ID {task.id} not found in database during update."
                                 )
-                                break
+                        group = [entry for entry in group if entry[0].id in existing]
+                updated.extend(group)
+
+            chunk_tasks = [task for task, _, changed in updated if "chunks" in changed]
+            if chunk_tasks:
+                self._replace_chunks(cursor, chunk_tasks)
+            tag_tasks = [task for task, _, changed in updated if "tags" in changed]
+            if tag_tasks:
+                self._sync_tags(cursor, tag_tasks)
+
+            if updated:
+                self._commit()  # Commit only if an update was successful
+
+            # Update in-memory list references only after successful DB commit
+            for task, _, _ in updated:
+                task.mark_clean()
+            if updated:
+                self._log_task_changes([task.id for task, _, _ in updated])
+            self._relink_tasks(
+                [(task, old_list_name) for task, old_list_name, _ in updated]
+            )
+            return True
 
         except sqlite3.Error as e:
             print(f"Database error while updating task with ID {task.id}: {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         except Exception as e:
             print(f"Unexpected error while updating task with ID {task.id}: {e}")
             if self.conn:
-                self.conn.rollback()
+                self._rollback()
         finally:
             if cursor:
                 cursor.close()
+        return False
+
+    def _relink_tasks(self, entries):
+        """
+        Moves or replaces written tasks in the in-memory task lists, touching
+        each affected list once. ``entries`` are (task, old_list_name) pairs.
+        Lists whose tasks are not loaded are skipped; they read the written
+        rows when loaded.
+        """
+        lists_by_name = {
+            name: tl for name, tl in self._lists_by_name.items() if tl.is_loaded()
+        }
+        moved_out = {}
+        moved_in = {}
+        replaced = {}
+        for task, old_list_name in entries:
+            if old_list_name and old_list_name != task.list_name:
+                moved_out.setdefault(old_list_name, set()).add(task.id)
+                moved_in.setdefault(task.list_name, []).append(task)
+            else:
+                replaced.setdefault(task.list_name, {})[task.id] = task
+
+        for list_name, task_ids in moved_out.items():
+            task_list = lists_by_name.get(list_name)
+            if task_list:
+                task_list.tasks[:] = [t for t in task_list.tasks if t.id not in task_ids]
+        for list_name, tasks in moved_in.items():
+            task_list = lists_by_name.get(list_name)
+            if task_list:
+                task_list.add_tasks_to_model_list(tasks)
+        for list_name, tasks_by_id in replaced.items():
+            task_list = lists_by_name.get(list_name)
+            if task_list:
+                for i, t in enumerate(task_list.tasks):
+                    if t.id in tasks_by_id:
+                        task_list.tasks[i] = tasks_by_id[t.id]  # Replace the old task object
 
     def get_task(self, task_id):
-        cursor = None
+        """Returns the in-memory Task with ``task_id`` (see find_task) or None."""
+        return self.find_task(task_id)
+
+    def find_task(self, task_id):
+        """
+        Returns the Task object with ``task_id`` from its in-memory task list,
+        loading only that list if needed, or None.
+        """
+        task = self._tasks_by_id.get(task_id)
+        if task is not None:
+            return task
+        cursor = self.conn.cursor()
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-            task_row = cursor.fetchone()
+            cursor.execute("SELECT list_name FROM tasks WHERE id = ?", (task_id,))
+            row = cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Error looking up task ID {task_id}: {e}")
+            return None
+        finally:
+            cursor.close()
+        if not row:
+            return None
+        task_list = self._lists_by_name.get(row["list_name"])
+        if task_list is None:
+            return None
+        self.hydrate_task_lists([task_list])
+        return self._tasks_by_id.get(task_id)
 
-            if not task_row:
-                return None
+    def update_chunk(self, task: Task, task_chunk: TaskChunk):
+        """
+        Saves one chunk of ``task`` from a TaskChunk object.
 
-            task_data = dict(task_row)
-            task_data["tags"] = (
-                safe_json_loads(task_data["tags"], [], "tags", f"for task ID {task_id}")
-                if task_data.get("tags")
-                else []
-            )
-            task_data["resources"] = (
-                safe_json_loads(
-                    task_data["resources"], [], "resources", f"for task ID {task_id}"
-                )
-                if task_data.get("resources")
-                else []
-            )
-            task_data["recur_every"] = (
-                safe_json_loads(
-                    task_data["recur_every"],
-                    None,
-                    "recur_every",
-                    f"for task ID {task_id}",
-                )
-                if task_data.get("recur_every")
-                else None
-            )
-            task_data["subtasks"] = (
-                safe_json_loads(
-                    task_data["subtasks"], [], "subtasks", f"for task ID {task_id}"
-                )
-                if task_data.get("subtasks")
-                else []
-            )
-            task_data["dependencies"] = (
-                safe_json_loads(
-                    task_data["dependencies"],
-                    [],
-                    "dependencies",
-                    f"for task ID {task_id}",
-                )
-                if task_data.get("dependencies")
-                else []
-            )
-            task_data["chunks"] = (
-                safe_json_loads(
-                    task_data["chunks"], [], "chunks", f"for task ID {task_id}"
-                )
-                if task_data.get("chunks")
-                else []
+        Only the chunk's row is rewritten, plus the task's time_logged and
+        count_completed when completing the chunk changes them. Returns True if
+        the chunk was found.
+        """
+        totals = (task.time_logged, task.count_completed)
+        # Fields with unsaved edits from elsewhere stay dirty after this write
+        pending = set(getattr(task, "_changes", None) or ())
+        if not task.update_chunk_obj(task_chunk):
+            return False
+
+        index = task._chunk_index(task_chunk.id)
+        row = encode_chunk_row(task.id, index, task.chunks[index])
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                UPDATE task_chunks
+                SET position = ?, size = ?, type = ?, unit = ?, status = ?,
+                    time_block = ?, date = ?, is_recurring = ?
+                WHERE id = ? AND task_id = ?
+                """,
+                row[2:] + (row[0], row[1]),
             )
-            task_data["preferred_work_days"] = (
-                safe_json_loads(
-                    task_data["preferred_work_days"],
-                    [],
-                    "preferred_work_days",
-                    f"for task ID {task_id}",
+            if cursor.rowcount == 0:
+                # Chunk only existed in memory so far
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO task_chunks (
+                        id, task_id, position, size, type, unit, status, time_block, date, is_recurring
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    row,
                 )
-                if task_data.get("preferred_work_days")
-                else []
-            )
-            task_data["time_of_day_preference"] = (
-                safe_json_loads(
-                    task_data["time_of_day_preference"],
-                    [],
-                    "time_of_day_preference",
-                    f"for task ID {task_id}",
+            if (task.time_logged, task.count_completed) != totals:
+                cursor.execute(
+                    "UPDATE tasks SET time_logged = ?, count_completed = ? WHERE id = ?",
+                    (task.time_logged, task.count_completed, task.id),
                 )
-                if task_data.get("time_of_day_preference")
-                else []
-            )
-
-            return Task(**task_data)
-
+            self._commit()
+            task.mark_clean(*({"chunks", "time_logged", "count_completed"} - pending))
+            # Chunks and logged totals feed the schedule and task weights
+            self._log_task_changes([task.id])
+            return True
         except sqlite3.Error as e:
-            print(f"Error fetching task by ID {task_id}: {e}")
-            return None
+            print(f"Database error while updating chunk {task_chunk.id}: {e}")
+            self._rollback()
+            return False
         finally:
             if cursor:
                 cursor.close()
 
-    def manage_recurring_tasks(self):
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM tasks WHERE recurring = 1")
-            rows = cursor.fetchall()
+    def update_chunk_status(self, task: Task, chunk_id, status):
+        """Sets the status of one chunk, e.g. 'completed' or 'active'."""
+        index = task._chunk_index(chunk_id)
+        if index is None:
+            return False
+        chunk_data = task.chunks[index]
+        task_chunk = TaskChunk(
+            id=chunk_id,
+            task=task,
+            chunk_type=chunk_data.get("type"),
+            unit=chunk_data.get("unit"),
+            size=chunk_data.get("size"),
+            timeblock=chunk_data.get("time_block"),
+            date=chunk_data.get("date"),
+            is_recurring=chunk_data.get("is_recurring", False),
+            status=status,
+        )
+        return self.update_chunk(task, task_chunk)
 
-            rollover_statuses = {"Completed", "Failed", "Skipped"}
-            weekday_mapping = {
-                "mon": 0,
-                "monday": 0,
-                "tue": 1,
-                "tuesday": 1,
-                "wed": 2,
-                "wednesday": 2,
-                "thu": 3,
-                "thursday": 3,
-                "fri": 4,
-                "friday": 4,
-                "sat": 5,
-                "saturday": 5,
-                "sun": 6,
-                "sunday": 6,
-            }
+    def delete_chunk(self, task: Task, task_chunk: TaskChunk):
+        """
+        Deletes one chunk of ``task`` with a single-row delete, adjusting the
+        task's logged totals if the chunk was completed.
+        """
+        totals = (task.time_logged, task.count_completed)
+        # Fields with unsaved edits from elsewhere stay dirty after this write
+        pending = set(getattr(task, "_changes", None) or ())
+        if not task.delete_chunk(task_chunk):
+            return False
 
-            for row in rows:
-                task_data = dict(row)
-                task_data["tags"] = (
-                    safe_json_loads(
-                        task_data["tags"],
-                        [],
-                        "tags",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("tags")
-                    else []
-                )
-                task_data["resources"] = (
-                    safe_json_loads(
-                        task_data["resources"],
-                        [],
-                        "resources",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("resources")
-                    else []
-                )
-                task_data["recur_every"] = (
-                    safe_json_loads(
-                        task_data["recur_every"],
-                        None,
-                        "recur_every",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("recur_every")
-                    else None
-                )
-                task_data["subtasks"] = (
-                    safe_json_loads(
-                        task_data["subtasks"],
-                        [],
-                        "subtasks",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("subtasks")
-                    else []
-                )
-                task_data["dependencies"] = (
-                    safe_json_loads(
-                        task_data["dependencies"],
-                        [],
-                        "dependencies",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("dependencies")
-                    else []
-                )
-                task_data["chunks"] = (
-                    safe_json_loads(
-                        task_data["chunks"],
-                        [],
-                        "chunks",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("chunks")
-                    else []
-                )
-                task_data["preferred_work_days"] = (
-                    safe_json_loads(
-                        task_data["preferred_work_days"],
-                        [],
-                        "preferred_work_days",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("preferred_work_days")
-                    else []
-                )
-                task_data["time_of_day_preference"] = (
-                    safe_json_loads(
-                        task_data["time_of_day_preference"],
-                        [],
-                        "time_of_day_preference",
-                        f"while managing recurring task '{task_data.get('name', 'unknown')}'",
-                    )
-                    if task_data.get("time_of_day_preference")
-                    else []
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "DELETE FROM task_chunks WHERE id = ? AND task_id = ?",
+                (task_chunk.id, task.id),
+            )
+            if (task.time_logged, task.count_completed) != totals:
+                cursor.execute(
+                    "UPDATE tasks SET time_logged = ?, count_completed = ? WHERE id = ?",
+                    (task.time_logged, task.count_completed, task.id),
                 )
+            self._commit()
+            task.mark_clean(*({"chunks", "time_logged", "count_completed"} - pending))
+            # Chunks and logged totals feed the schedule and task weights
+            self._log_task_changes([task.id])
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error while deleting chunk {task_chunk.id}: {e}")
+            self._rollback()
+            return False
+        finally:
+            if cursor:
+                cursor.close()
 
-                task = Task(**task_data)
-
-                if task.status not in rollover_statuses:
-                    continue
-
-                now = datetime.now()
-                old_due = task.due_datetime
-
-                # Handle recurrence calculation
-                if isinstance(task.recur_every, int):
-                    anchor = old_due or task.last_completed_date or now
-                    next_due = anchor + timedelta(days=task.recur_every)
+    def get_chunks(
+        self, task_id=None, start_date=None, end_date=None, statuses=None, task_ids=None
+    ):
+        """
+        Returns chunk dicts (with an extra ``task_id`` key) straight from the
+        task_chunks table, ordered by task and position.
+
+        :param task_id: Only chunks of this task.
+        :param start_date: Only chunks dated on or after this date.
+        :param end_date: Only chunks dated on or before this date.
+        :param statuses: Only chunks whose status is in this iterable.
+        :param task_ids: Only chunks of the tasks with these ids.
+        """
+        conditions = []
+        params = []
+        if task_id is not None:
+            conditions.append("task_id = ?")
+            params.append(task_id)
+        if statuses:
+            statuses = list(statuses)
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date.strftime("%Y-%m-%d"))
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(end_date.strftime("%Y-%m-%d"))
+
+        if task_ids is None:
+            batches = [()]
+        else:
+            batches = list(iter_batches(sorted(set(task_ids))))
+            conditions.append("task_id IN ({})")
 
-                elif isinstance(task.recur_every, list):
-                    today = now.date()
-                    today_weekday = today.weekday()
-                    days_to_next = min(
-                        (weekday_mapping[d.lower()] - today_weekday) % 7
-                        for d in task.recur_every
-                    )
-                    start_date = old_due.date() if old_due else today
-                    next_due = datetime.combine(
-                        start_date + timedelta(days=days_to_next),
-                        (old_due or now).time(),
-                    )
+        query = "SELECT * FROM task_chunks"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY task_id, position"
 
-                else:
-                    continue
+        chunks = []
+        cursor = self.conn.cursor()
+        try:
+            for batch in batches:
+                cursor.execute(
+                    query.format(", ".join("?" for _ in batch)), params + list(batch)
+                )
+                for row in cursor:
+                    chunk = decode_chunk_row(row)
+                    chunk["task_id"] = row["task_id"]
+                    chunks.append(chunk)
+        except sqlite3.Error as e:
+            print(f"Database error while fetching chunks: {e}")
+        finally:
+            cursor.close()
+        return chunks
 
-                if next_due <= now:
+    def manage_recurring_tasks(self, now=None):
+        """
+        Rolls over every finished recurring task whose next_due has passed:
+        it is reopened, due at that occurrence. Only rows with a stored
+        next_due <= ``now`` are read, so this is cheap enough to run
+        periodically. Returns how many tasks rolled over.
+        """
+        now = now or datetime.now()
+        rolled = 0
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"{self.row_codec.select_sql} WHERE next_due <= ?",
+                (to_epoch_seconds(now),),
+            )
+            tasks = self._tasks_from_rows(cursor.fetchall())
+
+            # All rollovers are written in one transaction with one notification
+            with self.batch():
+                for task in tasks:
+                    # The in-memory task may have changed since it was saved
+                    next_due = task.next_due
+                    if next_due is None or next_due > now:
+                        continue
                     task.status = "Not Started"
                     task.time_logged = 0 if task.time_estimate else task.time_logged
                     task.count_completed = (
@@ -2062,6 +2606,7 @@ class TaskManager:
                     task.due_datetime = next_due
 
                     self.update_task(task)
+                    rolled += 1
 
         except sqlite3.Error as e:
             print(f"Database error while managing recurring tasks: {e}")
@@ -2070,19 +2615,520 @@ class TaskManager:
         finally:
             if cursor:
                 cursor.close()
+        return rolled
 
     def get_task_list_categories(self):
         return list(self.categories.keys())
 
     def get_all_active_task_tags(self):
-        tags = set()
-        for task_list in self.task_lists:
-            if not task_list.archived and not task_list.in_trash:
-                for task in task_list.tasks:
-                    tags.update(task.tags)
-        return list(tags)
+        return self.get_active_tags()
+
+    def _query_tags(self, query, params=()):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while querying tags: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def get_task_ids_by_tag(self, tag):
+        rows = self._query_tags("SELECT task_id FROM task_tags WHERE tag = ?", (tag,))
+        return [row["task_id"] for row in rows]
+
+    def get_tasks_by_tag(self, tag):
+        """
+        Returns the in-memory Task objects carrying ``tag``. Only the lists
+        that contain such tasks are loaded.
+        """
+        rows = self._query_tags(
+            """
+            SELECT t.id, t.list_name
+            FROM task_tags tt
+            JOIN tasks t ON t.id = tt.task_id
+            WHERE tt.tag = ?
+            """,
+            (tag,),
+        )
+        return self._in_memory_tasks(rows)
+
+    def _in_memory_tasks(self, rows):
+        """
+        Returns the in-memory Task objects for (id, list_name) rows, in row
+        order. Only the lists that hold them are loaded.
+        """
+        if not rows:
+            return []
+        list_names = {row["list_name"] for row in rows}
+        self.hydrate_task_lists(
+            [self._lists_by_name[name] for name in list_names if name in self._lists_by_name]
+        )
+        tasks = [self._tasks_by_id.get(row["id"]) for row in rows]
+        return [task for task in tasks if task is not None]
+
+    def get_task_ids_with_any_tag(self, tags):
+        """
+        Returns a frozenset of ids of tasks carrying at least one of ``tags``.
+        Results are cached per tag set until a task's tags change, so block
+        eligibility checks during scheduling are set lookups.
+        """
+        key = frozenset(tags)
+        task_ids = self._tag_query_cache.get(key)
+        if task_ids is None:
+            if key:
+                placeholders = ", ".join("?" for _ in key)
+                rows = self._query_tags(
+                    f"SELECT DISTINCT task_id FROM task_tags WHERE tag IN ({placeholders})",
+                    tuple(key),
+                )
+                task_ids = frozenset(row["task_id"] for row in rows)
+            else:
+                task_ids = frozenset()
+            self._tag_query_cache[key] = task_ids
+        return task_ids
+
+    def get_tag_counts(self, active_only=False):
+        """
+        Returns {tag: number of tasks}. With ``active_only`` only tasks in
+        lists that are neither archived nor in the trash are counted.
+        """
+        if active_only:
+            rows = self._query_tags(
+                """
+                SELECT tt.tag, COUNT(*) AS task_count
+                FROM task_tags tt
+                JOIN tasks t ON t.id = tt.task_id
+                JOIN task_lists tl ON tl.name = t.list_name
+                WHERE tl.archived = 0 AND tl.in_trash = 0
+                GROUP BY tt.tag
+                """
+            )
+        else:
+            rows = self._query_tags(
+                "SELECT tag, COUNT(*) AS task_count FROM task_tags GROUP BY tag"
+            )
+        return {row["tag"]: row["task_count"] for row in rows}
+
+    def get_active_tags(self):
+        """Returns the tags used in lists that are neither archived nor in the trash."""
+        return sorted(self.get_tag_counts(active_only=True))
+
+    def get_task_list_tags(self, list_name):
+        rows = self._query_tags(
+            """
+            SELECT DISTINCT tt.tag
+            FROM task_tags tt
+            JOIN tasks t ON t.id = tt.task_id
+            WHERE t.list_name = ?
+            ORDER BY tt.tag
+            """,
+            (list_name,),
+        )
+        return [row["tag"] for row in rows]
+
+    def _archive_copy_columns(self):
+        """Columns copied between tasks and archived_tasks, chunks aside."""
+        return ", ".join(
+            name for name in self.archive_codec.columns if name not in ("chunks", "archived_at")
+        )
+
+    def archive_tasks(self, tasks, notify=True):
+        """
+        Moves ``tasks`` (Task objects or ids) into archived_tasks in one
+        transaction and returns how many were archived. Their chunks are
+        embedded in the archived row; chunk, tag and search rows go away with
+        the tasks row, as do the in-memory Task objects.
+        """
+        task_ids = {task.id if isinstance(task, Task) else task for task in tasks}
+        task_ids.discard(None)
+        if not task_ids or self.archive_codec is None:
+            return 0
+        columns = self._archive_copy_columns()
+        archived_at = to_epoch_seconds(datetime.now())
+        chunks_by_task = {}
+        archived = 0
+        cursor = None
+        with self.batch(notify=notify):
+            try:
+                cursor = self.conn.cursor()
+                for batch in iter_batches(list(task_ids)):
+                    placeholders = ", ".join("?" for _ in batch)
+                    cursor.execute(
+                        f"SELECT * FROM task_chunks WHERE task_id IN ({placeholders}) "
+                        "ORDER BY task_id, position",
+                        batch,
+                    )
+                    for row in cursor.fetchall():
+                        chunks_by_task.setdefault(row["task_id"], []).append(
+                            decode_chunk_row(row)
+                        )
+                    cursor.execute(
+                        f"""
+                        INSERT OR REPLACE INTO archived_tasks ({columns}, chunks, archived_at)
+                        SELECT {columns}, '[]', ? FROM tasks WHERE id IN ({placeholders})
+                        """,
+                        (archived_at,) + batch,
+                    )
+                    archived += cursor.rowcount
+                    for table, key in (
+                        ("task_chunks", "task_id"),
+                        ("task_tags", "task_id"),
+                        ("tasks", "id"),
+                    ):
+                        cursor.execute(
+                            f"DELETE FROM {table} WHERE {key} IN ({placeholders})", batch
+                        )
+                cursor.executemany(
+                    "UPDATE archived_tasks SET chunks = ? WHERE id = ?",
+                    [
+                        (safe_json_dumps(chunks, "[]", "chunks"), task_id)
+                        for task_id, chunks in chunks_by_task.items()
+                    ],
+                )
+                self._commit()
+            except sqlite3.Error as e:
+                print(f"Database error while archiving {len(task_ids)} tasks: {e}")
+                self._rollback()
+                return 0
+            finally:
+                if cursor:
+                    cursor.close()
+            self._forget_tasks(task_ids)
+        if archived:
+            print(f"{archived} tasks moved to the archive.")
+        return archived
+
+    def archive_completed_tasks(self, older_than_days=None, notify=True):
+        """
+        Archives non-recurring completed or failed tasks that finished (or,
+        lacking a completion date, were due or added) more than
+        ``older_than_days`` days ago, by default ``self.archive_after_days``.
+        Recurring tasks are never archived since they roll over.
+        """
+        days = self.archive_after_days if older_than_days is None else older_than_days
+        if days is None or self.archive_codec is None:
+            return 0
+        cutoff = to_epoch_seconds(datetime.now() - timedelta(days=days))
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT id FROM tasks
+                WHERE status IN ('Completed', 'Failed') AND recurring = 0
+                  AND COALESCE(last_completed_date, due_datetime, added_date_time) < ?
+                """,
+                (cutoff,),
+            )
+            task_ids = [row["id"] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Database error while finding tasks to archive: {e}")
+            return 0
+        finally:
+            cursor.close()
+        return self.archive_tasks(task_ids, notify=notify)
+
+    def get_archived_tasks(self, search=None, list_name=None, limit=None):
+        """
+        Returns archived tasks as detached Task objects, most recently
+        completed first. ``search`` matches name, description, notes and
+        subtasks as a substring. Each task has an ``archived_at`` datetime.
+        Use restore_archived_task to bring one back before editing it.
+        """
+        if self.archive_codec is None:
+            return []
+        conditions = []
+        params = []
+        if search:
+            conditions.append(
+                "(name LIKE ? OR description LIKE ? OR notes LIKE ? OR subtasks LIKE ?)"
+            )
+            params.extend([f"%{search.strip()}%"] * 4)
+        if list_name is not None:
+            conditions.append("list_name = ?")
+            params.append(list_name)
+        sql = self.archive_codec.select_sql
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY last_completed_date DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(sql, params)
+            return [Task(**self.archive_codec.decode(row)) for row in cursor]
+        except sqlite3.Error as e:
+            print(f"Database error while reading archived tasks: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def _history_select(self, table, list_name, search, after, limit):
+        """
+        Returns the SQL and params selecting the first ``limit`` history rows
+        of ``table`` after ``after``, newest first, for get_history_page.
+        """
+        conditions = ["status = 'Completed'"]
+        params = []
+        if list_name is not None:
+            conditions.append("list_name = ?")
+            params.append(list_name)
+        if search:
+            if table == "tasks" and self.has_search_index:
+                match = self._fts_query(search)
+                if match:
+                    conditions.append(
+                        "id IN (SELECT rowid FROM task_search WHERE task_search MATCH ?)"
+                    )
+                    params.append(match)
+                else:
+                    conditions.append("0")
+            else:
+                conditions.append(
+                    "(name LIKE ? OR description LIKE ? OR notes LIKE ? OR subtasks LIKE ?)"
+                )
+                params.extend([f"%{search.strip()}%"] * 4)
+        if after is not None:
+            completed, task_id = after
+            if completed is None:
+                # Undated completions sort last
+                conditions.append("last_completed_date IS NULL AND id < ?")
+                params.append(task_id)
+            else:
+                conditions.append(
+                    "(last_completed_date < ? OR (last_completed_date = ? AND id < ?) "
+                    "OR last_completed_date IS NULL)"
+                )
+                params.extend([completed, completed, task_id])
+        sql = (
+            f"SELECT id, list_name, last_completed_date, {int(table != 'tasks')} AS archived "
+            f"FROM {table} WHERE {' AND '.join(conditions)} "
+            "ORDER BY last_completed_date DESC, id DESC LIMIT ?"
+        )
+        params.append(limit)
+        return sql, params
+
+    def get_history_page(self, limit=50, after=None, list_name=None, search=None):
+        """
+        Returns one page of completed tasks, newest completion first, as
+        ``(tasks, next_page)``. Pass ``next_page`` back as ``after`` for the
+        following page; it is None after the last one.
+
+        Pages are keyset-paginated on (last_completed_date, id) over both the
+        live tasks and the archive, so each page costs the same however far
+        back it is. Live tasks are the in-memory instances; archived ones are
+        detached (see get_archived_tasks). ``search`` uses the full-text index
+        for live tasks and a substring match in the archive.
+        """
+        # One extra row tells whether a next page exists
+        selects = [self._history_select("tasks", list_name, search, after, limit + 1)]
+        if self.archive_codec is not None:
+            selects.append(
+                self._history_select("archived_tasks", list_name, search, after, limit + 1)
+            )
+        sql = " UNION ALL ".join(f"SELECT * FROM ({select})" for select, _ in selects)
+        sql += " ORDER BY last_completed_date DESC, id DESC LIMIT ?"
+        params = [param for _, select_params in selects for param in select_params]
+        params.append(limit + 1)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while reading task history: {e}")
+            return [], None
+        finally:
+            cursor.close()
+
+        next_page = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_page = (rows[-1]["last_completed_date"], rows[-1]["id"])
+
+        live = {
+            task.id: task
+            for task in self._in_memory_tasks([row for row in rows if not row["archived"]])
+        }
+        archived = {}
+        archived_ids = [row["id"] for row in rows if row["archived"]]
+        if archived_ids:
+            placeholders = ", ".join("?" for _ in archived_ids)
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            try:
+                cursor.execute(
+                    f"{self.archive_codec.select_sql} WHERE id IN ({placeholders})",
+                    archived_ids,
+                )
+                for row in cursor:
+                    task = Task(**self.archive_codec.decode(row))
+                    archived[task.id] = task
+            finally:
+                cursor.close()
+        tasks = [
+            (archived if row["archived"] else live).get(row["id"]) for row in rows
+        ]
+        return [task for task in tasks if task is not None], next_page
+
+    def is_archived(self, task_id):
+        if self.archive_codec is None:
+            return False
+        row = self.conn.execute(
+            "SELECT 1 FROM archived_tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return row is not None
+
+    def restore_archived_task(self, task_id):
+        """
+        Moves an archived task back into tasks, with its chunks and tags, and
+        returns its in-memory Task. Returns None if it is not archived or its
+        task list no longer exists.
+        """
+        if self.archive_codec is None:
+            return None
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT list_name, tags, chunks FROM archived_tasks WHERE id = ?", (task_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            task_list = self._lists_by_name.get(row["list_name"])
+            if task_list is None:
+                print(f"Cannot restore task {task_id}: list '{row['list_name']}' no longer exists.")
+                return None
+            context = f"while restoring archived task {task_id}"
+            chunks = safe_json_loads(row["chunks"], [], "chunks", context) or []
+            tags = safe_json_loads(row["tags"], [], "tags", context)
+
+            with self.batch():
+                columns = self._archive_copy_columns()
+                cursor.execute(
+                    f"INSERT INTO tasks ({columns}) "
+                    f"SELECT {columns} FROM archived_tasks WHERE id = ?",
+                    (task_id,),
+                )
+                cursor.execute(
+                    f"SELECT {', '.join(RECURRENCE_COLUMNS)} FROM tasks WHERE id = ?",
+                    (task_id,),
+                )
+                cursor.execute(
+                    "UPDATE tasks SET next_due = ? WHERE id = ?",
+                    (stored_next_due(tuple(cursor.fetchone())), task_id),
+                )
+                self._insert_chunk_rows(
+                    cursor,
+                    [
+                        encode_chunk_row(task_id, position, chunk)
+                        for position, chunk in enumerate(chunks)
+                        if isinstance(chunk, dict)
+                    ],
+                )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO task_tags (task_id, tag) VALUES (?, ?)",
+                    [(task_id, tag) for tag in normalize_tags(tags)],
+                )
+                cursor.execute("DELETE FROM archived_tasks WHERE id = ?", (task_id,))
+                self._commit()
+                self._tag_query_cache.clear()
+                self._log_task_changes([task_id])
+        except sqlite3.Error as e:
+            print(f"Database error while restoring archived task {task_id}: {e}")
+            self._rollback()
+            return None
+        finally:
+            cursor.close()
+
+        if not task_list.is_loaded():
+            return self.find_task(task_id)  # Loads the list, restored row included
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(f"{self.row_codec.select_sql} WHERE id = ?", (task_id,))
+            task = self._tasks_from_rows(cursor.fetchall())[0]
+        finally:
+            cursor.close()
+        task_list.add_task_to_model_list(task)
+        return task
+
+    @staticmethod
+    def _fts_query(text):
+        """Turns free text into an FTS5 query matching every word as a prefix."""
+        words = re.findall(r"\w+", text or "")
+        return " ".join(f'"{word}"*' for word in words)
+
+    def _search_rows(self, select, text, list_name=None, limit=None, ranked=True):
+        """
+        Runs ``select`` (columns of tasks ``t``) over the tasks matching
+        ``text``, best match first if ``ranked``. Without the FTS5 index this falls back
+        to a LIKE scan in storage order.
+        """
+        params = []
+        if self.has_search_index:
+            match = self._fts_query(text)
+            if not match:
+                return []
+            sql = (
+                f"SELECT {select} FROM task_search s JOIN tasks t ON t.id = s.rowid "
+                "WHERE task_search MATCH ?"
+            )
+            params.append(match)
+        else:
+            pattern = f"%{text.strip()}%"
+            sql = (
+                f"SELECT {select} FROM tasks t WHERE (t.name LIKE ? OR t.description LIKE ? "
+                "OR t.notes LIKE ? OR t.subtasks LIKE ?)"
+            )
+            params.extend([pattern] * 4)
+        if list_name is not None:
+            sql += " AND t.list_name = ?"
+            params.append(list_name)
+        if ranked and self.has_search_index:
+            sql += " ORDER BY s.rank"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while searching tasks for {text!r}: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def search(self, query, limit=50, list_name=None):
+        """
+        Returns up to ``limit`` in-memory tasks whose name, description, notes
+        or subtask names contain words starting with each word of ``query``,
+        best match (bm25) first. Only the lists holding results are loaded.
+        """
+        return self._in_memory_tasks(
+            self._search_rows("t.id, t.list_name", query, list_name, limit)
+        )
+
+    def search_task_ids(self, query, list_name=None, limit=None):
+        """Returns the ids of tasks matching ``query`` (see search), best first."""
+        return [row["id"] for row in self._search_rows("t.id", query, list_name, limit)]
+
+    def search_list_names(self, query):
+        """Returns the set of task list names holding tasks that match ``query``."""
+        return {
+            row["list_name"]
+            for row in self._search_rows("DISTINCT t.list_name", query, ranked=False)
+        }
 
     def get_active_tasks(self):
+        """
+        Returns the uncompleted tasks of every list, loading the lists
+        together if needed.
+        """
+        self.hydrate_task_lists(self.task_lists)
         active_tasks = []
         for task_list in self.task_lists:
             for task in task_list.tasks:
@@ -2090,15 +3136,58 @@ class TaskManager:
                     active_tasks.append(task)
         return active_tasks
 
-    def get_task_list_category_name(self, task_list_name):
+    def _query_task_range(self, column, start, end, context):
         cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT category FROM task_lists WHERE name = ?", (task_list_name,)
+        try:
+            cursor.execute(
+                f"""
+                SELECT id, list_name FROM tasks
+                WHERE {column} >= ? AND {column} < ?
+                ORDER BY {column}, id
+                """,
+                (to_epoch_seconds(start), to_epoch_seconds(end)),
+            )
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while querying {context}: {e}")
+            return []
+        finally:
+            cursor.close()
+        return self._in_memory_tasks(rows)
+
+    def get_tasks_due_between(self, start, end):
+        """
+        Returns the in-memory tasks with start <= due_datetime < end, earliest
+        first. Dates are stored as integers, so this is an index range scan.
+        """
+        return self._query_task_range("due_datetime", start, end, "tasks by due date")
+
+    def get_tasks_due_within(self, days, now=None):
+        """Returns the tasks due from ``now`` up to ``days`` days later."""
+        now = now or datetime.now()
+        return self.get_tasks_due_between(now, now + timedelta(days=days))
+
+    def get_tasks_completed_between(self, start, end):
+        """Returns the tasks last completed at or after ``start`` and before ``end``."""
+        return self._query_task_range(
+            "last_completed_date", start, end, "tasks by completion date"
         )
-        result = cursor.fetchone()
-        if result:
-            return result["category"]
-        return None
 
-    def __del__(self):
-        self.conn.close()
+    def get_task_list_category_name(self, task_list_name):
+        task_list = self._lists_by_name.get(task_list_name)
+        return task_list.category if task_list is not None else None
+
+    def _index_task_lists(self):
+        self._lists_by_name = {tl.name: tl for tl in self.task_lists}
+
+    def get_task_list(self, name):
+        """Returns the in-memory TaskList called ``name``, or None."""
+        return self._lists_by_name.get(name)
+
+    def get_task_lists_in_category(self, category_name):
+        """Returns the in-memory task lists of a category, in display order."""
+        category = self.categories.get(category_name)
+        return list(category["task_lists"]) if category else []
+
+    def get_database_stats(self):
+        return self.db.get_stats()
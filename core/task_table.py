@@ -0,0 +1,275 @@
+"""
+Columnar snapshot of the active tasks for the scheduler.
+
+TaskTable keeps one NumPy array per scheduling input (priority, due and
+added times, estimates, effort and flexibility codes, tag and category
+bitmasks) with one row per active task, so ScheduleManager can compute
+weights and block eligibility with array operations instead of walking
+Task objects attribute by attribute.
+
+The table follows the TaskManager change log (see
+TaskManager.get_task_changes): sync() only re-reads the tasks written since
+the last sync and rebuilds from get_active_tasks() when the log can't say.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from core.task_codec import EPOCH, normalize_tags, to_epoch_seconds
+
+# Codes shared with the weight formula (see ScheduleManager.task_weight_formula)
+EFFORT_CODES = {"Low": 1, "Medium": 2, "High": 3}
+DEFAULT_EFFORT_CODE = 2
+FLEXIBILITY_CODES = {"Strict": 0, "Flexible": 1, "Very Flexible": 2}
+DEFAULT_FLEXIBILITY_CODE = 1
+
+# name -> dtype; dates are epoch seconds, NaN when unset
+COLUMNS = {
+    "id": np.int64,
+    "priority": np.float64,
+    "due": np.float64,
+    "added": np.float64,
+    "time_estimate": np.float64,
+    "time_logged": np.float64,
+    "effort": np.int8,
+    "flexibility": np.int8,
+    "quick": np.bool_,
+    "manually_scheduled": np.bool_,
+}
+# Bitmask columns: one uint64 word per 64 distinct names
+MASK_COLUMNS = ("tags", "category")
+
+_INITIAL_CAPACITY = 64
+
+
+def epoch_seconds(value):
+    """
+    Returns ``value`` as float epoch seconds (the column encoding), keeping
+    the microseconds to_epoch_seconds drops; NaN when unset.
+    """
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return (value - EPOCH).total_seconds()
+    seconds = to_epoch_seconds(value)
+    return np.nan if seconds is None else float(seconds)
+
+
+class TaskTable:
+    """
+    Structure-of-arrays view of the active tasks, one row per task.
+
+    Rows are in no particular order; ``tasks[row]`` is the Task behind a
+    row and ``row_of(task_id)`` goes the other way. Columns are read with
+    ``column(name)``, which returns a view sized to the current row count.
+
+    Callers can add derived float columns (see add_derived_column); they
+    are recomputed only for rows that are written, with a running total.
+    """
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        # TaskManager.change_version this snapshot reflects; None until built
+        self.version = None
+        # Bumped whenever rows change, so callers can cache per-row results
+        self.generation = 0
+        self.tasks = []
+        self._rows = {}
+        self._bits = {kind: {} for kind in MASK_COLUMNS}
+        # name -> compute(table, row), and name -> sum over the rows
+        self._derived = {}
+        self._totals = {}
+        self._allocate(_INITIAL_CAPACITY)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def _allocate(self, capacity):
+        self._data = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self._data.update((name, np.zeros(capacity)) for name in self._derived)
+        self._totals = dict.fromkeys(self._derived, 0.0)
+        self._masks = {kind: np.zeros((capacity, 1), np.uint64) for kind in MASK_COLUMNS}
+
+    def add_derived_column(self, name, compute):
+        """
+        Adds float column ``name`` holding ``compute(table, row)``, which may
+        read the row's other columns. It is evaluated whenever a row is
+        written, and its sum over all rows is kept in ``total(name)``.
+        """
+        self._derived[name] = compute
+        self._data[name] = np.zeros(len(self._data["id"]))
+        self.recompute(name)
+
+    def recompute(self, name):
+        """Re-evaluates derived column ``name`` for every row."""
+        array = self._data[name]
+        compute = self._derived[name]
+        for row in range(len(self.tasks)):
+            array[row] = compute(self, row)
+        self._totals[name] = float(array[: len(self.tasks)].sum())
+        self.generation += 1
+
+    def total(self, name):
+        """Returns the running sum of derived column ``name``."""
+        return float(self._totals[name])
+
+    def _grow(self):
+        capacity = len(self._data["id"]) * 2
+        for name, array in self._data.items():
+            grown = np.zeros(capacity, array.dtype)
+            grown[: len(array)] = array
+            self._data[name] = grown
+        for kind, array in self._masks.items():
+            grown = np.zeros((capacity, array.shape[1]), np.uint64)
+            grown[: len(array)] = array
+            self._masks[kind] = grown
+
+    def column(self, name):
+        """Returns column ``name`` (see COLUMNS and MASK_COLUMNS) for the current rows."""
+        array = self._masks[name] if name in self._masks else self._data[name]
+        return array[: len(self.tasks)]
+
+    def row_of(self, task_id):
+        """Returns the row of task ``task_id``, or None if it is not active."""
+        return self._rows.get(task_id)
+
+    def sync(self):
+        """
+        Brings the table up to date with the TaskManager. Returns True if
+        any row was added, changed or removed.
+        """
+        if self.version is None:
+            self.rebuild()
+            return True
+        version, changed = self.task_manager.get_task_changes(self.version)
+        if changed is None:
+            self.rebuild()
+            return True
+        self.version = version
+        if not changed:
+            return False
+        for task_id in changed:
+            task = self.task_manager.find_task(task_id)
+            if task is not None and self._is_active(task):
+                self._upsert(task)
+            else:
+                self._remove(task_id)
+        self.generation += 1
+        return True
+
+    def rebuild(self):
+        """Reloads every row from TaskManager.get_active_tasks()."""
+        self.version = self.task_manager.change_version
+        self.generation += 1
+        tasks = self.task_manager.get_active_tasks()
+        self.tasks = []
+        self._rows = {}
+        self._bits = {kind: {} for kind in MASK_COLUMNS}
+        capacity = _INITIAL_CAPACITY
+        while capacity < len(tasks):
+            capacity *= 2
+        self._allocate(capacity)
+        for task in tasks:
+            self._upsert(task)
+
+    def _is_active(self, task):
+        # Same rule as TaskManager.get_active_tasks
+        task_list = self.task_manager.get_task_list(task.list_name)
+        return task_list is not None and task.status != "Completed"
+
+    def _upsert(self, task):
+        row = self._rows.get(task.id)
+        if row is None:
+            row = len(self.tasks)
+            if row == len(self._data["id"]):
+                self._grow()
+            self.tasks.append(task)
+            self._rows[task.id] = row
+        else:
+            self.tasks[row] = task
+
+        data = self._data
+        data["id"][row] = task.id
+        data["priority"][row] = task.priority or 0
+        data["due"][row] = epoch_seconds(task.due_datetime)
+        data["added"][row] = epoch_seconds(task.added_date_time)
+        data["time_estimate"][row] = task.time_estimate or 0
+        data["time_logged"][row] = task.time_logged or 0
+        data["effort"][row] = EFFORT_CODES.get(task.effort_level, DEFAULT_EFFORT_CODE)
+        data["flexibility"][row] = FLEXIBILITY_CODES.get(
+            task.flexibility, DEFAULT_FLEXIBILITY_CODE
+        )
+        data["quick"][row] = bool(getattr(task, "quick", False))
+        data["manually_scheduled"][row] = bool(getattr(task, "manually_scheduled", False))
+
+        category = self.task_manager.get_task_list_category_name(task.list_name)
+        self._set_mask("tags", row, normalize_tags(task.tags))
+        self._set_mask("category", row, [category] if category else [])
+
+        for name, compute in self._derived.items():
+            value = compute(self, row)
+            # Unwritten rows hold zero, see _remove
+            self._totals[name] += value - data[name][row]
+            data[name][row] = value
+
+    def _remove(self, task_id):
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        for name in self._derived:
+            self._totals[name] -= self._data[name][row]
+        last = len(self.tasks) - 1
+        if row != last:
+            # Move the last row into the gap
+            for array in self._data.values():
+                array[row] = array[last]
+            for array in self._masks.values():
+                array[row] = array[last]
+            moved = self.tasks[last]
+            self.tasks[row] = moved
+            self._rows[moved.id] = row
+        for name in self._derived:
+            self._data[name][last] = 0.0  # _upsert adds new rows from zero
+        self.tasks.pop()
+
+    def _set_mask(self, kind, row, names):
+        bits = self._bits[kind]
+        for name in names:
+            if name not in bits:
+                bits[name] = len(bits)
+        array = self._masks[kind]
+        words = max(1, -(-len(bits) // 64))
+        if words > array.shape[1]:
+            widened = np.zeros((len(array), words), np.uint64)
+            widened[:, : array.shape[1]] = array
+            self._masks[kind] = array = widened
+        array[row] = self._mask(kind, names)
+
+    def _mask(self, kind, names):
+        """Returns the mask words for the known ``names`` of ``kind``."""
+        bits = self._bits[kind]
+        mask = np.zeros(self._masks[kind].shape[1], np.uint64)
+        for name in names:
+            bit = bits.get(name)
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        return mask
+
+    def rows_with_any(self, kind, names):
+        """Returns a boolean array of the rows whose ``kind`` mask has any of ``names``."""
+        mask = self._mask(kind, names)
+        return (self.column(kind) & mask).any(axis=1)
+
+    def rows_matching_filters(self, list_categories, task_tags):
+        """
+        Returns a boolean array of the rows allowed by a time block's
+        include/exclude filters, as in DaySchedule.qualifies.
+        """
+        allowed = np.ones(len(self.tasks), np.bool_)
+        for kind, filters in (("category", list_categories), ("tags", task_tags)):
+            include = filters.get("include", [])
+            exclude = filters.get("exclude", [])
+            if include:
+                allowed &= self.rows_with_any(kind, include)
+            if exclude:
+                allowed &= ~self.rows_with_any(kind, exclude)
+        return allowed
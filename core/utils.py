@@ -63,3 +63,11 @@ def safe_json_dumps(python_object, default_json_string, field_name, context=""):
         logging.error(
             f"Unexpected error dumping JSON for field '{field_name}' {context}. Error: {e}. Using default: {default_json_string!r}. Object was: {python_object!r}")
         return default_json_string
+
+# Stays well under SQLite's limit on bound parameters per statement
+SQL_BATCH_SIZE = 500
+
+def iter_batches(items, size=SQL_BATCH_SIZE):
+    """Yields successive tuples of at most ``size`` items from the sequence ``items``."""
+    for start in range(0, len(items), size):
+        yield tuple(items[start:start + size])
@@ -0,0 +1,91 @@
+"""
+Memory benchmark for the slotted model classes (Task, TaskChunk, TimeBlock).
+
+Each class is compared against a dict-backed copy of itself: the same
+methods and __init__, but attributes kept in a per-instance __dict__ the way
+they were before __slots__. Allocations are measured with tracemalloc, so the
+numbers include attribute values (lists, strings, datetimes) as well as the
+objects themselves. Run from the repository root:
+
+    python -m prototypes.model_memory_benchmark [count]
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import date, datetime, time, timedelta
+
+from core.schedule_manager import TimeBlock
+from core.task_manager import Task, TaskChunk
+
+
+def dict_backed(cls):
+    """Returns a copy of ``cls`` that stores its attributes in a __dict__."""
+    excluded = set(cls.__slots__) | {"__slots__", "__dict__", "__weakref__"}
+    namespace = {name: value for name, value in vars(cls).items() if name not in excluded}
+    return type(f"Dict{cls.__name__}", cls.__bases__, namespace)
+
+
+def make_tasks(cls, count):
+    now = datetime(2025, 3, 1, 9, 30)
+    return [
+        cls(
+            id=i,
+            name=f"task {i}",
+            list_name=f"list {i % 20}",
+            tags=["work"],
+            due_datetime=now + timedelta(days=i % 30),
+            added_date_time=now,
+            time_estimate=1.5,
+            priority=i % 10,
+            preferred_work_days=["Monday"],
+        )
+        for i in range(count)
+    ]
+
+
+def make_chunks(cls, count):
+    return [
+        cls(i, None, "auto", "time", size=0.5, date=date(2025, 3, 1), status="active")
+        for i in range(count)
+    ]
+
+
+def make_blocks(cls, count):
+    blocks = []
+    for i in range(count):
+        block = cls(block_id=i, name="Work", date=date(2025, 3, 1), color=(1, 2, 3))
+        block.start_time = time(9)
+        block.end_time = time(12)
+        block.duration = 3.0
+        blocks.append(block)
+    return blocks
+
+
+def bytes_per_object(factory, cls, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = factory(cls, count)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def main(count=100_000):
+    print(f"{count} objects each, bytes per object (tracemalloc)")
+    for cls, factory in (
+        (Task, make_tasks),
+        (TaskChunk, make_chunks),
+        (TimeBlock, make_blocks),
+    ):
+        before = bytes_per_object(factory, dict_backed(cls), count)
+        after = bytes_per_object(factory, cls, count)
+        print(
+            f"  {cls.__name__:<10} dict: {before:>8,.0f}  slots: {after:>8,.0f}"
+            f"  saved: {1 - after / before:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,188 @@
+"""
+Micro-benchmark for decoding tasks rows into Task keyword arguments.
+
+Compares the old loader path (ISO text dates, SELECT * with sqlite3 type
+detection, sqlite3.Row -> dict, a safe_json_loads call per JSON field and
+strptime date parsing) against core.task_codec.TaskRowCodec reading epoch
+second dates, each on an in-memory database. Run from the repository root:
+
+    python -m prototypes.row_codec_benchmark [rows] [repeats]
+"""
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from core.task_codec import (
+    TASK_COLUMNS,
+    TASK_INSERT_SQL,
+    TEMPORAL_COLUMNS,
+    TaskRowCodec,
+    encode_task_insert,
+)
+from core.utils import safe_json_loads
+
+TASKS_TABLE = """
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL, description TEXT, notes TEXT,
+        tags TEXT DEFAULT '[]', resources TEXT DEFAULT '[]',
+        start_date {date}, due_datetime {timestamp}, added_date_time {timestamp},
+        last_completed_date {date}, list_order INTEGER DEFAULT 0,
+        list_name TEXT NOT NULL, recurring BOOLEAN NOT NULL DEFAULT 0,
+        recur_every TEXT, recurrences INTEGER DEFAULT 0,
+        time_estimate REAL DEFAULT 0.25, time_logged REAL DEFAULT 0.0,
+        count_required INTEGER DEFAULT 0, count_completed INTEGER DEFAULT 0,
+        chunks TEXT DEFAULT '[]', chunk_preference TEXT,
+        min_chunk_size REAL DEFAULT 0.0, max_chunk_size REAL DEFAULT 0.0,
+        subtasks TEXT DEFAULT '[]', dependencies TEXT,
+        status TEXT DEFAULT 'Not Started', flexibility TEXT DEFAULT 'Flexible',
+        effort_level TEXT DEFAULT 'Medium', priority INTEGER DEFAULT 0,
+        previous_priority INTEGER DEFAULT 0, preferred_work_days TEXT DEFAULT '[]',
+        time_of_day_preference TEXT DEFAULT '[]',
+        include_in_schedule BOOLEAN NOT NULL DEFAULT 0, global_weight REAL,
+        next_due INTEGER
+    )
+"""
+
+LEGACY_JSON_FIELDS = (
+    ("tags", []),
+    ("resources", []),
+    ("recur_every", None),
+    ("subtasks", []),
+    ("dependencies", []),
+    ("preferred_work_days", []),
+    ("time_of_day_preference", []),
+)
+LEGACY_DATE_FORMATS = {
+    "start_date": ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"],
+    "due_datetime": ["%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S"],
+    "added_date_time": ["%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S"],
+    "last_completed_date": ["%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S"],
+}
+
+
+class _Row:
+    """Just the attributes encode_task_insert reads."""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+# How add_task stored dates before they became epoch seconds
+LEGACY_INSERT_FORMATS = {
+    "start_date": "%Y-%m-%d",
+    "due_datetime": "%Y-%m-%d %H:%M",
+    "added_date_time": "%Y-%m-%d %H:%M",
+    "last_completed_date": "%Y-%m-%d %H:%M",
+}
+TEMPORAL_POSITIONS = [TASK_COLUMNS.index(name) for name in TEMPORAL_COLUMNS]
+
+
+def _legacy_insert(task):
+    values = list(encode_task_insert(task))
+    for position, name in zip(TEMPORAL_POSITIONS, TEMPORAL_COLUMNS):
+        value = getattr(task, name)
+        values[position] = value.strftime(LEGACY_INSERT_FORMATS[name]) if value else None
+    return tuple(values)
+
+
+def build_database(rows, legacy=False):
+    conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = sqlite3.Row
+    if legacy:
+        conn.execute(TASKS_TABLE.format(date="DATE", timestamp="TIMESTAMP"))
+    else:
+        conn.execute(TASKS_TABLE.format(date="INTEGER", timestamp="INTEGER"))
+    encode = _legacy_insert if legacy else encode_task_insert
+    now = datetime(2025, 3, 1, 9, 30)
+    values = []
+    for i in range(rows):
+        values.append(
+            encode(
+                _Row(
+                    name=f"task {i}", description="", notes="",
+                    tags=["work", f"t{i % 7}"], resources=[],
+                    start_date=now, due_datetime=now + timedelta(days=i % 30),
+                    added_date_time=now, last_completed_date=None,
+                    list_order=i, list_name=f"list {i % 20}",
+                    recurring=i % 5 == 0, recur_every=3 if i % 5 == 0 else None,
+                    recurrences=0, time_estimate=1.5, time_logged=0.0,
+                    count_required=0, count_completed=0, chunks=[],
+                    chunk_preference="time", min_chunk_size=0.5,
+                    max_chunk_size=2.0,
+                    subtasks=[{"order": 1, "name": "step", "completed": False}],
+                    dependencies=[], status="Not Started", flexibility="Flexible",
+                    effort_level="Medium", priority=i % 10, previous_priority=0,
+                    preferred_work_days=["Monday", "Wednesday"],
+                    time_of_day_preference=["Morning"], include_in_schedule=True,
+                    global_weight=None, next_due=None,
+                )
+            )
+        )
+    conn.executemany(TASK_INSERT_SQL, values)
+    conn.commit()
+    return conn
+
+
+def _legacy_parse_date(value, formats):
+    if value is None or isinstance(value, datetime):
+        return value
+    value = str(value)
+    for fmt in formats + ["%Y-%m-%dT%H:%M:%S.%f"]:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return datetime.fromisoformat(value)
+
+
+def decode_legacy(conn):
+    decoded = []
+    for row in conn.execute("SELECT * FROM tasks"):
+        data = dict(row)
+        for name, default in LEGACY_JSON_FIELDS:
+            data[name] = (
+                safe_json_loads(data[name], default, name) if data.get(name) else default
+            )
+        data["chunks"] = []
+        data["recurring"] = bool(data["recurring"])
+        data["include_in_schedule"] = bool(data["include_in_schedule"])
+        for name, formats in LEGACY_DATE_FORMATS.items():
+            data[name] = _legacy_parse_date(data[name], formats)
+        decoded.append(data)
+    return decoded
+
+
+def decode_codec(conn, codec):
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(codec.select_sql)
+    return [codec.decode(row) for row in cursor]
+
+
+def best_rate(func, rows, repeats):
+    best = min(_timed(func) for _ in range(repeats))
+    return rows / best
+
+
+def _timed(func):
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+def main(rows=20000, repeats=5):
+    legacy_conn = build_database(rows, legacy=True)
+    conn = build_database(rows)
+    codec = TaskRowCodec.for_table(conn)
+    before = best_rate(lambda: decode_legacy(legacy_conn), rows, repeats)
+    after = best_rate(lambda: decode_codec(conn, codec), rows, repeats)
+    print(f"{rows} rows, best of {repeats}")
+    print(f"  before (ISO text, dict + safe_json_loads, strptime):  {before:>10,.0f} rows/s")
+    print(f"  after  (TaskRowCodec, epoch seconds):                {after:>10,.0f} rows/s")
+    print(f"  speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
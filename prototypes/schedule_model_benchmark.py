@@ -0,0 +1,203 @@
+"""
+Checks core.schedule_model.ScheduleModel against the old inline model
+construction from solve_schedule_with_cp and times both.
+
+Random chunks (mostly auto, some manual and a few "placed") are rated against every block of a run of
+days, the way generate_schedule fills chunk.timeblock_ratings. Then:
+
+  * on a small instance both models are solved to optimality with one
+    search worker and must reach the same objective (fails loudly if not),
+  * build time is compared on a medium instance, where the old nested scans
+    are still bearable, and
+  * ScheduleModel alone is built and solved on the full instance, reporting
+    build time separately from solve time.
+
+Run from the repository root:
+
+    python -m prototypes.schedule_model_benchmark [chunks] [days] [time limit]
+"""
+import random
+import sys
+from datetime import date, time, timedelta
+from time import perf_counter
+
+from ortools.sat.python import cp_model
+
+from core.schedule_manager import TimeBlock
+from core.schedule_model import ScheduleModel
+from core.task_manager import Task, TaskChunk
+
+BLOCKS_PER_DAY = 4
+
+
+def make_instance(chunk_count, days, seed=7):
+    rng = random.Random(seed)
+    blocks = []
+    for day in range(days):
+        for slot in range(BLOCKS_PER_DAY):
+            block = TimeBlock(
+                block_id=len(blocks),
+                name=f"block {slot}",
+                date=date(2025, 3, 1) + timedelta(days=day),
+            )
+            block.start_time = time(8 + 3 * slot)
+            block.end_time = time(10 + 3 * slot)
+            block.duration = 2.0
+            blocks.append(block)
+
+    chunks = []
+    for i in range(chunk_count):
+        task = Task(
+            name=f"task {i}",
+            list_name="bench",
+            min_chunk_size=rng.choice([0.25, 0.5]),
+            max_chunk_size=rng.choice([1.0, 2.0]),
+        )
+        roll = rng.random()
+        chunk_type = "manual" if roll < 0.2 else "placed" if roll < 0.25 else "auto"
+        chunk = TaskChunk(
+            i,
+            task,
+            chunk_type,
+            "time",
+            size=rng.choice([0.5, 1.0]) if chunk_type == "manual" else rng.choice([0.5, 1.5, 3.0]),
+            status="active",
+        )
+        # Each chunk can go in a random half of the blocks
+        chunk.timeblock_ratings = sorted(
+            ((block, round(rng.uniform(1, 50), 2)) for block in blocks if rng.random() < 0.5),
+            key=lambda pair: pair[1],
+            reverse=True,
+        )
+        chunks.append(chunk)
+    return chunks, blocks
+
+
+def build_legacy(all_chunks, all_blocks, scale=10):
+    """The model construction solve_schedule_with_cp used before ScheduleModel."""
+    block_capacity = {
+        block.id: int(block.get_available_time() * scale + 0.5) for block in all_blocks
+    }
+    allowed_assignments = {}
+    for chunk in all_chunks:
+        full_weight = int(chunk.size * scale + 0.5)
+        for block_obj, rating in chunk.timeblock_ratings:
+            allowed_assignments[(chunk.id, block_obj.id)] = {
+                "rating": rating,
+                "full_weight": full_weight,
+            }
+
+    model = cp_model.CpModel()
+    assign = {}
+    alloc = {}
+    for (c_id, b_id), data in allowed_assignments.items():
+        assign[(c_id, b_id)] = model.NewBoolVar(f"assign_{c_id}_{b_id}")
+        alloc[(c_id, b_id)] = model.NewIntVar(0, data["full_weight"], f"alloc_{c_id}_{b_id}")
+
+    unsched = {}
+    chunk_weight = {chunk.id: int(chunk.size * scale + 0.5) for chunk in all_chunks}
+    for chunk in all_chunks:
+        if chunk.chunk_type == "manual":
+            unsched[chunk.id] = model.NewBoolVar(f"unsched_{chunk.id}")
+        else:
+            unsched[chunk.id] = model.NewIntVar(0, chunk_weight[chunk.id], f"unsched_{chunk.id}")
+
+    for chunk in all_chunks:
+        if chunk.chunk_type == "manual":
+            possible = []
+            for cid, b_id in assign:
+                if cid == chunk.id:
+                    possible.append(assign[(cid, b_id)])
+                    model.Add(alloc[(cid, b_id)] == chunk_weight[chunk.id]).OnlyEnforceIf(
+                        assign[(cid, b_id)]
+                    )
+                    model.Add(alloc[(cid, b_id)] == 0).OnlyEnforceIf(assign[(cid, b_id)].Not())
+            model.Add(sum(possible) + unsched[chunk.id] == 1)
+        elif chunk.chunk_type == "auto":
+            m = int(chunk.task.min_chunk_size * scale + 0.5)
+            M = int(chunk.task.max_chunk_size * scale + 0.5)
+            possible = []
+            for cid, b_id in alloc:
+                if cid == chunk.id:
+                    model.Add(alloc[(cid, b_id)] >= m).OnlyEnforceIf(assign[(cid, b_id)])
+                    model.Add(alloc[(cid, b_id)] <= M).OnlyEnforceIf(assign[(cid, b_id)])
+                    model.Add(alloc[(cid, b_id)] == 0).OnlyEnforceIf(assign[(cid, b_id)].Not())
+                    possible.append(alloc[(cid, b_id)])
+            model.Add(sum(possible) + unsched[chunk.id] == chunk_weight[chunk.id])
+
+    for block in all_blocks:
+        block_allocs = [alloc[(c_id, b_id)] for c_id, b_id in alloc if b_id == block.id]
+        model.Add(sum(block_allocs) <= block_capacity[block.id])
+
+    terms = [allowed_assignments[key]["rating"] * var for key, var in alloc.items()]
+    terms += [
+        -100 * unsched[chunk.id]
+        for chunk in all_chunks
+        if chunk.chunk_type in ("manual", "auto")
+    ]
+    model.Maximize(sum(terms))
+    return model
+
+
+def solve(model, time_limit=None, workers=None):
+    solver = cp_model.CpSolver()
+    if time_limit:
+        solver.parameters.max_time_in_seconds = time_limit
+    if workers:
+        solver.parameters.num_search_workers = workers
+    status = solver.Solve(model)
+    return solver, status
+
+
+def check_equivalence(chunk_count=40, days=3):
+    chunks, blocks = make_instance(chunk_count, days)
+    legacy, legacy_status = solve(build_legacy(chunks, blocks), workers=1)
+    schedule_model = ScheduleModel(chunks, blocks)
+    new, new_status = solve(schedule_model.model, workers=1)
+    assert legacy_status == new_status == cp_model.OPTIMAL, (legacy_status, new_status)
+    assert abs(legacy.ObjectiveValue() - new.ObjectiveValue()) < 1e-6, (
+        legacy.ObjectiveValue(),
+        new.ObjectiveValue(),
+    )
+    return new.ObjectiveValue()
+
+
+def main(chunk_count=2000, days=48, time_limit=10):
+    objective = check_equivalence()
+    print(f"small instance: both models reach the same optimum ({objective:.2f})")
+
+    medium = make_instance(chunk_count // 2, max(1, days // 2))
+    legacy = _timed(lambda: build_legacy(*medium))
+    indexed = _timed(lambda: ScheduleModel(*medium))
+    print(f"{len(medium[0])} chunks x {len(medium[1])} blocks, build only")
+    print(f"  old inline build:   {legacy * 1000:9.1f} ms")
+    print(f"  ScheduleModel:      {indexed * 1000:9.1f} ms")
+
+    chunks, blocks = make_instance(chunk_count, days)
+    schedule_model = ScheduleModel(chunks, blocks)
+    solver, status = schedule_model.solve(_limited_solver(time_limit))
+    print(
+        f"{chunk_count} chunks x {len(blocks)} blocks ({len(schedule_model.pair_chunk)} pairs), "
+        f"ScheduleModel"
+    )
+    print(f"  build:              {schedule_model.build_seconds * 1000:9.1f} ms")
+    print(
+        f"  solve:              {schedule_model.solve_seconds * 1000:9.1f} ms "
+        f"({solver.StatusName(status)}, limit {time_limit} s)"
+    )
+
+
+def _limited_solver(time_limit):
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    return solver
+
+
+def _timed(func):
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,65 @@
+"""
+Times warm-started schedule re-solves against cold ones.
+
+Solves a random instance (see schedule_model_benchmark.make_instance), then
+rebuilds it from scratch the way refresh_schedule does (new TimeBlock and
+TaskChunk objects), changes the size of a few chunks and drops a few more.
+The rebuilt model is solved once cold and once hinted with the first
+solution through ScheduleModel.starting_plan, both with one search worker
+and a 1% relative gap. Run from the repository root:
+
+    python -m prototypes.warm_start_benchmark [chunks] [days]
+"""
+import random
+import sys
+
+from core.schedule_model import WARM_START_MIN_SHARE, ScheduleModel, make_solver
+from prototypes.schedule_model_benchmark import make_instance
+
+RELATIVE_GAP = 0.01
+TIME_LIMIT = 300
+
+
+def perturb(chunks, share=0.02, seed=3):
+    """Resizes and drops ``share`` of the chunks each."""
+    rng = random.Random(seed)
+    count = max(1, int(len(chunks) * share))
+    for chunk in rng.sample(chunks, count):
+        if chunk.chunk_type == "manual":
+            chunk.size = rng.choice([0.5, 1.0])
+        else:
+            chunk.size = rng.choice([0.5, 1.5, 3.0])
+    return chunks[:-count]
+
+
+def main(chunk_count=800, days=28):
+    first = ScheduleModel(*make_instance(chunk_count, days))
+    solver, _ = first.solve(make_solver(TIME_LIMIT, 1, RELATIVE_GAP))
+    plan = first.plan(solver)
+
+    chunks, blocks = make_instance(chunk_count, days)
+    chunks = perturb(chunks)
+    cold = ScheduleModel(chunks, blocks)
+    cold.solve(make_solver(TIME_LIMIT, 1, RELATIVE_GAP))
+
+    chunks, blocks = make_instance(chunk_count, days)
+    chunks = perturb(chunks)
+    warm = ScheduleModel(chunks, blocks)
+    warm.add_hint(warm.starting_plan(plan))
+    assert warm.reused_share >= WARM_START_MIN_SHARE, warm.reused_share
+    warm.solve(make_solver(TIME_LIMIT, 1, RELATIVE_GAP, warm_start=True))
+
+    print(
+        f"{len(chunks)} chunks x {len(blocks)} blocks ({len(warm.pair_chunk)} pairs), "
+        f"{warm.reused_share:.0%} of the previous plan reused"
+    )
+    for label, model in (("cold", cold), ("warm", warm)):
+        print(
+            f"  {label}: {model.solve_seconds * 1000:9.1f} ms  {model.status_name:<8} "
+            f"objective {model.objective:,.2f}  gap {model.gap:.2%}"
+        )
+    print(f"  warm / cold: {warm.solve_seconds / cold.solve_seconds:.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,142 @@
+"""
+Checks ScheduleManager.task_weights against task_weight_formula and times it.
+
+Builds a throwaway database of random active tasks in a temporary directory,
+loads them into a TaskTable, then:
+
+  * compares the vectorized weights with task_weight_formula evaluated task
+    by task at the same reference time (fails loudly on any mismatch),
+  * reports the best time to recompute every weight, and
+  * times global_weights() after a single task edit, and when cached.
+
+Run from the repository root:
+
+    python -m prototypes.weight_engine_benchmark [tasks] [repeats]
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import numpy as np
+
+from core.schedule_manager import ScheduleManager, ScheduleSettings
+from core.task_manager import Task, TaskList, TaskManager
+
+COEFFICIENTS = {
+    "alpha": 1.3,
+    "beta": 2.0,
+    "gamma": 0.7,
+    "delta": 0.4,
+    "epsilon": 0.9,
+    "zeta": 1.1,
+    "eta": 0.6,
+    "theta": 0.5,
+    "K": 3.0,
+    "T_q": 3600.0,
+    "C": 5.0,
+}
+
+
+def random_task(rng, now, i):
+    estimate = rng.choice([0, 0.25, 1.5, 4.0])
+    task = Task(
+        name=f"task {i}",
+        list_name="bench",
+        priority=rng.randint(0, 10),
+        due_datetime=(
+            now + timedelta(hours=rng.uniform(-72, 24 * 60)) if rng.random() < 0.7 else None
+        ),
+        added_date_time=(
+            now - timedelta(seconds=rng.uniform(1, 90 * 86400)) if rng.random() < 0.9 else None
+        ),
+        time_estimate=estimate,
+        time_logged=rng.choice([0, 0.5, 2.0]),
+        flexibility=rng.choice(["Strict", "Flexible", "Very Flexible", None]),
+        effort_level=rng.choice(["Low", "Medium", "High", None]),
+    )
+    if rng.random() < 0.05:
+        task.quick = True
+    if rng.random() < 0.05:
+        task.manually_scheduled = True
+    return task
+
+
+def build(count):
+    os.chdir(tempfile.mkdtemp())
+    task_manager = TaskManager(archive_after_days=None)
+    task_manager.add_task_list(TaskList(name="bench", category="Uncategorized"))
+    rng = random.Random(42)
+    now = datetime.now()
+    task_manager.add_tasks(
+        [random_task(rng, now, i) for i in range(count)], notify=False
+    )
+    settings = ScheduleSettings()
+    for name, value in COEFFICIENTS.items():
+        setattr(settings, name, value)
+    settings.save_settings()
+    # The weight methods only need the coefficients and the task table
+    schedule_manager = ScheduleManager.without_schedule(task_manager)
+    schedule_manager.update_task_global_weights()
+    return task_manager, schedule_manager
+
+
+def check_equivalence(schedule_manager, now):
+    table = schedule_manager.task_table
+    added = [t.added_date_time for t in table.tasks if t.added_date_time]
+    max_added_time = max((now - a).total_seconds() for a in added) if added else 1
+    max_time_estimate = max(
+        (t.time_estimate for t in table.tasks if t.time_estimate), default=1
+    )
+    expected = np.array(
+        [
+            schedule_manager.task_weight_formula(
+                task, max_added_time, max_time_estimate, now=now
+            )
+            for task in table.tasks
+        ]
+    )
+    actual = schedule_manager.task_weights(now=now)
+    worst = np.max(np.abs(actual - expected) / np.maximum(np.abs(expected), 1e-12))
+    assert np.allclose(actual, expected, rtol=1e-9, atol=1e-12), worst
+    return worst
+
+
+def main(count=50_000, repeats=20):
+    task_manager, schedule_manager = build(count)
+    now = datetime.now()
+    worst = check_equivalence(schedule_manager, now)
+    print(f"{count} tasks: task_weights matches task_weight_formula (max rel. error {worst:.1e})")
+
+    best = min(_timed(lambda: schedule_manager.task_weights(now=now)) for _ in range(repeats))
+    start = perf_counter()
+    table = schedule_manager.task_table
+    _ = [schedule_manager.task_weight_formula(t, 1, 1, now=now) for t in table.tasks]
+    loop = perf_counter() - start
+    print(f"  task_weights:              {best * 1000:8.2f} ms (best of {repeats})")
+    print(f"  task_weight_formula loop:  {loop * 1000:8.2f} ms (one pass)")
+
+    def edit_one():
+        task = table.tasks[0]
+        task.priority = (task.priority + 1) % 10
+        task_manager.update_task(task)
+        schedule_manager.update_task_global_weights()
+        schedule_manager.global_weights(now=now)
+
+    edited = min(_timed(edit_one) for _ in range(repeats))
+    cached = min(_timed(lambda: schedule_manager.global_weights(now=now)) for _ in range(repeats))
+    check_equivalence(schedule_manager, now)
+    print(f"  edit one task + weights:   {edited * 1000:8.2f} ms (best of {repeats})")
+    print(f"  global_weights, cached:    {cached * 1000:8.3f} ms")
+
+
+def _timed(func):
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,117 @@
+"""
+Moving finished tasks into archived_tasks, reading history across both
+tables, and restoring archived tasks.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.database import close_database
+from core.task_manager import Task, TaskList, TaskManager
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def finished(name, days_ago, **kwargs):
+    return Task(
+        name=name,
+        list_name="work",
+        status="Completed",
+        last_completed_date=NOW - timedelta(days=days_ago),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def task_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    manager.add_task_list(TaskList(name="work", category="Uncategorized"))
+    old = finished("old report", 90, tags=["reports"])
+    old.add_chunk(2.0, status="completed")
+    manager.add_tasks(
+        [
+            old,
+            finished("older memo", 120),
+            finished("recent email", 3),
+            finished("weekly review", 90, recurring=True, recur_every=7),
+            Task(name="open task", list_name="work"),
+        ],
+        notify=False,
+    )
+    yield manager
+    close_database(manager.db_file)
+
+
+def stored_names(task_manager, table):
+    return sorted(row[0] for row in task_manager.conn.execute(f"SELECT name FROM {table}"))
+
+
+def task_named(task_manager, name):
+    return next(task for task in task_manager.get_task_list("work").tasks if task.name == name)
+
+
+def test_only_old_one_off_finished_tasks_are_archived(task_manager):
+    assert task_manager.archive_completed_tasks(older_than_days=30) == 2
+    assert stored_names(task_manager, "archived_tasks") == ["old report", "older memo"]
+    assert stored_names(task_manager, "tasks") == ["open task", "recent email", "weekly review"]
+    assert [task.name for task in task_manager.get_task_list("work").tasks] == [
+        "recent email",
+        "weekly review",
+        "open task",
+    ]
+
+
+def test_archived_rows_leave_chunks_and_tags_behind(task_manager):
+    task_id = task_named(task_manager, "old report").id
+    task_manager.archive_completed_tasks(older_than_days=30)
+
+    chunk_rows = task_manager.conn.execute(
+        "SELECT COUNT(*) FROM task_chunks WHERE task_id = ?", (task_id,)
+    ).fetchone()[0]
+    assert chunk_rows == 0
+    assert task_manager.get_task_ids_by_tag("reports") == []
+    assert task_manager.find_task(task_id) is None
+    assert task_manager.is_archived(task_id)
+
+    archived = task_manager.get_archived_tasks(search="report")
+    assert [task.name for task in archived] == ["old report"]
+    assert archived[0].tags == ["reports"]
+    assert [chunk["size"] for chunk in archived[0].chunks] == [2.0]
+    assert archived[0].archived_at is not None
+
+
+def test_restore_moves_the_task_back(task_manager):
+    task_id = task_named(task_manager, "old report").id
+    task_manager.archive_completed_tasks(older_than_days=30)
+
+    restored = task_manager.restore_archived_task(task_id)
+    assert restored.id == task_id
+    assert restored in task_manager.get_task_list("work").tasks
+    assert restored.tags == ["reports"]
+    assert [chunk["status"] for chunk in restored.chunks] == ["completed"]
+    assert task_manager.get_task_ids_by_tag("reports") == [task_id]
+    assert not task_manager.is_archived(task_id)
+    assert stored_names(task_manager, "archived_tasks") == ["older memo"]
+
+
+def test_startup_archives_with_the_configured_age(task_manager):
+    close_database(task_manager.db_file)
+    reopened = TaskManager(archive_after_days=60)
+    try:
+        assert stored_names(reopened, "archived_tasks") == ["old report", "older memo"]
+    finally:
+        close_database(reopened.db_file)
+
+
+def test_history_pages_span_live_and_archived_tasks(task_manager):
+    task_manager.archive_completed_tasks(older_than_days=30)
+
+    names = []
+    page, after = task_manager.get_history_page(limit=2)
+    names.extend(task.name for task in page)
+    while after is not None:
+        page, after = task_manager.get_history_page(limit=2, after=after)
+        names.extend(task.name for task in page)
+    # Newest completion first; equal dates by id, newest first
+    assert names == ["recent email", "weekly review", "old report", "older memo"]
@@ -0,0 +1,80 @@
+"""
+Writes made through the shared DatabaseManager join an open
+TaskManager.batch() instead of committing or rolling it back early.
+"""
+import pytest
+
+from core.database import close_database
+from core.schedule_manager import ScheduleManager, ScheduleSettings
+from core.task_manager import Task, TaskList, TaskManager
+
+BLOCK = {
+    "name": "Work",
+    "schedule": {"Monday": ["09:00", "17:00"]},
+    "list_categories": {"include": [], "exclude": []},
+    "task_tags": {"include": [], "exclude": []},
+    "color": "",
+    "unavailable": 0,
+}
+
+
+@pytest.fixture
+def managers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(archive_after_days=None)
+    task_manager.add_task_list(TaskList(name="inbox", category="Uncategorized"))
+    schedule_manager = ScheduleManager.without_schedule(task_manager)
+    schedule_manager.add_time_block(dict(BLOCK))
+    yield task_manager, schedule_manager
+    close_database(task_manager.db_file)
+
+
+def stored_task_names(task_manager):
+    return [row["name"] for row in task_manager.conn.execute("SELECT name FROM tasks")]
+
+
+def stored_block_names(schedule_manager):
+    return [row["name"] for row in schedule_manager.conn.execute("SELECT name FROM time_blocks")]
+
+
+def test_time_block_edit_does_not_commit_a_failed_batch(managers):
+    task_manager, schedule_manager = managers
+    block = dict(schedule_manager.time_blocks[0], name="Deep work")
+
+    with pytest.raises(RuntimeError):
+        with task_manager.batch():
+            task_manager.add_task(Task(name="draft", list_name="inbox"))
+            assert schedule_manager.update_time_block(block)
+            raise RuntimeError("abort the batch")
+
+    assert stored_task_names(task_manager) == []
+    assert stored_block_names(schedule_manager) == ["Work"]
+    assert not task_manager.conn.in_transaction
+
+
+def test_settings_save_does_not_commit_a_failed_batch(managers):
+    task_manager, _ = managers
+
+    with pytest.raises(RuntimeError):
+        with task_manager.batch():
+            task_manager.add_task(Task(name="draft", list_name="inbox"))
+            settings = ScheduleSettings()
+            settings.alpha = 9.0
+            settings.save_settings()
+            raise RuntimeError("abort the batch")
+
+    assert stored_task_names(task_manager) == []
+    assert ScheduleSettings().alpha != 9.0
+
+
+def test_writes_join_a_successful_batch(managers):
+    task_manager, schedule_manager = managers
+    commits = task_manager.conn.stats["commits"]
+
+    with task_manager.batch():
+        task_manager.add_task(Task(name="draft", list_name="inbox"))
+        schedule_manager.add_time_block(dict(BLOCK, name="Errands"))
+
+    assert stored_task_names(task_manager) == ["draft"]
+    assert stored_block_names(schedule_manager) == ["Work", "Errands"]
+    assert task_manager.conn.stats["commits"] == commits + 1
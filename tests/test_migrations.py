@@ -0,0 +1,281 @@
+"""
+core.migrations brings databases written before schema versioning up to the
+current schema, and leaves new databases consistent with it.
+"""
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from core.database import close_database
+from core.migrations import MIGRATIONS, get_schema_version, run_migrations
+from core.schedule_manager import DEFAULT_SOLVER_PROFILE, ScheduleSettings
+from core.task_manager import TaskManager
+
+# The tasks table as create_tables wrote it before migrations existed
+LEGACY_TASKS_TABLE = """
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        notes TEXT,
+        tags TEXT DEFAULT '[]',
+        resources TEXT DEFAULT '[]',
+        start_date DATE,
+        due_datetime TIMESTAMP,
+        added_date_time TIMESTAMP,
+        last_completed_date DATE,
+        list_order INTEGER DEFAULT 0,
+        list_name TEXT NOT NULL,
+
+        recurring BOOLEAN NOT NULL DEFAULT 0,
+        recur_every TEXT,
+        recurrences INTEGER DEFAULT 0,
+
+        time_estimate REAL DEFAULT 0.25,
+        time_logged REAL DEFAULT 0.0,
+        count_required INTEGER DEFAULT 0,
+        count_completed INTEGER DEFAULT 0,
+
+        chunks TEXT DEFAULT '[]',
+        chunk_preference TEXT,
+        min_chunk_size REAL DEFAULT 0.0,
+        max_chunk_size REAL DEFAULT 0.0,
+
+        subtasks TEXT DEFAULT '[]',
+        dependencies TEXT,
+
+        status TEXT DEFAULT 'Not Started',
+        flexibility TEXT DEFAULT 'Flexible',
+        effort_level TEXT DEFAULT 'Medium',
+        priority INTEGER DEFAULT 0,
+        previous_priority INTEGER DEFAULT 0,
+        preferred_work_days TEXT DEFAULT '[]',
+        time_of_day_preference TEXT DEFAULT '[]',
+
+        include_in_schedule BOOLEAN NOT NULL DEFAULT 0,
+
+        global_weight REAL,
+
+        FOREIGN KEY(list_name) REFERENCES task_lists(name) ON DELETE CASCADE
+    );
+"""
+
+LEGACY_TASK_LISTS_TABLE = """
+    CREATE TABLE task_lists (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        `order` INTEGER,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        category TEXT NOT NULL,
+        notifications_enabled BOOLEAN NOT NULL DEFAULT 1,
+        archived BOOLEAN NOT NULL DEFAULT 0,
+        in_trash BOOLEAN NOT NULL DEFAULT 0,
+        creation_date TIMESTAMP,
+        default_start_date DATE,
+        default_due_datetime TIMESTAMP,
+        default_time_of_day_preference TEXT,
+        default_flexibility TEXT,
+        default_effort_level TEXT,
+        default_priority INTEGER,
+        default_preferred_work_days TEXT,
+        consider_in_schedule BOOLEAN NOT NULL DEFAULT 1,
+        sort_by_queue BOOLEAN NOT NULL DEFAULT 0,
+        sort_by_stack BOOLEAN NOT NULL DEFAULT 0,
+        sort_by_priority BOOLEAN NOT NULL DEFAULT 0,
+        sort_by_due_datetime BOOLEAN NOT NULL DEFAULT 0,
+        sort_by_tags BOOLEAN NOT NULL DEFAULT 0,
+        sort_by_time_estimate BOOLEAN NOT NULL DEFAULT 0
+    );
+"""
+
+# schedule_settings before the solver profile, with one saved row
+LEGACY_SCHEDULE_SETTINGS_TABLE = """
+    CREATE TABLE schedule_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        day_start TIME,
+        ideal_sleep_duration REAL,
+        overtime_flexibility TEXT,
+        hours_of_day_available REAL,
+        peak_productivity_start TIME,
+        peak_productivity_end TIME,
+        off_peak_start TIME,
+        off_peak_end TIME,
+        task_notifications BOOLEAN NOT NULL DEFAULT 1,
+        task_status_popup_frequency INTEGER,
+        alpha REAL, beta REAL, gamma REAL, delta REAL, epsilon REAL,
+        zeta REAL, eta REAL, theta REAL, K INTEGER, T_q INTEGER, C INTEGER
+    );
+"""
+
+LEGACY_CHUNKS = [
+    {"id": "c1", "size": 1.0, "type": "auto", "unit": "time", "status": "active"},
+    {"id": "c2", "size": 0.5, "type": "manual", "unit": "time", "status": "completed"},
+]
+
+
+LATEST_VERSION = max(version for version, _, _ in MIGRATIONS)
+HOT_INDEXES = {
+    "idx_tasks_list_status",
+    "idx_tasks_status",
+    "idx_tasks_due_datetime",
+    "idx_tasks_recurring_status",
+    "idx_tasks_schedule_status",
+}
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def index_names(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA index_list({table})")}
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A data/adm.db written by the app before schema versioning."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    conn = sqlite3.connect(tmp_path / "data" / "adm.db")
+    conn.execute(LEGACY_TASKS_TABLE)
+    conn.execute(LEGACY_TASK_LISTS_TABLE)
+    conn.execute(LEGACY_SCHEDULE_SETTINGS_TABLE)
+    conn.execute("INSERT INTO schedule_settings (alpha, K) VALUES (0.75, 42)")
+    conn.execute("INSERT INTO task_lists (`order`, name, category) VALUES (0, 'work', 'Work')")
+    conn.execute(
+        "INSERT INTO tasks (name, list_name, due_datetime, chunks) VALUES (?, ?, ?, ?)",
+        ("report", "work", "2025-03-01 09:30:00", json.dumps(LEGACY_CHUNKS)),
+    )
+    conn.commit()
+    conn.close()
+    yield tmp_path
+    close_database("data/adm.db")
+
+
+def test_legacy_chunks_move_to_task_chunks(legacy_db):
+    task_manager = TaskManager(archive_after_days=None)
+    assert "chunks" not in table_columns(task_manager.conn, "tasks")
+    assert "chunks" in table_columns(task_manager.conn, "archived_tasks")
+
+    task = task_manager.get_active_tasks()[0]
+    assert [(chunk["id"], chunk["status"]) for chunk in task.chunks] == [
+        ("c1", "active"),
+        ("c2", "completed"),
+    ]
+
+
+def test_new_database_has_no_tasks_chunks_column(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(archive_after_days=None)
+    try:
+        assert "chunks" not in table_columns(task_manager.conn, "tasks")
+        assert "chunks" in table_columns(task_manager.conn, "archived_tasks")
+    finally:
+        close_database(task_manager.db_file)
+
+
+def test_legacy_schedule_settings_gain_the_solver_profile(legacy_db):
+    task_manager = TaskManager(archive_after_days=None)
+    columns = table_columns(task_manager.conn, "schedule_settings")
+    assert set(DEFAULT_SOLVER_PROFILE) <= set(columns)
+
+    settings = ScheduleSettings()
+    assert (settings.alpha, settings.K) == (0.75, 42)
+    for name, default in DEFAULT_SOLVER_PROFILE.items():
+        assert getattr(settings, name) == default
+
+
+def test_schedule_settings_on_a_new_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    try:
+        settings = ScheduleSettings()
+        settings.solver_workers = 3
+        settings.save_settings()
+        assert ScheduleSettings().solver_workers == 3
+    finally:
+        close_database("data/adm.db")
+
+
+def test_new_database_is_fully_migrated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(archive_after_days=None)
+    try:
+        assert task_manager.schema_version == LATEST_VERSION
+        assert get_schema_version(task_manager.conn) == LATEST_VERSION
+        assert HOT_INDEXES <= index_names(task_manager.conn, "tasks")
+    finally:
+        close_database(task_manager.db_file)
+
+
+def test_legacy_database_is_migrated_in_place(legacy_db):
+    task_manager = TaskManager(archive_after_days=None)
+    conn = task_manager.conn
+    assert task_manager.schema_version == LATEST_VERSION
+    assert HOT_INDEXES <= index_names(conn, "tasks")
+    assert {
+        row[1]: row[2] for row in conn.execute("PRAGMA table_info(tasks)")
+    }["due_datetime"] == "INTEGER"
+
+    # Rows, ids and the AUTOINCREMENT counter survive the table rebuild
+    task = task_manager.get_active_tasks()[0]
+    assert (task.id, task.name, task.due_datetime) == (1, "report", datetime(2025, 3, 1, 9, 30))
+    assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()[0] == 1
+
+
+def test_migrations_run_once(legacy_db):
+    task_manager = TaskManager(archive_after_days=None)
+    calls = []
+    migrations = MIGRATIONS + [(LATEST_VERSION + 1, "Count runs", calls.append)]
+
+    assert run_migrations(task_manager.conn, migrations) == LATEST_VERSION + 1
+    assert run_migrations(task_manager.conn, migrations) == LATEST_VERSION + 1
+    assert len(calls) == 1
+
+
+def test_failed_migration_is_rolled_back_and_stops_the_run():
+    conn = sqlite3.connect(":memory:")
+    applied = []
+
+    def create_a(cursor):
+        cursor.execute("CREATE TABLE a (x INTEGER)")
+        applied.append(1)
+
+    def half_done(cursor):
+        cursor.execute("CREATE TABLE b (x INTEGER)")
+        cursor.execute("INSERT INTO missing VALUES (1)")
+
+    def create_c(cursor):
+        applied.append(3)
+
+    migrations = [(1, "a", create_a), (2, "b", half_done), (3, "c", create_c)]
+    assert run_migrations(conn, migrations) == 1
+    assert get_schema_version(conn) == 1
+    assert applied == [1]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"a"}
+
+
+def test_global_weight_is_dropped_from_tasks_and_the_archive(legacy_db):
+    conn = sqlite3.connect(legacy_db / "data" / "adm.db")
+    conn.row_factory = sqlite3.Row
+    assert run_migrations(conn, MIGRATIONS[:9]) == 9
+    assert "global_weight" in table_columns(conn, "archived_tasks")
+    conn.execute(
+        "INSERT INTO archived_tasks (id, name, list_name, time_estimate, time_logged, "
+        "count_required, count_completed, global_weight, archived_at) "
+        "VALUES (7, 'old memo', 'work', 1.0, 1.0, 0, 0, 0.5, 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    task_manager = TaskManager(archive_after_days=None)
+    conn = task_manager.conn
+    assert get_schema_version(conn) == LATEST_VERSION
+    for table in ("tasks", "archived_tasks"):
+        assert "global_weight" not in table_columns(conn, table)
+    assert HOT_INDEXES <= index_names(conn, "tasks")
+    assert "idx_archived_tasks_completed" in index_names(conn, "archived_tasks")
+    assert [task.name for task in task_manager.get_active_tasks()] == ["report"]
+    assert [task.name for task in task_manager.get_archived_tasks()] == ["old memo"]
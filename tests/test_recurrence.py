@@ -0,0 +1,104 @@
+"""
+Recurring task rollover: compute_next_due and the stored next_due column
+manage_recurring_tasks reads.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.database import close_database
+from core.task_codec import compute_next_due, to_epoch_seconds
+from core.task_manager import Task, TaskList, TaskManager
+
+WEDNESDAY = datetime(2025, 3, 5, 9, 30)
+FRIDAY = datetime(2025, 3, 7, 9, 30)
+
+
+@pytest.mark.parametrize(
+    "recur_every, due, completed, expected",
+    [
+        # Days count from the due date, else from the last completion
+        (3, WEDNESDAY, FRIDAY, WEDNESDAY + timedelta(days=3)),
+        (3, None, FRIDAY, FRIDAY + timedelta(days=3)),
+        # Weekdays roll to the next listed day after the anchor's weekday
+        (["Monday", "Friday"], WEDNESDAY, None, FRIDAY),
+        (["mon", "fri"], None, WEDNESDAY, FRIDAY),
+        # ... never to the anchor's own day
+        (["Friday"], FRIDAY, None, FRIDAY + timedelta(days=7)),
+        (["Wednesday", "Friday"], FRIDAY, None, FRIDAY + timedelta(days=5)),
+        # Neither a due date nor a completion: no rollover
+        (3, None, None, None),
+        (["Monday"], None, None, None),
+        # Nothing to recur on
+        (None, WEDNESDAY, None, None),
+        (["someday"], WEDNESDAY, None, None),
+    ],
+)
+def test_compute_next_due(recur_every, due, completed, expected):
+    assert compute_next_due(True, recur_every, "Completed", due, completed) == expected
+
+
+@pytest.mark.parametrize("recurring, status", [(False, "Completed"), (True, "In Progress")])
+def test_only_finished_recurring_tasks_roll_over(recurring, status):
+    assert compute_next_due(recurring, 1, status, WEDNESDAY, None) is None
+
+
+@pytest.fixture
+def task_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    manager.add_task_list(TaskList(name="habits", category="Uncategorized"))
+    yield manager
+    close_database(manager.db_file)
+
+
+def stored_next_due(task_manager, task):
+    return task_manager.conn.execute(
+        "SELECT next_due FROM tasks WHERE id = ?", (task.id,)
+    ).fetchone()[0]
+
+
+def test_next_due_is_stored_and_follows_edits(task_manager):
+    task = Task(name="water plants", list_name="habits", recurring=True, recur_every=2)
+    task_manager.add_task(task)
+    assert stored_next_due(task_manager, task) is None
+
+    task.status = "Completed"
+    task.due_datetime = WEDNESDAY
+    task_manager.update_task(task)
+    assert stored_next_due(task_manager, task) == to_epoch_seconds(FRIDAY)
+
+
+def test_rollover_reopens_due_tasks(task_manager):
+    due = Task(
+        name="water plants",
+        list_name="habits",
+        recurring=True,
+        recur_every=2,
+        status="Completed",
+        due_datetime=WEDNESDAY,
+        time_estimate=0.5,
+        time_logged=0.5,
+    )
+    undated = Task(
+        name="stretch",
+        list_name="habits",
+        recurring=True,
+        recur_every=["Monday"],
+        status="Completed",
+        added_date_time=WEDNESDAY - timedelta(days=30),
+    )
+    task_manager.add_tasks([due, undated], notify=False)
+
+    assert task_manager.manage_recurring_tasks(now=FRIDAY - timedelta(minutes=1)) == 0
+    assert task_manager.manage_recurring_tasks(now=FRIDAY) == 1
+
+    assert (due.status, due.due_datetime, due.recurrences, due.time_logged) == (
+        "Not Started",
+        FRIDAY,
+        1,
+        0,
+    )
+    assert stored_next_due(task_manager, due) is None
+    assert undated.status == "Completed"
+    assert stored_next_due(task_manager, undated) is None
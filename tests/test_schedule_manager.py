@@ -0,0 +1,100 @@
+"""
+ScheduleManager scheduling input built from the task manager's tasks.
+"""
+from datetime import datetime
+
+import pytest
+
+from core.database import close_database
+from core.schedule_manager import ScheduleManager
+from core.task_manager import Task, TaskChunk, TaskList, TaskManager
+
+
+@pytest.fixture
+def schedule_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(archive_after_days=None)
+    task_manager.add_task_list(TaskList(name="work", category="Uncategorized"))
+
+    report = Task(name="report", list_name="work")
+    report.add_chunk(1.0, chunk_type="auto")
+    report.add_chunk(0.5, status="completed")
+    slides = Task(name="slides", list_name="work")
+    slides.add_chunk(2.0, chunk_type="placed", status="locked")
+    done = Task(name="done", list_name="work", status="Completed")
+    done.add_chunk(1.5)
+    task_manager.add_tasks([report, slides, done], notify=False)
+
+    manager = ScheduleManager.without_schedule(task_manager)
+    manager._sync_active_tasks()
+    yield manager
+    close_database(task_manager.db_file)
+
+
+def test_chunk_tasks_reads_every_chunk_of_the_active_tasks(schedule_manager):
+    chunks = schedule_manager.chunk_tasks(day_schedules=[])
+    expected = [
+        (task.name, chunk["id"], chunk["status"])
+        for task in schedule_manager.active_tasks
+        for chunk in task.chunks
+    ]
+    assert [(chunk.task.name, chunk.id, chunk.status) for chunk in chunks] == expected
+    assert {status for _, _, status in expected} == {"active", "completed", "locked"}
+    assert "done" not in {chunk.task.name for chunk in chunks}
+
+
+@pytest.fixture
+def task_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    manager.add_task_list(TaskList(name="work", category="Uncategorized"))
+    task = Task(name="report", list_name="work", time_estimate=3.0, include_in_schedule=True)
+    task.add_chunk(1.5, chunk_type="auto")
+    manager.add_tasks([task], notify=False)
+    yield manager
+    close_database(manager.db_file)
+
+
+def chunk_of(task):
+    data = task.chunks[0]
+    return TaskChunk(data["id"], task, data["type"], data["unit"], size=data["size"])
+
+
+def test_chunk_writes_are_task_changes(task_manager):
+    task = task_manager.get_task_list("work").tasks[0]
+    chunk_id = task.chunks[0]["id"]
+
+    version = task_manager.change_version
+    assert task_manager.update_chunk_status(task, chunk_id, "completed")
+    assert task_manager.get_task_changes(version) == (task_manager.change_version, {task.id})
+    assert task.time_logged == 1.5
+
+    version = task_manager.change_version
+    assert task_manager.delete_chunk(task, chunk_of(task))
+    assert task_manager.get_task_changes(version) == (task_manager.change_version, {task.id})
+
+
+def test_unchanged_inputs_skip_the_solve(task_manager):
+    manager = ScheduleManager(task_manager)
+    # Replaces the background refresh started by __init__
+    assert manager.refresh_schedule()
+    assert manager.solve_counts == {"executed": 1, "skipped": 0}
+
+    assert not manager.refresh_schedule()
+    assert manager.solve_counts == {"executed": 1, "skipped": 1}
+
+    task = task_manager.get_task_list("work").tasks[0]
+    task_manager.update_chunk_status(task, task.chunks[0]["id"], "completed")
+    assert manager.refresh_schedule()
+    assert manager.solve_counts == {"executed": 2, "skipped": 1}
+
+    manager.schedule_settings.solver_workers += 1
+    assert manager.refresh_schedule()
+    assert not manager.refresh_schedule()
+
+
+def test_fingerprint_changes_with_the_hour(task_manager):
+    manager = ScheduleManager.without_schedule(task_manager)
+    nine = datetime(2025, 3, 5, 9, 0)
+    assert manager.schedule_fingerprint(nine) == manager.schedule_fingerprint(nine.replace(minute=59))
+    assert manager.schedule_fingerprint(nine) != manager.schedule_fingerprint(nine.replace(hour=10))
@@ -0,0 +1,156 @@
+"""
+ScheduleModel must build the same CP-SAT model as the inline construction
+solve_schedule_with_cp used before it, for every chunk type.
+"""
+import random
+from datetime import date, time, timedelta
+
+import pytest
+from ortools.sat.python import cp_model
+
+from core.schedule_manager import TimeBlock
+from core.schedule_model import ScheduleModel
+from core.task_manager import Task, TaskChunk
+
+SCALE = 10
+CHUNK_TYPES = ("manual", "auto", "placed", None)
+
+
+def make_instance(chunk_count=16, days=2, seed=3):
+    rng = random.Random(seed)
+    blocks = []
+    for day in range(days):
+        for slot in range(3):
+            block = TimeBlock(
+                block_id=len(blocks),
+                name=f"block {slot}",
+                date=date(2025, 3, 3) + timedelta(days=day),
+            )
+            block.start_time = time(8 + 3 * slot)
+            block.end_time = time(10 + 3 * slot)
+            block.duration = 2.0
+            blocks.append(block)
+
+    chunks = []
+    for i in range(chunk_count):
+        task = Task(
+            name=f"task {i}",
+            list_name="model",
+            min_chunk_size=rng.choice([0.25, 0.5]),
+            max_chunk_size=rng.choice([1.0, 2.0]),
+        )
+        chunk = TaskChunk(
+            i, task, CHUNK_TYPES[i % len(CHUNK_TYPES)], "time", size=rng.choice([0.5, 1.0, 2.5])
+        )
+        chunk.timeblock_ratings = [
+            (block, rng.randint(1, 50)) for block in blocks if rng.random() < 0.6
+        ]
+        chunks.append(chunk)
+    return chunks, blocks
+
+
+def build_legacy(chunks, blocks):
+    """
+    The model solve_schedule_with_cp built before ScheduleModel. Returns
+    (model, assign, alloc), the last two keyed by (chunk id, block id).
+    """
+    model = cp_model.CpModel()
+    weight = {chunk.id: int(chunk.size * SCALE + 0.5) for chunk in chunks}
+    assign = {}
+    alloc = {}
+    rating = {}
+    for chunk in chunks:
+        for block, block_rating in chunk.timeblock_ratings:
+            key = (chunk.id, block.id)
+            rating[key] = block_rating
+            assign[key] = model.NewBoolVar(f"assign_{key}")
+            alloc[key] = model.NewIntVar(0, weight[chunk.id], f"alloc_{key}")
+
+    unsched = {}
+    for chunk in chunks:
+        if chunk.chunk_type == "manual":
+            unsched[chunk.id] = model.NewBoolVar(f"unsched_{chunk.id}")
+        else:
+            unsched[chunk.id] = model.NewIntVar(0, weight[chunk.id], f"unsched_{chunk.id}")
+
+    for chunk in chunks:
+        keys = [key for key in assign if key[0] == chunk.id]
+        if chunk.chunk_type == "manual":
+            for key in keys:
+                model.Add(alloc[key] == weight[chunk.id]).OnlyEnforceIf(assign[key])
+                model.Add(alloc[key] == 0).OnlyEnforceIf(assign[key].Not())
+            model.Add(sum(assign[key] for key in keys) + unsched[chunk.id] == 1)
+        elif chunk.chunk_type == "auto":
+            low = int(chunk.task.min_chunk_size * SCALE + 0.5)
+            high = int(chunk.task.max_chunk_size * SCALE + 0.5)
+            for key in keys:
+                model.Add(alloc[key] >= low).OnlyEnforceIf(assign[key])
+                model.Add(alloc[key] <= high).OnlyEnforceIf(assign[key])
+                model.Add(alloc[key] == 0).OnlyEnforceIf(assign[key].Not())
+            model.Add(sum(alloc[key] for key in keys) + unsched[chunk.id] == weight[chunk.id])
+
+    for block in blocks:
+        capacity = int(block.get_available_time() * SCALE + 0.5)
+        model.Add(sum(var for key, var in alloc.items() if key[1] == block.id) <= capacity)
+
+    terms = [rating[key] * var for key, var in alloc.items()]
+    terms += [
+        -100 * unsched[chunk.id] for chunk in chunks if chunk.chunk_type in ("manual", "auto")
+    ]
+    model.Maximize(sum(terms))
+    return model, assign, alloc
+
+
+def solve(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver
+
+
+@pytest.fixture
+def instance():
+    return make_instance()
+
+
+def test_instance_covers_every_chunk_type(instance):
+    chunks, _ = instance
+    assert {chunk.chunk_type for chunk in chunks} == set(CHUNK_TYPES)
+
+
+def test_objective_matches_legacy_model(instance):
+    chunks, blocks = instance
+    legacy_model, _, _ = build_legacy(chunks, blocks)
+    schedule_model = ScheduleModel(chunks, blocks)
+
+    legacy = solve(legacy_model)
+    new = solve(schedule_model.model)
+    assert new.ObjectiveValue() == pytest.approx(legacy.ObjectiveValue())
+
+
+def test_assignments_are_optimal_in_legacy_model(instance):
+    chunks, blocks = instance
+    schedule_model = ScheduleModel(chunks, blocks)
+    new = solve(schedule_model.model)
+
+    # Pin the legacy model to ScheduleModel's assignments: they must be
+    # feasible there and score the same objective
+    legacy_model, assign, alloc = build_legacy(chunks, blocks)
+    for p, (i, j) in enumerate(zip(schedule_model.pair_chunk, schedule_model.pair_block)):
+        key = (chunks[i].id, blocks[j].id)
+        legacy_model.Add(assign[key] == new.Value(schedule_model.assign[p]))
+        legacy_model.Add(alloc[key] == new.Value(schedule_model.alloc[p]))
+    pinned = solve(legacy_model)
+    assert pinned.ObjectiveValue() == pytest.approx(new.ObjectiveValue())
+
+    # Only manual and auto chunks are reported as (partly) unscheduled
+    for i, chunk in enumerate(chunks):
+        if chunk.chunk_type not in ("manual", "auto"):
+            continue
+        allocated = sum(new.Value(schedule_model.alloc[p]) for p in schedule_model.chunk_pairs[i])
+        unscheduled = new.Value(schedule_model.unscheduled[i])
+        if chunk.chunk_type == "manual":
+            assert unscheduled == int(allocated == 0)
+        else:
+            assert allocated + unscheduled == int(chunk.size * SCALE + 0.5)
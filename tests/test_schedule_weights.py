@@ -0,0 +1,138 @@
+"""
+ScheduleManager.task_weights / global_weight_of must agree with
+task_weight_formula evaluated one task at a time.
+"""
+import itertools
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.database import close_database
+from core.schedule_manager import ScheduleManager, ScheduleSettings
+from core.task_manager import Task, TaskList, TaskManager
+from core.task_table import EFFORT_CODES, FLEXIBILITY_CODES
+
+COEFFICIENTS = {
+    "alpha": 1.3,
+    "beta": 2.0,
+    "gamma": 0.7,
+    "delta": 0.4,
+    "epsilon": 0.9,
+    "zeta": 1.1,
+    "eta": 0.6,
+    "theta": 0.5,
+    "K": 3.0,
+    "T_q": 3600.0,
+    "C": 5.0,
+}
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+DUE_DATES = {
+    "no due date": None,
+    "past due": NOW - timedelta(days=2),
+    "due within a day": NOW + timedelta(hours=6),
+    "due later": NOW + timedelta(days=9, hours=3),
+}
+ADDED_DATES = {
+    "no added date": None,
+    "added recently": NOW - timedelta(minutes=20),
+    "added long ago": NOW - timedelta(days=40),
+}
+EFFORT_LEVELS = list(EFFORT_CODES) + [None]
+FLEXIBILITIES = list(FLEXIBILITY_CODES) + [None]
+
+
+def make_tasks():
+    tasks = []
+    cases = itertools.product(DUE_DATES, ADDED_DATES, EFFORT_LEVELS, FLEXIBILITIES)
+    for i, (due, added, effort, flexibility) in enumerate(cases):
+        task = Task(
+            name=f"{due}, {added}, {effort}, {flexibility}",
+            list_name="weights",
+            priority=i % 11,
+            due_datetime=DUE_DATES[due],
+            added_date_time=ADDED_DATES[added],
+            time_estimate=(0, 0.5, 2.0, 6.0)[i % 4],
+            time_logged=(0, 0.25, 1.0)[i % 3],
+            effort_level=effort,
+            flexibility=flexibility,
+        )
+        task.quick = i % 7 == 0
+        task.manually_scheduled = i % 5 == 0
+        tasks.append(task)
+    return tasks
+
+
+@pytest.fixture
+def schedule_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(archive_after_days=None)
+    task_manager.add_task_list(TaskList(name="weights", category="Uncategorized"))
+    task_manager.add_tasks(make_tasks(), notify=False)
+    settings = ScheduleSettings()
+    for name, value in COEFFICIENTS.items():
+        setattr(settings, name, value)
+    settings.save_settings()
+    # Only the weight engine is under test: no time blocks, no solve
+    manager = ScheduleManager.without_schedule(task_manager)
+    manager.update_task_global_weights()
+    yield manager
+    close_database(task_manager.db_file)
+
+
+def formula_weights(manager, tasks):
+    ages = [(NOW - t.added_date_time).total_seconds() for t in tasks if t.added_date_time]
+    max_added_time = max(ages) if ages else 1
+    max_time_estimate = max((t.time_estimate for t in tasks if t.time_estimate), default=1)
+    return np.array(
+        [
+            manager.task_weight_formula(task, max_added_time, max_time_estimate, now=NOW)
+            for task in tasks
+        ]
+    )
+
+
+def test_cases_are_covered(schedule_manager):
+    tasks = schedule_manager.task_table.tasks
+    assert len(tasks) == len(DUE_DATES) * len(ADDED_DATES) * len(EFFORT_LEVELS) * len(
+        FLEXIBILITIES
+    )
+    assert any(t.due_datetime is None for t in tasks)
+    assert any(t.due_datetime and t.due_datetime < NOW for t in tasks)
+    assert any(t.added_date_time is None for t in tasks)
+
+
+def test_task_weights_match_formula(schedule_manager):
+    tasks = schedule_manager.task_table.tasks
+    expected = formula_weights(schedule_manager, tasks)
+    np.testing.assert_allclose(
+        schedule_manager.task_weights(now=NOW), expected, rtol=1e-9, atol=1e-12
+    )
+
+
+def test_global_weight_of_matches_formula(schedule_manager):
+    tasks = schedule_manager.task_table.tasks
+    expected = formula_weights(schedule_manager, tasks)
+    expected /= expected.sum()
+    for task, weight in zip(tasks, expected):
+        assert schedule_manager.global_weight_of(task, now=NOW) == pytest.approx(
+            weight, rel=1e-9
+        )
+
+
+def test_weights_follow_task_edits(schedule_manager):
+    task_manager = schedule_manager.task_manager_instance
+    task = schedule_manager.task_table.tasks[0]
+    task.priority = 10
+    task.effort_level = "High"
+    task.due_datetime = NOW - timedelta(days=1)
+    task_manager.update_task(task)
+    schedule_manager.update_task_global_weights()
+
+    tasks = schedule_manager.task_table.tasks
+    expected = formula_weights(schedule_manager, tasks)
+    np.testing.assert_allclose(
+        schedule_manager.task_weights(now=NOW), expected, rtol=1e-9, atol=1e-12
+    )
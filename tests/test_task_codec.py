@@ -0,0 +1,107 @@
+"""
+core.task_codec: epoch-second dates and Task <-> tasks row round trips.
+"""
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from core.database import close_database
+from core.task_codec import EPOCH, TaskRowCodec, from_epoch_seconds, to_epoch_seconds
+from core.task_manager import Task, TaskList, TaskManager
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Runs the test with a local time zone ahead of UTC."""
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (datetime(2025, 3, 1, 9, 30, 15), datetime(2025, 3, 1, 9, 30, 15)),
+        (date(2025, 3, 1), datetime(2025, 3, 1)),
+        ("2025-03-01", datetime(2025, 3, 1)),
+        ("2025-03-01 09:30", datetime(2025, 3, 1, 9, 30)),
+        ("2025-03-01T09:30:15.250000", datetime(2025, 3, 1, 9, 30, 15)),
+        (datetime(1965, 7, 4, 12), datetime(1965, 7, 4, 12)),
+    ],
+)
+def test_epoch_seconds_round_trip(value, expected):
+    seconds = to_epoch_seconds(value)
+    assert isinstance(seconds, int)
+    assert from_epoch_seconds(seconds) == expected
+
+
+def test_empty_dates_are_stored_as_null():
+    assert to_epoch_seconds(None) is None
+    assert to_epoch_seconds("") is None
+
+
+def test_epoch_seconds_preserve_order():
+    moments = [EPOCH - timedelta(days=1), EPOCH, datetime(2025, 1, 1), datetime(2025, 1, 1, 0, 0, 1)]
+    stored = [to_epoch_seconds(moment) for moment in moments]
+    assert stored == sorted(stored)
+
+
+def test_aware_datetimes_are_converted_to_local_time(local_timezone):
+    instant = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+    local = datetime(2025, 3, 1, 15, 0)  # UTC+5:30
+    assert to_epoch_seconds(instant) == to_epoch_seconds(local)
+    assert to_epoch_seconds("2025-03-01T09:30:00+00:00") == to_epoch_seconds(local)
+
+
+@pytest.fixture
+def task_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    manager.add_task_list(TaskList(name="codec", category="Uncategorized"))
+    yield manager
+    close_database(manager.db_file)
+
+
+def test_task_row_round_trip(task_manager):
+    task = Task(
+        name="round trip",
+        list_name="codec",
+        description="all the column kinds",
+        tags=["a", "b"],
+        resources=["https://example.com"],
+        start_date=datetime(2025, 3, 1),
+        due_datetime=datetime(2025, 3, 7, 17, 45),
+        added_date_time=datetime(2025, 2, 20, 8, 5, 9),
+        recurring=True,
+        recur_every=["Monday", "Thursday"],
+        time_estimate=2.5,
+        subtasks=[{"order": 1, "name": "outline", "completed": True}],
+        preferred_work_days=["Monday"],
+        dependencies=[3],
+        include_in_schedule=True,
+        priority=7,
+    )
+    task_manager.add_task(task)
+
+    codec = TaskRowCodec.for_table(task_manager.conn)
+    row = task_manager.conn.execute(f"{codec.select_sql} WHERE id = ?", (task.id,)).fetchone()
+    decoded = codec.decode(row)
+    for name, value in decoded.items():
+        assert value == getattr(task, name), name
+    assert decoded["due_datetime"] == datetime(2025, 3, 7, 17, 45)
+    assert decoded["recurring"] is True
+    assert decoded["chunks"] == []
+
+
+def test_undeclared_text_dates_still_decode(task_manager):
+    conn = task_manager.conn
+    conn.execute(
+        "INSERT INTO tasks (name, list_name, due_datetime) VALUES ('legacy', 'codec', ?)",
+        ("2025-03-01 09:30:00",),
+    )
+    codec = TaskRowCodec.for_table(conn)
+    row = conn.execute(f"{codec.select_sql} WHERE name = 'legacy'").fetchone()
+    assert codec.decode(row)["due_datetime"] == datetime(2025, 3, 1, 9, 30)
@@ -0,0 +1,202 @@
+"""
+TaskManager behaviour against a database in a temporary data directory.
+"""
+import pytest
+
+from core.database import close_database
+from core.signals import global_signals
+from core.task_manager import Task, TaskList, TaskManager
+
+LISTS = {
+    "inbox": {},
+    "old project": {"archived": True},
+    "binned": {"in_trash": True},
+}
+
+
+def reopen(task_manager):
+    """Closes ``task_manager``'s database and returns a fresh TaskManager on it."""
+    close_database(task_manager.db_file)
+    return TaskManager(archive_after_days=None)
+
+
+@pytest.fixture
+def task_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    for name, flags in LISTS.items():
+        manager.add_task_list(TaskList(name=name, category="Uncategorized", **flags))
+        manager.add_tasks(
+            [
+                Task(name=f"{name} open", list_name=name),
+                Task(name=f"{name} done", list_name=name, status="Completed"),
+            ],
+            notify=False,
+        )
+    manager = reopen(manager)
+    yield manager
+    close_database(manager.db_file)
+
+
+def test_active_tasks_cover_every_list(task_manager):
+    assert not any(task_list.is_loaded() for task_list in task_manager.task_lists)
+    names = sorted(task.name for task in task_manager.get_active_tasks())
+    assert names == sorted(f"{name} open" for name in LISTS)
+
+
+@pytest.fixture
+def work(tmp_path, monkeypatch):
+    """A TaskManager with lists "a" (tasks t0..t3) and "b", all loaded."""
+    monkeypatch.chdir(tmp_path)
+    manager = TaskManager(archive_after_days=None)
+    for name in ("a", "b"):
+        manager.add_task_list(TaskList(name=name, category="Uncategorized"))
+    manager.add_tasks([Task(name=f"t{i}", list_name="a") for i in range(4)], notify=False)
+    yield manager
+    close_database(manager.db_file)
+
+
+@pytest.fixture
+def list_updates():
+    """Counts task_list_updated emissions."""
+    emitted = []
+
+    def record():
+        emitted.append(True)
+
+    global_signals.task_list_updated.connect(record)
+    yield emitted
+    global_signals.task_list_updated.disconnect(record)
+
+
+def list_task_names(task_manager, list_name):
+    return sorted(task.name for task in task_manager.get_task_list(list_name).tasks)
+
+
+def stored_task_names(task_manager):
+    return sorted(row["name"] for row in task_manager.conn.execute("SELECT name FROM tasks"))
+
+
+def test_batch_commits_and_notifies_once(work, list_updates):
+    tasks = work.get_task_list("a").tasks
+    commits = work.conn.stats["commits"]
+
+    with work.batch():
+        for priority, task in enumerate(tasks):
+            task.priority = priority
+            work.update_task(task)
+        tasks[0].priority = 9
+        work.update_task(tasks[0])
+
+    assert work.conn.stats["commits"] == commits + 1
+    assert len(list_updates) == 1
+    stored = dict(work.conn.execute("SELECT name, priority FROM tasks").fetchall())
+    assert stored == {"t0": 9, "t1": 1, "t2": 2, "t3": 3}
+
+
+def test_batch_without_changes_does_not_notify(work, list_updates):
+    with work.batch():
+        pass
+    assert list_updates == []
+
+
+def test_raising_batch_rolls_back_database_and_memory(work):
+    t0, t1, t2 = work.get_task_list("a").tasks[:3]
+    ids = (t0.id, t1.id, t2.id)
+
+    with pytest.raises(RuntimeError):
+        with work.batch():
+            work.add_task(Task(name="new", list_name="a"))
+            work.remove_task(t1)
+            t2.list_name = "b"
+            work.update_task(t2)
+            t0.name = "renamed"
+            work.update_task(t0)
+            work.add_task_list(TaskList(name="phantom", category="Uncategorized"))
+            raise RuntimeError("abort the batch")
+
+    assert stored_task_names(work) == ["t0", "t1", "t2", "t3"]
+    assert list_task_names(work, "a") == ["t0", "t1", "t2", "t3"]
+    assert list_task_names(work, "b") == []
+    assert work.get_task_list("phantom") is None
+    assert work.find_task(ids[0]).name == "t0"
+    assert work.find_task(ids[1]) is not None
+    assert not work.conn.in_transaction
+
+
+def test_failed_write_rolls_back_the_whole_batch(work):
+    unnamed = Task(name="unnamed", list_name="b")
+    unnamed.name = None  # tasks.name is NOT NULL
+
+    with work.batch():
+        work.add_task(Task(name="kept only if the batch commits", list_name="b"))
+        work.add_task(unnamed)
+
+    assert stored_task_names(work) == ["t0", "t1", "t2", "t3"]
+    assert list_task_names(work, "b") == []
+
+
+def test_rollback_reloads_edited_tasks(work):
+    task = work.get_task_list("a").tasks[0]
+
+    with pytest.raises(RuntimeError):
+        with work.batch():
+            task.priority = 7
+            work.update_task(task)
+            raise RuntimeError("abort the batch")
+
+    reloaded = work.find_task(task.id)
+    assert reloaded is not task
+    assert reloaded.priority == 0
+    assert reloaded in work.get_task_list("a").tasks
+
+
+def test_new_tasks_are_not_tracked():
+    assert Task(name="draft", list_name="a").get_changed_fields() is None
+
+
+def test_assignments_are_tracked(work):
+    task = work.get_task_list("a").tasks[0]
+    assert task.get_changed_fields() == set()
+
+    task.status = task.status  # Same value: not a change
+    task.priority = 5
+    task.list_name = "b"
+    assert task.get_changed_fields() == {"priority", "list_name"}
+    assert task.get_original_value("list_name") == "a"
+
+
+def test_in_place_json_edits_are_tracked(work):
+    task = work.get_task_list("a").tasks[0]
+    task.subtasks.append({"order": 1, "name": "outline", "completed": False})
+    task.tags.append("writing")
+    task.add_chunk(1.0)
+    assert task.get_changed_fields() == {"subtasks", "tags", "chunks"}
+
+    work.update_task(task)
+    assert task.get_changed_fields() == set()
+    assert work.find_task(task.id).tags == ["writing"]
+
+
+def test_update_writes_only_changed_columns(work):
+    task = work.get_task_list("a").tasks[0]
+    # Written behind the Task's back; an unchanged column must not overwrite it
+    work.conn.execute("UPDATE tasks SET description = 'edited elsewhere' WHERE id = ?", (task.id,))
+    work.conn.commit()
+
+    task.status = "Completed"
+    work.update_task(task)
+
+    row = work.conn.execute(
+        "SELECT status, description FROM tasks WHERE id = ?", (task.id,)
+    ).fetchone()
+    assert tuple(row) == ("Completed", "edited elsewhere")
+
+
+def test_moving_a_task_relinks_it(work):
+    task = work.get_task_list("a").tasks[0]
+    task.list_name = "b"
+    work.update_task(task)
+
+    assert task in work.get_task_list("b").tasks
+    assert task not in work.get_task_list("a").tasks
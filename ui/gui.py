@@ -44,6 +44,7 @@ class MainWindow(QMainWindow):
         self.setAcceptDrops(True)
         self.setup_signals()
         self.setup_schedule_timer()
+        self.setup_recurring_timer()
         # self.reset_settings()
 
     def setup_schedule_timer(self):
@@ -53,6 +54,13 @@ class MainWindow(QMainWindow):
         self._schedule_timer.timeout.connect(global_signals.refresh_schedule_signal.emit)
         self._schedule_timer.start()
 
+    def setup_recurring_timer(self):
+        # Roll over recurring tasks as they come due, not only at startup
+        self._recurring_timer = QTimer(self)
+        self._recurring_timer.setInterval(60_000) # 60 seconds
+        self._recurring_timer.timeout.connect(self.task_manager.manage_recurring_tasks)
+        self._recurring_timer.start()
+
     def reset_settings(self):
         confirm = QMessageBox.question(
             self,
@@ -168,8 +176,7 @@ class MainWindow(QMainWindow):
                 # info contains 'task_id' and 'objectName'
                 task_id = info['task_id']
                 # find task object by id
-                task = next((t for tl in self.task_manager.task_lists
-                             for t in tl.tasks if t.id == task_id), None)
+                task = self.task_manager.find_task(task_id)
                 if not task:
                     continue
                 # this will assign the very same objectName
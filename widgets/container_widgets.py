@@ -622,7 +622,7 @@ class CustomTreeWidget(QTreeWidget):
                 if new_category_name.lower() == "uncategorized":
                     new_category_name = None
 
-                task_list = next((tl for tl in self.task_manager.task_lists if tl.name == task_list_name), None)
+                task_list = self.task_manager.get_task_list(task_list_name)
 
                 if task_list and task_list.name.lower() == "quick tasks":
                     event.ignore()
@@ -715,6 +715,8 @@ class TaskListCollection(QWidget):
                 self.task_list_widget_in_focus_before_search = None
             return
 
+        # Lists with matching tasks, from the full-text index
+        matching_list_names = self.task_manager.search_list_names(text)
         # Iterate over categories and task lists
         for i in range(self.tree_widget.topLevelItemCount()):
             category_item = self.tree_widget.topLevelItem(i)
@@ -723,20 +725,8 @@ class TaskListCollection(QWidget):
                 category_visible = True
             for j in range(category_item.childCount()):
                 task_list_item = category_item.child(j)
-                task_list_visible = False
                 task_list_name = task_list_item.text(0)
-                task_list = next((tl for tl in self.task_manager.task_lists if tl.name == task_list_name), None)
-                tasks = task_list.tasks if task_list else []
-                for task in tasks:
-                    if text.lower() in task.name.lower() or text.lower() in task.description.lower():
-                        task_list_visible = True
-                        break
-                    for subtask in task.subtasks:
-                        if text.lower() in subtask["name"].lower():
-                            task_list_visible = True
-                            break
-                    if task_list_visible:
-                        break
+                task_list_visible = task_list_name in matching_list_names
                 task_list_item.setHidden(not task_list_visible)
                 if task_list_visible:
                     category_visible = True
@@ -784,7 +774,7 @@ class TaskListCollection(QWidget):
                                            {'type': 'task_list', 'info': task_list_info})
                     task_list_item.setFlags(task_list_item.flags())
 
-                    task_list = next((tl for tl in self.task_manager.task_lists if tl.name == task_list_name), None)
+                    task_list = self.task_manager.get_task_list(task_list_name)
 
                     hash_key = hash(task_list_name)
                     if hash_key not in self.parent.hash_to_task_list_widgets:
@@ -1079,21 +1069,23 @@ class TaskListCollection(QWidget):
                     task_list for task_list in self.categories.get(category_name, {}).get("task_lists", [])
                     if task_list.category == category_name
                 ]
-                for task_list_info in task_lists_in_category:
-                    task_list_name = task_list_info.name
-
-                    # Remove from task manager
-                    self.task_manager.remove_task_list(task_list_name)
-
-                    # Remove from stack widget
-                    hash_key = hash(task_list_name)
-                    if hash_key in self.parent.hash_to_task_list_widgets:
-                        widget_to_remove = self.parent.hash_to_task_list_widgets.pop(hash_key)
-                        self.parent.stacked_task_list.stack_widget.removeWidget(widget_to_remove)
-                        widget_to_remove.deleteLater()
-
-                # Remove category from the database
-                self.task_manager.remove_category(category_name)
+                # The lists, their tasks and the category go in one transaction
+                with self.task_manager.batch(notify=False):
+                    for task_list_info in task_lists_in_category:
+                        task_list_name = task_list_info.name
+
+                        # Remove from task manager
+                        self.task_manager.remove_task_list(task_list_name)
+
+                        # Remove from stack widget
+                        hash_key = hash(task_list_name)
+                        if hash_key in self.parent.hash_to_task_list_widgets:
+                            widget_to_remove = self.parent.hash_to_task_list_widgets.pop(hash_key)
+                            self.parent.stacked_task_list.stack_widget.removeWidget(widget_to_remove)
+                            widget_to_remove.deleteLater()
+
+                    # Remove category from the database
+                    self.task_manager.remove_category(category_name)
 
                 # Remove category from the data structure
                 del self.categories[category_name]
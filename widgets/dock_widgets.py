@@ -1008,7 +1008,7 @@ class TaskListDock(QDockWidget):
         self.multi_select_mode_toggle_bool = False
         self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
 
-        task_list = next((tl for tl in self.task_manager.task_lists if tl.name == task_list_name), None)
+        task_list = self.task_manager.get_task_list(task_list_name)
         self.task_list_widget = TaskListWidget(task_list, self.parent)
         self.priority_filter = False
         self.set_allowed_areas()
@@ -1181,6 +1181,9 @@ class TaskListDock(QDockWidget):
 
 
 class HistoryDock(QDockWidget):
+    # Completed tasks fetched per page, see load_history_page
+    PAGE_SIZE = 100
+
     def __init__(self, parent):
         super().__init__("History", parent)
         self.parent = parent
@@ -1197,6 +1200,8 @@ class HistoryDock(QDockWidget):
         self.history_tree.setHeaderLabels(["Task", "Completed On", "Due Date", "Priority"])
         self.history_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.history_tree.itemDoubleClicked.connect(self.view_task_details)
+        self.history_tree.itemClicked.connect(self.on_history_item_clicked)
+        self.history_tree.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
 
         self.history_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.history_tree.customContextMenuRequested.connect(self.show_context_menu)
@@ -1224,49 +1229,80 @@ class HistoryDock(QDockWidget):
 
     def update_history(self):
         self.history_tree.clear()
-        search_text = self.search_bar.text().lower()
-
-        for task_list in self.parent.task_manager.task_lists:
-            completed_tasks = [task for task in task_list.tasks if task.status == "Completed"]
-
-            if search_text:
-                completed_tasks = [task for task in completed_tasks if search_text in task.name.lower() or
-                                   search_text in (task.description.lower() if task.description else "")]
-
-            if completed_tasks:
-                task_list_item = QTreeWidgetItem(self.history_tree)
-                task_list_item.setText(0, task_list.name)
-                task_list_item.setFirstColumnSpanned(True)
-                self.history_tree.addTopLevelItem(task_list_item)
-
-                tasks_by_date = {}
-                for task in completed_tasks:
-                    completed_date = task.last_completed_date.strftime(
-                        '%Y-%m-%d') if task.last_completed_date else 'Unknown'
-                    if completed_date not in tasks_by_date:
-                        tasks_by_date[completed_date] = []
-                    tasks_by_date[completed_date].append(task)
-
-                for date, tasks in sorted(tasks_by_date.items(), reverse=True):
-                    date_item = QTreeWidgetItem(task_list_item)
-                    date_item.setText(0, f"Completed on {date}")
-                    date_item.setFirstColumnSpanned(True)
-                    task_list_item.addChild(date_item)
-
-                    for task in tasks:
-                        task_item = QTreeWidgetItem(date_item)
-                        task_item.setText(0, task.name)
-                        task_item.setText(1, task.last_completed_date.strftime(
-                            '%Y-%m-%d %H:%M') if task.last_completed_date else '')
-                        task_item.setText(2, task.due_datetime.strftime('%Y-%m-%d %H:%M') if task.due_datetime else '')
-                        task_item.setText(3, str(task.priority))
-                        task_item.setData(0, Qt.ItemDataRole.UserRole, task)
-                        date_item.addChild(task_item)
-
-                task_list_item.setExpanded(True)
+        self.history_list_items = {}
+        self.history_date_items = {}
+        self.next_history_page = None
+        self.load_more_item = None
+        self.load_history_page()
 
+    def load_history_page(self, after=None):
+        """
+        Appends the next page of completed tasks, newest first, to the tree.
+        While older tasks remain, a "Load more" row ends the tree, so they
+        can be fetched even when the pages so far don't fill it enough to
+        scroll.
+        """
+        # Taken out, not deleted: it may be the item being clicked
+        if self.load_more_item is not None:
+            index = self.history_tree.indexOfTopLevelItem(self.load_more_item)
+            if index >= 0:
+                self.history_tree.takeTopLevelItem(index)
+
+        search_text = self.search_bar.text().strip()
+        tasks, self.next_history_page = self.parent.task_manager.get_history_page(
+            self.PAGE_SIZE, after=after, search=search_text or None
+        )
+        for task in tasks:
+            self.add_history_item(task)
         self.history_tree.expandAll()
 
+        if self.next_history_page is not None:
+            if self.load_more_item is None:
+                self.load_more_item = QTreeWidgetItem()
+                self.load_more_item.setText(0, "Load more...")
+            self.history_tree.addTopLevelItem(self.load_more_item)
+            self.load_more_item.setFirstColumnSpanned(True)
+
+    def on_history_scrolled(self, value):
+        # Fetch more when scrolled to the bottom
+        if (
+            self.next_history_page is not None
+            and value >= self.history_tree.verticalScrollBar().maximum()
+        ):
+            self.load_history_page(self.next_history_page)
+
+    def on_history_item_clicked(self, item, column):
+        if item is self.load_more_item and self.next_history_page is not None:
+            self.load_history_page(self.next_history_page)
+
+    def add_history_item(self, task):
+        task_list_item = self.history_list_items.get(task.list_name)
+        if task_list_item is None:
+            task_list_item = QTreeWidgetItem(self.history_tree)
+            task_list_item.setText(0, task.list_name)
+            task_list_item.setFirstColumnSpanned(True)
+            self.history_tree.addTopLevelItem(task_list_item)
+            self.history_list_items[task.list_name] = task_list_item
+
+        completed_date = task.last_completed_date.strftime(
+            '%Y-%m-%d') if task.last_completed_date else 'Unknown'
+        date_item = self.history_date_items.get((task.list_name, completed_date))
+        if date_item is None:
+            date_item = QTreeWidgetItem(task_list_item)
+            date_item.setText(0, f"Completed on {completed_date}")
+            date_item.setFirstColumnSpanned(True)
+            task_list_item.addChild(date_item)
+            self.history_date_items[(task.list_name, completed_date)] = date_item
+
+        task_item = QTreeWidgetItem(date_item)
+        task_item.setText(0, task.name)
+        task_item.setText(1, task.last_completed_date.strftime(
+            '%Y-%m-%d %H:%M') if task.last_completed_date else '')
+        task_item.setText(2, task.due_datetime.strftime('%Y-%m-%d %H:%M') if task.due_datetime else '')
+        task_item.setText(3, str(task.priority))
+        task_item.setData(0, Qt.ItemDataRole.UserRole, task)
+        date_item.addChild(task_item)
+
     def show_context_menu(self, position):
         item = self.history_tree.itemAt(position)
         if item and item.parent() and item.parent().parent():
@@ -1291,7 +1327,7 @@ class HistoryDock(QDockWidget):
 
     def open_task_detail(self, task):
         task_list_name = task.list_name
-        task_list = next((tl for tl in self.parent.task_manager.task_lists if tl.name == task_list_name), None)
+        task_list = self.parent.task_manager.get_task_list(task_list_name)
         if task_list:
             task_list_widget = self.parent.hash_to_task_list_widgets.get(task_list_name)
             if not task_list_widget:
@@ -1305,6 +1341,11 @@ class HistoryDock(QDockWidget):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
+            if getattr(task, "archived_at", None):
+                # Move it back out of the archive first, then reopen it
+                task = self.parent.task_manager.restore_archived_task(task.id)
+                if task is None:
+                    return
             task.status = "Not Started"
             task.last_completed_date = None
             self.parent.task_manager.update_task(task)
@@ -417,11 +417,10 @@ class ScheduleTaskChunkWidget(QWidget):
             self.chunk.status = "completed"
         else:
             self.chunk.status = "active"
-        self.task.update_chunk_obj(self.chunk)
+        self.task_list_manager.update_chunk(self.task, self.chunk)
 
     def delete_chunk(self):
-        self.task.delete_chunk(self.chunk)
-        self.task_list_manager.update_task(self.task)
+        self.task_list_manager.delete_chunk(self.task, self.chunk)
         self.setParent(None)
         self.deleteLater()
 
@@ -1048,7 +1047,9 @@ class ScheduleViewWidget(QWidget):
         self.initUI()
         self.load_time_blocks()
         self.load_suggestion_panel()
-        # Optionally: global_signals.refresh_schedule_signal.connect(self.load_time_blocks)
+        # Schedules are solved in the background; redraw when one is published
+        global_signals.schedule_updated.connect(self.load_time_blocks)
+        global_signals.schedule_updated.connect(self.load_suggestion_panel)
 
     def initUI(self):
         self.mainLayout = QHBoxLayout(self)
@@ -1339,12 +1340,11 @@ class ScheduleViewWidget(QWidget):
         self.load_time_blocks()
 
     def add_quick_task(self):
-        for task_list in self.schedule_manager.task_manager_instance.task_lists:
-            if task_list.name == "quick tasks":
-                dialog = AddTaskDialog(self, task_list)
-                if dialog.exec() == QDialog.DialogCode.Accepted:
-                    task_data = dialog.get_task_data()
-                    task = Task(**task_data)
-                    self.schedule_manager.task_manager_instance.add_task(task)
-                    global_signals.task_list_updated.emit()
-            break
+        task_list = self.schedule_manager.task_manager_instance.get_task_list("quick tasks")
+        if task_list:
+            dialog = AddTaskDialog(self, task_list)
+            if dialog.exec() == QDialog.DialogCode.Accepted:
+                task_data = dialog.get_task_data()
+                task = Task(**task_data)
+                self.schedule_manager.task_manager_instance.add_task(task)
+                global_signals.task_list_updated.emit()
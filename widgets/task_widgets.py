@@ -78,15 +78,17 @@ class TaskListWidget(QListWidget):
     def delete_selected_items(self):
         tasks_to_delete = self.get_selected_items()
         tasks = self.task_list.get_tasks()
+        selected = []
         for index in reversed(range(self.count())):
             item = self.item(index)
             if item and item.text() in tasks_to_delete:
                 for task in tasks:
                     if task.name == item.text():
-                        self.delete_task(task)
+                        selected.append(task)
                         print(f"Deleted {item.text()}")
                         self.takeItem(index)
-        global_signals.task_list_updated.emit()
+        # One transaction and one task_list_updated for the whole selection
+        self.manager.remove_tasks(selected)
 
     def move_selected_items(self):
         tasks_to_move = self.get_selected_items()
@@ -115,31 +117,30 @@ class TaskListWidget(QListWidget):
 
     def perform_move(self, tasks_to_move, new_list_name):
         tasks = self.task_list.get_tasks()
-        for index in reversed(range(self.count())):
-            item = self.item(index)
-            if item and item.text() in tasks_to_move:
-                for task in tasks:
-                    if task.name == item.text():
-                        task.list_name = new_list_name
-                        self.manager.update_task(task)
-                        print(f"Moved {item.text()} to {new_list_name}")
-                        self.takeItem(index)
-        global_signals.task_list_updated.emit()
+        with self.manager.batch():
+            for index in reversed(range(self.count())):
+                item = self.item(index)
+                if item and item.text() in tasks_to_move:
+                    for task in tasks:
+                        if task.name == item.text():
+                            task.list_name = new_list_name
+                            self.manager.update_task(task)
+                            print(f"Moved {item.text()} to {new_list_name}")
+                            self.takeItem(index)
 
     def filter_tasks(self, text):
         first_visible_item = None
+        # Matches come from the full-text index instead of scanning every task
+        matching_ids = (
+            set(self.manager.search_task_ids(text, list_name=self.task_list.name))
+            if text.strip()
+            else None
+        )
         for index in range(self.count()):
             item = self.item(index)
             task_widget = self.itemWidget(item)
             task = task_widget.task
-            match_found = False
-            if text.lower() in task.name.lower() or text.lower() in task.description.lower():
-                match_found = True
-            if task.subtasks:
-                for subtask in task.subtasks:
-                    if text.lower() in subtask["name"].lower():
-                        match_found = True
-                        break
+            match_found = matching_ids is None or task.id in matching_ids
             item.setHidden(not match_found)
             if match_found and first_visible_item is None:
                 first_visible_item = item
@@ -150,15 +151,17 @@ class TaskListWidget(QListWidget):
         self.update_task_order()
 
     def update_task_order(self):
-        for index in range(self.count()):
-            item = self.item(index)
-            task_widget = self.itemWidget(item)
-            if task_widget:
-                task = task_widget.task
-                task.list_order = index
-                self.manager.update_task(task)
-                self.task_list.disable_all_filters()
-                self.manager.update_task_list(self.task_list)
+        # The view already shows the new order, so no reload is needed
+        with self.manager.batch(notify=False):
+            for index in range(self.count()):
+                item = self.item(index)
+                task_widget = self.itemWidget(item)
+                if task_widget:
+                    task = task_widget.task
+                    task.list_order = index
+                    self.manager.update_task(task)
+            self.task_list.disable_all_filters()
+            self.manager.update_task_list(self.task_list)
 
     def load_tasks(self):
         # Determine if any sorting filter is active